@@ -0,0 +1,128 @@
+"""Benchmark adding the raw UDS 2.0 sentence annotations to a corpus
+
+Compares UDSCorpus.add_annotation against the original path, which
+added each annotation separately, retrieving every graph once per
+annotation, built a log message for every node it did not add
+whether or not the message was emitted, and left the cyclic garbage
+collector to rescan the attributes added so far.
+
+The annotations are added to skeleton graphs containing just the
+nodes and edges that the annotations refer to, so that the benchmark
+measures applying annotations rather than building graphs.
+
+With --workers, the annotations are also added in that many worker
+processes.
+
+Usage:
+
+    python benchmarks/bench_annotations.py --repeat 3 --workers 4
+"""
+
+import argparse
+
+from glob import glob
+from os.path import join
+from time import perf_counter
+from networkx import DiGraph
+
+from decomp.semantics.uds import UDSCorpus, UDSSentenceGraph
+from decomp.semantics.uds import RawUDSAnnotation
+from decomp.semantics.uds.serialization import archive_members
+
+
+def load_annotations(version):
+    annotation_dir = join(UDSCorpus.ANN_DIR, version, 'raw', 'sentence',
+                          'annotations')
+    paths = glob(join(annotation_dir, '*.json')) or\
+        archive_members(glob(join(annotation_dir, '*.zip')))
+
+    return [RawUDSAnnotation.from_json(path) for path in sorted(paths)]
+
+
+def skeleton_corpus(annotations):
+    graphs = {}
+
+    for ann in annotations:
+        for gid, (node_attrs, edge_attrs) in ann.items():
+            graph = graphs.setdefault(gid, DiGraph(name=gid))
+
+            for node in list(node_attrs) + [n for e in edge_attrs for n in e]:
+                graph.add_node(node, domain='semantics',
+                               type='predicate' if '-pred-' in node
+                               else 'argument',
+                               frompredpatt=True)
+
+            graph.add_edges_from(edge_attrs, domain='semantics',
+                                 type='dependency', frompredpatt=True)
+
+    sentences = {gid: UDSSentenceGraph(graph, gid)
+                 for gid, graph in graphs.items()}
+
+    return UDSCorpus(sentences, {})
+
+
+def legacy_add_annotation(corpus, annotations):
+    for ann in annotations:
+        for gname, (node_attrs, edge_attrs) in ann.items():
+            if gname in corpus._sentences:
+                graph = corpus._sentences[gname]
+
+                for node, attrs in node_attrs.items():
+                    graph._add_node_annotation(node, attrs,
+                                               True, False, False, False)
+
+                for edge, attrs in edge_attrs.items():
+                    graph._add_edge_annotation(edge, attrs)
+
+                graph._graph_index = None
+                graph.clear_cache()
+
+                corpus._sentences[gname] = graph
+
+
+def time_adding(add, annotations, repeat):
+    times = []
+
+    for _ in range(repeat):
+        corpus = skeleton_corpus(annotations)
+
+        start = perf_counter()
+        add(corpus, annotations)
+        times.append(perf_counter() - start)
+
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--version', default='2.0')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    annotations = load_annotations(args.version)
+
+    legacy = time_adding(legacy_add_annotation, annotations, args.repeat)
+    current = time_adding(lambda corpus, anns: corpus.add_annotation(anns, []),
+                          annotations, args.repeat)
+
+    print('annotations: {}'.format(len(annotations)))
+    print('graphs:      {}'.format(len({gid for ann in annotations
+                                        for gid in ann.graphids})))
+    print('legacy:      {:.2f}s'.format(legacy))
+    print('current:     {:.2f}s'.format(current))
+    print('speedup:     {:.2f}x'.format(legacy / current))
+
+    if args.workers is not None:
+        parallel = time_adding(lambda corpus, anns:
+                               corpus.add_annotation(anns, [],
+                                                     workers=args.workers),
+                               annotations, args.repeat)
+
+        print('workers:     {}'.format(args.workers))
+        print('parallel:    {:.2f}s'.format(parallel))
+        print('speedup:     {:.2f}x'.format(legacy / parallel))
+
+
+if __name__ == '__main__':
+    main()
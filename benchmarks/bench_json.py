@@ -0,0 +1,126 @@
+"""Benchmark reading UDS corpora and annotations with each JSON backend
+
+For each installed backend, times loading each split of the corpus
+that has been built (see UDSCorpus.from_conll) with UDSCorpus.from_json,
+and loading each of the annotation files shipped with the package
+with from_json. Annotations are read from the shipped zip archives,
+and the annotation cache is cleared before every load.
+
+Usage:
+
+    python benchmarks/bench_json.py --version 2.0 --repeat 3
+"""
+
+import gc
+import argparse
+
+from glob import glob
+from os.path import basename, exists, join
+from time import perf_counter
+
+from decomp.semantics.uds import UDSCorpus
+from decomp.semantics.uds import RawUDSAnnotation, NormalizedUDSAnnotation
+from decomp.semantics.uds.annotation import UDSAnnotation
+from decomp.semantics.uds.serialization import JSON_BACKENDS
+from decomp.semantics.uds.serialization import set_json_backend
+from decomp.semantics.uds.serialization import archive_members
+
+
+def installed_backends():
+    backends = []
+
+    for name in JSON_BACKENDS:
+        try:
+            set_json_backend(name)
+
+        except ValueError:
+            continue
+
+        backends.append(name)
+
+    return backends
+
+
+def split_paths(version, annotation_format):
+    paths = {}
+
+    for split in ['train', 'dev', 'test']:
+        sentences = UDSCorpus._sentences_json_path(split, version,
+                                                   annotation_format)
+        documents = sentences.replace('sentence', 'document')
+
+        if exists(sentences) and exists(documents):
+            paths[split] = (sentences, documents)
+
+    return paths
+
+
+def annotation_paths(version, annotation_format):
+    paths = []
+
+    for level in ['sentence', 'document']:
+        annotation_dir = join(UDSCorpus.ANN_DIR, version, annotation_format,
+                              level, 'annotations')
+
+        paths += glob(join(annotation_dir, '*.json')) or\
+            archive_members(glob(join(annotation_dir, '*.zip')))
+
+    return sorted(paths)
+
+
+def time_loading(load, repeat):
+    times = []
+
+    for _ in range(repeat):
+        UDSAnnotation.CACHE.clear()
+
+        # garbage left by the previous load is not charged to this one
+        gc.collect()
+
+        start = perf_counter()
+        load()
+        times.append(perf_counter() - start)
+
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--version', default='2.0')
+    parser.add_argument('--format', default='normalized',
+                        choices=['raw', 'normalized'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    annotation_class = RawUDSAnnotation if args.format == 'raw'\
+        else NormalizedUDSAnnotation
+
+    backends = installed_backends()
+
+    tasks = [('split ' + split,
+              lambda paths=paths: UDSCorpus.from_json(*paths))
+             for split, paths in split_paths(args.version, args.format).items()]
+
+    if not tasks:
+        print('no built splits found; only annotations are timed')
+
+    tasks += [(basename(path),
+               lambda path=path: annotation_class.from_json(path))
+              for path in annotation_paths(args.version, args.format)]
+
+    print(' '.join(['{:<40}'.format('')] +
+                   ['{:>10}'.format(name) for name in backends]))
+
+    for label, load in tasks:
+        times = []
+
+        for name in backends:
+            set_json_backend(name)
+            times.append(time_loading(load, args.repeat))
+
+        print(' '.join(['{:<40}'.format(label)] +
+                       ['{:>9.2f}s'.format(t) for t in times]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark converting UDS sentence graphs to RDF
+
+Compares RDFConverter.networkx_to_rdf against the original converter,
+which visited each node once per incoming edge, recreated subspace
+triples for every property occurrence, and added triples one at a time.
+
+Usage:
+
+    python benchmarks/bench_rdf.py --split dev --repeat 3
+"""
+
+import argparse
+
+from time import perf_counter
+from networkx import DiGraph, to_dict_of_dicts
+from rdflib import Graph, URIRef, Literal
+
+from decomp.graph import RDFConverter
+from decomp.semantics.uds import UDSCorpus
+
+
+def legacy_networkx_to_rdf(nxgraph: DiGraph) -> Graph:
+    rdfgraph = Graph()
+
+    def add_attributes(nodeid, attributes):
+        for attrid1, attrs1 in attributes:
+            if not isinstance(attrs1, dict):
+                add_property(nodeid, attrid1, attrs1)
+
+            else:
+                for attrid2, attrs2 in attrs1.items():
+                    add_property(nodeid, attrid2, attrs2, attrid1)
+
+    def add_property(nodeid, propid, val, subspaceid=None):
+        if isinstance(val, dict) and subspaceid is not None:
+            rdfgraph.add((URIRef(propid), URIRef('subspace'),
+                          URIRef(subspaceid)))
+            rdfgraph.add((URIRef(propid+'-confidence'), URIRef('subspace'),
+                          URIRef(subspaceid)))
+            rdfgraph.add((URIRef(propid), URIRef('confidence'),
+                          URIRef(propid+'-confidence')))
+            rdfgraph.add((URIRef(nodeid), URIRef(propid),
+                          Literal(val['value'])))
+            rdfgraph.add((URIRef(nodeid), URIRef(propid+'-confidence'),
+                          Literal(val['confidence'])))
+
+        elif propid in ['domain', 'type']:
+            rdfgraph.add((URIRef(nodeid), URIRef(propid), URIRef(val)))
+
+        else:
+            rdfgraph.add((URIRef(nodeid), URIRef(propid), Literal(val)))
+
+    for nodeid1, edgedict in to_dict_of_dicts(nxgraph).items():
+        add_attributes(nodeid1, nxgraph.nodes[nodeid1].items())
+
+        for nodeid2 in edgedict:
+            edgeid = nodeid1 + '%%' + nodeid2
+
+            add_attributes(nodeid2, nxgraph.nodes[nodeid2].items())
+            rdfgraph.add((URIRef(nodeid1), URIRef(edgeid), URIRef(nodeid2)))
+            add_attributes(edgeid, nxgraph.edges[nodeid1, nodeid2].items())
+
+    return rdfgraph
+
+
+def time_conversion(convert, graphs, repeat):
+    times = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+
+        for graph in graphs:
+            convert(graph)
+
+        times.append(perf_counter() - start)
+
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--split', default='dev')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = UDSCorpus(split=args.split)
+    graphs = [graph.graph for graph in corpus.graphs.values()]
+
+    legacy = time_conversion(legacy_networkx_to_rdf, graphs, args.repeat)
+    current = time_conversion(RDFConverter.networkx_to_rdf, graphs,
+                              args.repeat)
+
+    print('graphs:  {}'.format(len(graphs)))
+    print('legacy:  {:.2f}s'.format(legacy))
+    print('current: {:.2f}s'.format(current))
+    print('speedup: {:.2f}x'.format(legacy / current))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
 """Module for defining abstract corpus readers"""
 
 from .corpus import *
+from .cache import BuildCache
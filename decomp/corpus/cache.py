@@ -0,0 +1,131 @@
+"""Module for caching the results of corpus builds on disk"""
+
+import os
+import zlib
+import hashlib
+
+from tempfile import NamedTemporaryFile
+from typing import BinaryIO, Optional, Union
+
+# included in every key, so that changing the format of cached
+# entries invalidates entries written in the old format
+FORMAT_VERSION = 1
+
+
+class BuildCache:
+    """A content-addressed cache of build results
+
+    Entries are stored as compressed files in a directory, named by a
+    digest of everything that the result depends on. A result is
+    therefore recomputed exactly when one of its inputs changes, and
+    entries for outdated inputs are simply never read again.
+
+    Parameters
+    ----------
+    cache_dir
+        the directory to store entries in; created if it does not
+        exist
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def digest(*parts: Union[str, bytes]) -> str:
+        """A key for a result that depends on the given parts
+
+        Parameters
+        ----------
+        parts
+            strings or bytes that the result depends on
+        """
+        hasher = hashlib.sha256(str(FORMAT_VERSION).encode('utf-8'))
+
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode('utf-8')
+
+            # prefix each part with its length so that different
+            # sequences of parts never produce the same input
+            hasher.update(str(len(part)).encode('utf-8') + b':' + part)
+
+        return hasher.hexdigest()
+
+    @staticmethod
+    def file_digest(path: Union[str, BinaryIO]) -> str:
+        """A digest of the contents of a file
+
+        Parameters
+        ----------
+        path
+            path to the file, or the file itself opened in binary mode
+        """
+        if isinstance(path, str):
+            with open(path, 'rb') as infile:
+                return BuildCache.file_digest(infile)
+
+        hasher = hashlib.sha256()
+
+        for block in iter(lambda: path.read(1 << 20), b''):
+            hasher.update(block)
+
+        return hasher.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str,
+            binary: bool = False) -> Optional[Union[str, bytes]]:
+        """The entry for a key, or None if there is no such entry
+
+        Parameters
+        ----------
+        key
+            a key constructed by BuildCache.digest
+        binary
+            whether to return the entry as bytes rather than decoding
+            it as text
+        """
+        try:
+            with open(self._path(key), 'rb') as infile:
+                value = zlib.decompress(infile.read())
+
+        except FileNotFoundError:
+            return None
+
+        except zlib.error:
+            # a corrupted entry is treated as missing and overwritten
+            # when the result is recomputed
+            return None
+
+        return value if binary else value.decode('utf-8')
+
+    def put(self, key: str, value: Union[str, bytes]) -> None:
+        """Store the entry for a key
+
+        Parameters
+        ----------
+        key
+            a key constructed by BuildCache.digest
+        value
+            the entry, either text or bytes
+        """
+        path = self._path(key)
+
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # write to a temporary file first so that readers never see a
+        # partially written entry
+        with NamedTemporaryFile('wb', dir=os.path.dirname(path),
+                                delete=False) as out:
+            out.write(zlib.compress(value))
+
+        os.replace(out.name, path)
@@ -4,12 +4,19 @@ from abc import ABCMeta, abstractmethod
 
 from random import sample
 from logging import warning
-from typing import Dict, List, Tuple, Iterable, Hashable, Any, TypeVar
+from collections.abc import MutableMapping, ItemsView, ValuesView
+from typing import Dict, List, Tuple, Iterable, Iterator, Hashable, Any, TypeVar
+from typing import Callable, Mapping, Optional
+from collections import OrderedDict
 
 InGraph = TypeVar('InGraph')  # the input graph type
 OutGraph = TypeVar('OutGraph')  # the output graph type
 
 
+class _UnbuildableGraphError(KeyError):
+    """Raised by a graphbuilder for a graph that cannot be built"""
+
+
 class Corpus(metaclass=ABCMeta):
     """Container for graphs
 
@@ -18,11 +25,53 @@ class Corpus(metaclass=ABCMeta):
     graphs_raw
         a sequence of graphs in a format that the graphbuilder for a
         subclass of this abstract class can process
+    lazy
+        whether to defer building each graph until it is first
+        accessed, rather than building all graphs on initialization
+    cache_size
+        if lazy, the maximum number of built graphs to keep in
+        memory; the least recently accessed graphs are discarded
+        (and rebuilt on their next access) beyond this. If None
+        (default), all built graphs are kept.
+    verify
+        if lazy, whether to build each graph the first time the
+        graphs are counted, checked for, or iterated over, so that
+        the corpus reports exactly the graphs an eagerly built corpus
+        would. This builds every graph on the first call to len,
+        which defeats much of the point of building them lazily. If
+        False (default), graphs that cannot be built are only
+        discovered, and removed from the corpus, when they are first
+        accessed, so until then they are counted and iterated over.
     """
 
-    def __init__(self, graphs_raw: Iterable[InGraph]):
+    def __init__(self, graphs_raw: Iterable[InGraph],
+                 lazy: bool = False,
+                 cache_size: Optional[int] = None,
+                 verify: bool = False):
         self._graphs_raw = graphs_raw
-        self._build_graphs()
+
+        if lazy:
+            self._graphs = LazyGraphDict(graphs_raw,
+                                         self._build_graph_lazily,
+                                         cache_size, verify)
+        else:
+            self._build_graphs()
+
+    @classmethod
+    def from_graphs(cls, graphs: Dict[Hashable, OutGraph]) -> 'Corpus':
+        """Construct a corpus from graphs that have already been built
+
+        Parameters
+        ----------
+        graphs
+            a mapping from graph identifiers to graphs of the type
+            that the graphbuilder for the subclass produces
+        """
+        corpus = cls.__new__(cls)
+        corpus._graphs_raw = None
+        corpus._graphs = graphs
+
+        return corpus
 
     def __iter__(self) -> Iterable[Hashable]:
         return iter(self._graphs)
@@ -44,12 +93,32 @@ class Corpus(metaclass=ABCMeta):
         self._graphs = {}
 
         for graphid, rawgraph in self._graphs_raw.items():
-            try:
-                self._graphs[graphid] = self._graphbuilder(graphid, rawgraph)
-            except ValueError:
-                warning(graphid+' has no or multiple root nodes')
-            except RecursionError:
-                warning(graphid+' has loops')
+            graph = self._build_graph(graphid, rawgraph)
+
+            if graph is not None:
+                self._graphs[graphid] = graph
+
+    def _build_graph(self, graphid: Hashable,
+                     rawgraph: InGraph) -> Optional[OutGraph]:
+        try:
+            return self._graphbuilder(graphid, rawgraph)
+        except ValueError:
+            warning(graphid+' has no or multiple root nodes')
+        except RecursionError:
+            warning(graphid+' has loops')
+
+        return None
+
+    def _build_graph_lazily(self, graphid: Hashable,
+                            rawgraph: InGraph) -> OutGraph:
+        graph = self._build_graph(graphid, rawgraph)
+
+        # graphs that cannot be built are skipped when building
+        # eagerly, so they behave as though they are missing here
+        if graph is None:
+            raise _UnbuildableGraphError(graphid)
+
+        return graph
 
     @abstractmethod
     def _graphbuilder(self,
@@ -86,3 +155,238 @@ class Corpus(metaclass=ABCMeta):
         return {tid: self._graphs[tid]
                 for tid
                 in sample(self._graphs.keys(), k=k)}
+
+
+class LazyGraphDict(MutableMapping):
+    """Mapping from graph identifiers to graphs built on first access
+
+    Graphs that are assigned to the mapping directly, rather than
+    built from a raw graph, are never discarded. Built graphs can be
+    protected from being discarded in the same way using
+    LazyGraphDict.pin, which should be done for any built graph that
+    is modified, since the modifications would otherwise be lost if
+    the graph were rebuilt.
+
+    Parameters
+    ----------
+    graphs_raw
+        a mapping from graph identifiers to graphs in a format that
+        graphbuilder can process
+    graphbuilder
+        a function from a graph identifier and a raw graph to a graph
+    maxsize
+        the maximum number of built graphs to keep; the least recently
+        accessed graphs are discarded (and rebuilt on their next
+        access) beyond this. If None (default), all built graphs are
+        kept.
+    verify
+        whether to build each graph the first time its identifier is
+        counted, checked for, or iterated over, so that the mapping
+        only ever reports graphs that can be built. The graphbuilder
+        signals that a graph cannot be built by raising
+        _UnbuildableGraphError, and such graphs are removed from the
+        mapping, as though they were never added, whenever they are
+        first built. Iterating over the items or values of the
+        mapping skips them either way.
+    """
+
+    def __init__(self,
+                 graphs_raw: Mapping[Hashable, InGraph],
+                 graphbuilder: Callable[[Hashable, InGraph], OutGraph],
+                 maxsize: Optional[int] = None,
+                 verify: bool = False):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('maxsize must be a positive int or None')
+
+        self._graphbuilder = graphbuilder
+        self._maxsize = maxsize
+        self._verify = verify
+
+        # the identifiers of graphs that have not yet been built, if
+        # they need to be verified
+        self._unverified = set()
+
+        # the graph identifiers in insertion order (values unused)
+        self._graphids = {}
+
+        # the raw mapping that each graph that is not pinned can be
+        # found in
+        self._sources = {}
+
+        # graphs built from raw graphs, from least to most recently
+        # accessed
+        self._built = OrderedDict()
+
+        # graphs that were assigned or pinned
+        self._pinned = {}
+
+        # incremented whenever graphs are added, replaced, or removed
+        self._version = 0
+
+        self.add_raw(graphs_raw)
+
+    def add_raw(self, graphs_raw: Mapping[Hashable, InGraph]) -> None:
+        """Add raw graphs to be built on first access
+
+        Graphs in graphs_raw replace any graphs with the same
+        identifier that are already in the mapping.
+
+        Parameters
+        ----------
+        graphs_raw
+            a mapping from graph identifiers to graphs in a format
+            that the graphbuilder can process
+        """
+        self._version += 1
+
+        for graphid in graphs_raw:
+            self._graphids[graphid] = None
+            self._sources[graphid] = graphs_raw
+            self._built.pop(graphid, None)
+            self._pinned.pop(graphid, None)
+
+            if self._verify:
+                self._unverified.add(graphid)
+
+    def pin(self, graphid: Hashable) -> None:
+        """Build a graph if necessary and never discard it
+
+        Parameters
+        ----------
+        graphid
+            the identifier of the graph to pin
+        """
+        self[graphid] = self[graphid]
+
+    def __getitem__(self, graphid: Hashable) -> OutGraph:
+        if graphid in self._pinned:
+            return self._pinned[graphid]
+
+        if graphid in self._built:
+            self._built.move_to_end(graphid)
+            return self._built[graphid]
+
+        return self._build(graphid)
+
+    def _build(self, graphid: Hashable) -> OutGraph:
+        source = self._sources[graphid]
+
+        try:
+            graph = self._graphbuilder(graphid, source[graphid])
+
+        except _UnbuildableGraphError:
+            # a graph that cannot be built is removed, so that it is
+            # not counted or iterated over
+            del self[graphid]
+            raise
+
+        self._unverified.discard(graphid)
+        self._built[graphid] = graph
+
+        if self._maxsize is not None and len(self._built) > self._maxsize:
+            self._built.popitem(last=False)
+
+        return graph
+
+    def _is_buildable(self, graphid: Hashable) -> bool:
+        if graphid not in self._graphids:
+            return False
+
+        if graphid in self._unverified:
+            # the graph is kept, so that it is not built again when
+            # it is accessed
+            try:
+                self._build(graphid)
+
+            except _UnbuildableGraphError:
+                return False
+
+        return True
+
+    def __setitem__(self, graphid: Hashable, graph: OutGraph) -> None:
+        self._version += 1
+        self._graphids[graphid] = None
+        self._sources.pop(graphid, None)
+        self._built.pop(graphid, None)
+        self._unverified.discard(graphid)
+        self._pinned[graphid] = graph
+
+    def __delitem__(self, graphid: Hashable) -> None:
+        del self._graphids[graphid]
+        self._version += 1
+        self._sources.pop(graphid, None)
+        self._built.pop(graphid, None)
+        self._unverified.discard(graphid)
+        self._pinned.pop(graphid, None)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        # the identifiers are copied, since graphs that cannot be
+        # built are removed when they are accessed during iteration
+        if not self._unverified:
+            return iter(list(self._graphids))
+
+        return (graphid for graphid in list(self._graphids)
+                if self._is_buildable(graphid))
+
+    def items(self) -> ItemsView:
+        return _BuildableItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _BuildableValuesView(self)
+
+    def __len__(self) -> int:
+        for graphid in list(self._unverified):
+            self._is_buildable(graphid)
+
+        return len(self._graphids)
+
+    def __contains__(self, graphid: Any) -> bool:
+        return self._is_buildable(graphid)
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """Maximum number of built graphs that are kept unpinned"""
+
+        return self._maxsize
+
+    @property
+    def version(self) -> int:
+        """A counter incremented whenever graphs are added, assigned, or
+        removed
+
+        Graphs built from raw graphs (or discarded and rebuilt) do not
+        change it.
+        """
+
+        return self._version
+
+    @property
+    def nbuilt(self) -> int:
+        """Number of built graphs currently kept in memory"""
+
+        return len(self._built) + len(self._pinned)
+
+
+def _buildable_items(graphs: LazyGraphDict) -> Iterator[Tuple[Hashable, Any]]:
+    for graphid in graphs:
+        try:
+            graph = graphs[graphid]
+
+        except _UnbuildableGraphError:
+            continue
+
+        yield graphid, graph
+
+
+class _BuildableItemsView(ItemsView):
+    # graphs that turn out not to be buildable are skipped
+
+    def __iter__(self) -> Iterator[Tuple[Hashable, Any]]:
+        return _buildable_items(self._mapping)
+
+
+class _BuildableValuesView(ValuesView):
+    # graphs that turn out not to be buildable are skipped
+
+    def __iter__(self) -> Iterator[Any]:
+        return (graph for _, graph in _buildable_items(self._mapping))
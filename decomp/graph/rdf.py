@@ -1,30 +1,137 @@
 """Module for converting from networkx to RDF"""
 
-from networkx import DiGraph, to_dict_of_dicts
+from threading import Lock
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator
+from typing import Optional, Tuple
+from networkx import DiGraph
 from rdflib import Graph, URIRef, Literal
 
+if TYPE_CHECKING:
+    from ..semantics.uds.metadata import UDSCorpusMetadata
+
+Triple = Tuple[URIRef, URIRef, Any]
+
+# the domains and types that UDS nodes and edges can have
+DOMAINS = ['semantics', 'syntax', 'interface', 'document', 'root']
+TYPES = ['predicate', 'argument', 'token', 'root', 'dependency',
+         'head', 'nonhead', 'subargument', 'subpredicate']
+
+
+class TermCache:
+    """A bounded cache of RDF terms that can be shared across threads
+
+    Parameters
+    ----------
+    term
+        a function constructing the term for a key
+    maxsize
+        the maximum number of terms to keep; the least recently used
+        terms are discarded beyond this. If None, all terms are kept.
+    """
+
+    def __init__(self, term: Callable[[Hashable], Any],
+                 maxsize: Optional[int] = None):
+        self._term = term
+        self._maxsize = maxsize
+        self._terms = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """The maximum number of terms to keep"""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: Optional[int]) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def _evict(self) -> None:
+        if self._maxsize is not None:
+            while len(self._terms) > self._maxsize:
+                self._terms.popitem(last=False)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            if key in self._terms:
+                self._terms.move_to_end(key)
+
+                return self._terms[key]
+
+            term = self._term(key)
+
+            if self._maxsize != 0:
+                self._terms[key] = term
+                self._evict()
+
+            return term
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._terms
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def warm(self, keys: Iterable[Hashable]) -> None:
+        """Construct the terms for keys ahead of their first use
+
+        Parameters
+        ----------
+        keys
+            the keys to construct terms for
+        """
+        for key in keys:
+            self[key]
+
+    def clear(self) -> None:
+        """Discard all terms"""
+        with self._lock:
+            self._terms.clear()
+
 
 class RDFConverter:
     """A converter between NetworkX digraphs and RDFLib graphs
 
+    Terms are interned across conversions, so that graphs converted
+    from the same corpus share their property, subspace, and value
+    terms rather than each holding its own copies. The caches holding
+    them are bounded and may be used by several threads at once; they
+    can be filled ahead of time using RDFConverter.prewarm.
+
     Parameters
     ----------
     nxgraph
         the graph to convert
     """
 
-    SUBSPACES = {}
-    PROPERTIES = {'domain': URIRef('domain'),
-                  'type': URIRef('type'),
-                  'subspace': URIRef('subspace'),
-                  'confidence': URIRef('confidence')}
-    VALUES = {}
+    SUBSPACES = TermCache(URIRef, maxsize=1024)
+    PROPERTIES = TermCache(URIRef, maxsize=4096)
+    VALUES = TermCache(URIRef, maxsize=1024)
+
+    # literals are keyed by the type of their value as well as the
+    # value, since values that compare equal but have different types
+    # (e.g. 1, 1.0, and True) are different literals
+    LITERALS = TermCache(lambda key: Literal(key[1]), maxsize=65536)
 
     def __init__(self, nxgraph: DiGraph):
         self.nxgraph = nxgraph
         self.rdfgraph = Graph()
         self.nodes = {}
 
+        # the subspace triples for each property only need to be
+        # emitted once per graph
+        self._subspace_triples = set()
+
+        # terms are looked up in the shared caches at most once per
+        # conversion, which keeps contention for their locks low
+        self._properties = {}
+        self._values = {}
+        self._literals = {}
+
     @classmethod
     def networkx_to_rdf(cls, nxgraph: DiGraph) -> Graph:
         """Convert a NetworkX digraph to an RDFLib graph
@@ -34,84 +141,60 @@ class RDFConverter:
         nxgraph
             the NetworkX graph to convert
         """
-
         converter = cls(nxgraph)
 
-        nxdict = to_dict_of_dicts(nxgraph)
-
-        for nodeid1, edgedict in nxdict.items():
-            converter._add_node_attributes(nodeid1)
-            for nodeid2 in edgedict:
-                converter._add_node_attributes(nodeid2)
-                converter._add_edge_attributes(nodeid1, nodeid2)
-
-        return converter.rdfgraph
-
-    def _add_node_attributes(self, nodeid):
-        self._construct_node(nodeid)
-        
-        self._add_attributes(nodeid,
-                             self.nxgraph.nodes[nodeid].items())
-
-        
-    def _add_edge_attributes(self, nodeid1, nodeid2):
-        edgeid = self._construct_edge(nodeid1, nodeid2)
-        edgetup = (nodeid1, nodeid2)
-        
-        self._add_attributes(edgeid,
-                             self.nxgraph.edges[edgetup].items())
-        
-
-    def _add_attributes(self, nid, attributes):
-        triples = []
-        
-        for attrid1, attrs1 in attributes:
+        rdfgraph = converter.rdfgraph
+        rdfgraph.addN((s, p, o, rdfgraph) for s, p, o in converter.triples())
+
+        return rdfgraph
+
+    def triples(self) -> Iterator[Triple]:
+        """The triples representing the graph
+
+        Each node is visited once, followed by each edge, which is
+        represented by a term linking its source to its target as
+        well as by the triples for its attributes.
+        """
+        for nodeid, attrs in self.nxgraph.nodes.items():
+            yield from self._attributes(self._construct_node(nodeid),
+                                        attrs)
+
+        for (nodeid1, nodeid2), attrs in self.nxgraph.edges.items():
+            edge = self._construct_edge(nodeid1, nodeid2)
+
+            yield self.nodes[nodeid1], edge, self.nodes[nodeid2]
+            yield from self._attributes(edge, attrs)
+
+    def _attributes(self, node: URIRef,
+                    attributes: Dict[str, Any]) -> Iterator[Triple]:
+        for attrid1, attrs1 in attributes.items():
             if not isinstance(attrs1, dict):
                 if isinstance(attrs1, list) or isinstance(attrs1, tuple):
                     errmsg = 'Cannot convert list- or tuple-valued' +\
                              ' attributes to RDF'
                     raise ValueError(errmsg)
-                    
-                triples += self._construct_property(nid,
-                                                    attrid1,
-                                                    attrs1)
 
-            else:            
+                yield from self._construct_property(node, attrid1, attrs1)
+
+            else:
                 for attrid2, attrs2 in attrs1.items():
-                    triples += self._construct_property(nid,
-                                                        attrid2,
-                                                        attrs2,
-                                                        attrid1)
-
-        for t in triples:
-            self.rdfgraph.add(t)                    
-        
-    def _construct_node(self, nodeid):        
+                    yield from self._construct_property(node, attrid2,
+                                                        attrs2, attrid1)
+
+    def _construct_node(self, nodeid: str) -> URIRef:
         if nodeid not in self.nodes:
             self.nodes[nodeid] = URIRef(nodeid)
 
-    def _construct_edge(self, nodeid1, nodeid2):
-        edgeid = nodeid1 + '%%' + nodeid2
-
-        if edgeid not in self.nodes:
-            node1 = self.nodes[nodeid1]
-            node2 = self.nodes[nodeid2]
+        return self.nodes[nodeid]
 
-            self.nodes[edgeid] = URIRef(edgeid)
-            triple = (node1, self.nodes[edgeid], node2)
+    def _construct_edge(self, nodeid1: str, nodeid2: str) -> URIRef:
+        self._construct_node(nodeid1)
+        self._construct_node(nodeid2)
 
-            self.rdfgraph.add(triple)
-            
-            return edgeid
-
-        else:
-            return edgeid
+        return self._construct_node(nodeid1 + '%%' + nodeid2)
 
-    def _construct_property(self, nodeid, propid, val,
-                            subspaceid=None):
-
-        c = self.__class__
-        
+    def _construct_property(self, node: URIRef, propid: str, val: Any,
+                            subspaceid: Optional[str] = None) -> Iterator[Triple]:
         if isinstance(val, dict) and subspaceid is not None:
             # We currently do not support querying on raw UDS
             # annotations, all of which have dict-valued 'value'
@@ -119,47 +202,94 @@ class RDFConverter:
             if isinstance(val['value'], dict) or isinstance(val['confidence'], dict):
                 raise TypeError('Attempted query of graph with raw properties. Querying '\
                                 'graphs with raw properties is prohibited.')
-            triples = c._construct_subspace(subspaceid, propid)        
-            triples += [(self.nodes[nodeid],
-                         c.PROPERTIES[propid],
-                         Literal(val['value'])),
-                        (self.nodes[nodeid],
-                         c.PROPERTIES[propid+'-confidence'],
-                         Literal(val['confidence']))]
+
+            if (subspaceid, propid) not in self._subspace_triples:
+                self._subspace_triples.add((subspaceid, propid))
+
+                yield from self._construct_subspace(subspaceid, propid)
+
+            yield node, self._property(propid), self._literal(val['value'])
+            yield (node,
+                   self._property(propid+'-confidence'),
+                   self._literal(val['confidence']))
 
         elif propid in ['domain', 'type']:
-            if val not in c.VALUES:
-                c.VALUES[val] = URIRef(val)
-            
-            triples = [(self.nodes[nodeid],
-                        c.PROPERTIES[propid],
-                        c.VALUES[val])]
+            yield node, self._property(propid), self._value(val)
 
         else:
-            if propid not in c.PROPERTIES:
-                c.PROPERTIES[propid] = URIRef(propid)
-            
-            triples = [(self.nodes[nodeid],
-                        c.PROPERTIES[propid],
-                        Literal(val))]            
-            
-        return triples
+            yield node, self._property(propid), self._literal(val)
+
+    def _property(self, propid: str) -> URIRef:
+        try:
+            return self._properties[propid]
+
+        except KeyError:
+            term = self._properties[propid] = self.__class__.PROPERTIES[propid]
+
+            return term
+
+    def _value(self, val: str) -> URIRef:
+        try:
+            return self._values[val]
+
+        except KeyError:
+            term = self._values[val] = self.__class__.VALUES[val]
+
+            return term
+
+    def _literal(self, val: Any) -> Literal:
+        key = (type(val), val)
+
+        try:
+            return self._literals[key]
+
+        except KeyError:
+            term = self._literals[key] = self.__class__.LITERALS[key]
+
+            return term
+
+        except TypeError:
+            # unhashable values are not interned
+            return Literal(val)
 
     @classmethod
-    def _construct_subspace(cls, subspaceid, propid):
-        if subspaceid not in cls.SUBSPACES:
-            cls.SUBSPACES[subspaceid] = URIRef(subspaceid)
-            
-        if propid not in cls.PROPERTIES:
-            cls.PROPERTIES[propid] = URIRef(propid)
-            cls.PROPERTIES[propid+'-confidence'] = URIRef(propid+'-confidence')
-
-        return [(cls.PROPERTIES[propid],
-                 cls.PROPERTIES['subspace'],
-                 cls.SUBSPACES[subspaceid]),
-                (cls.PROPERTIES[propid+'-confidence'],
-                 cls.PROPERTIES['subspace'],
-                 cls.SUBSPACES[subspaceid]),                
-                (cls.PROPERTIES[propid],
-                 cls.PROPERTIES['confidence'],
-                 cls.PROPERTIES[propid+'-confidence'])]
+    def prewarm(cls, metadata: 'UDSCorpusMetadata') -> None:
+        """Construct the terms for a corpus ahead of its first conversion
+
+        Parameters
+        ----------
+        metadata
+            the metadata for the corpus, whose subspaces, properties,
+            and categorical values are interned along with the UDS
+            domains and types
+        """
+        cls.PROPERTIES.warm(['domain', 'type', 'subspace', 'confidence'])
+        cls.VALUES.warm(DOMAINS + TYPES)
+
+        for annotation_metadata in [metadata.sentence_metadata,
+                                    metadata.document_metadata]:
+            for subspace in annotation_metadata.subspaces:
+                cls.SUBSPACES.warm([subspace])
+
+                for prop in annotation_metadata.properties(subspace):
+                    cls.PROPERTIES.warm([prop, prop+'-confidence'])
+
+                    datatype = annotation_metadata[subspace][prop].value
+
+                    if datatype.is_categorical:
+                        cls.LITERALS.warm((type(v), v)
+                                          for v in datatype.categories)
+
+    def _construct_subspace(self, subspaceid: str,
+                            propid: str) -> Tuple[Triple, Triple, Triple]:
+        subspace = self.__class__.SUBSPACES[subspaceid]
+
+        return ((self._property(propid),
+                 self._property('subspace'),
+                 subspace),
+                (self._property(propid+'-confidence'),
+                 self._property('subspace'),
+                 subspace),
+                (self._property(propid),
+                 self._property('confidence'),
+                 self._property(propid+'-confidence')))
@@ -0,0 +1,426 @@
+"""Module for evaluating SPARQL queries directly against NetworkX graphs"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from networkx import DiGraph
+from rdflib import URIRef, Literal, BNode, Variable
+from rdflib.namespace import XSD
+from rdflib.plugins.sparql.sparql import Query
+from .rdf import RDFConverter
+
+Term = Union[URIRef, Literal]
+Solution = Dict[Any, Term]
+
+NUMERIC_DATATYPES = {XSD.integer, XSD.decimal, XSD.float, XSD.double,
+                     XSD.int, XSD.long, XSD.short, XSD.byte,
+                     XSD.nonNegativeInteger, XSD.nonPositiveInteger,
+                     XSD.positiveInteger, XSD.negativeInteger,
+                     XSD.unsignedInt, XSD.unsignedLong, XSD.unsignedShort,
+                     XSD.unsignedByte}
+
+
+class UnsupportedQueryError(Exception):
+    """Raised for queries outside of the subset NXQueryEngine evaluates"""
+
+
+class _ExpressionError(Exception):
+    """A SPARQL expression evaluation error, which filters treat as false"""
+
+
+class NXQueryEngine:
+    """An evaluator for a subset of SPARQL 1.1 over a NetworkX graph
+
+    The graph is indexed as the triples that RDFConverter would
+    construct from it, but in plain dictionaries, and SELECT queries
+    built from basic graph patterns, FILTER, UNION, DISTINCT, and
+    LIMIT/OFFSET are evaluated directly against that index. Filters
+    may use comparisons, logical connectives, and arithmetic. Any
+    other construct raises UnsupportedQueryError, in which case the
+    query should be evaluated by RDFLib instead.
+
+    Parameters
+    ----------
+    nxgraph
+        the graph to query
+
+    Raises
+    ------
+    TypeError, ValueError
+        if the graph has attributes that RDFConverter cannot convert
+        (e.g. raw annotations)
+    """
+
+    def __init__(self, nxgraph: DiGraph):
+        self._spo = defaultdict(lambda: defaultdict(set))
+        self._pos = defaultdict(lambda: defaultdict(set))
+        self._osp = defaultdict(lambda: defaultdict(set))
+
+        for s, p, o in RDFConverter(nxgraph).triples():
+            self._spo[s][p].add(o)
+            self._pos[p][o].add(s)
+            self._osp[o][s].add(p)
+
+    def select(self, query: Query,
+               bindings: Optional[Dict[Variable, Term]] = None) -> List[Tuple[Optional[Term], ...]]:
+        """Evaluate a SELECT query
+
+        Parameters
+        ----------
+        query
+            a query prepared by ``rdflib.plugins.sparql.prepareQuery``
+        bindings
+            values for variables in the query, as for the
+            ``initBindings`` argument of ``rdflib.Graph.query``
+
+        Returns
+        -------
+        a list of rows, each of which is a tuple of the values of
+        the projected variables (None for unbound variables)
+
+        Raises
+        ------
+        UnsupportedQueryError
+            if the query uses constructs outside of the supported subset
+        """
+        algebra = query.algebra
+
+        if algebra.name != 'SelectQuery':
+            raise UnsupportedQueryError(algebra.name)
+
+        pattern, distinct, start, length = algebra.p, False, 0, None
+
+        # solution modifiers wrap the projection
+        while pattern.name in ['Slice', 'Distinct', 'Reduced']:
+            if pattern.name == 'Slice':
+                start, length = pattern.start, pattern.length
+
+            else:
+                distinct = True
+
+            pattern = pattern.p
+
+        if pattern.name != 'Project':
+            raise UnsupportedQueryError(pattern.name)
+
+        variables = pattern.PV
+        rows = [tuple(solution.get(v) for v in variables)
+                for solution in self._evaluate(pattern.p,
+                                               [dict(bindings or {})])]
+
+        if distinct:
+            rows = list(dict.fromkeys(rows))
+
+        end = None if length is None else start + length
+
+        return rows[start:end]
+
+    def _evaluate(self, pattern,
+                  seeds: List[Solution]) -> List[Solution]:
+        # each pattern is evaluated from the solutions found so far,
+        # so that the variables they bind restrict the triples that
+        # the pattern has to be matched against
+        name = getattr(pattern, 'name', None)
+
+        if name == 'BGP':
+            return self._evaluate_bgp(pattern.triples, seeds)
+
+        if name == 'Filter':
+            return [solution for solution in self._evaluate(pattern.p, seeds)
+                    if self._satisfies(pattern.expr, solution)]
+
+        if name == 'Join':
+            solutions = self._evaluate(pattern.p1, seeds)
+
+            # a filter in the right-hand group must only see the
+            # variables bound within that group, so the group is
+            # evaluated on its own and the solutions are joined
+            if _contains_filter(pattern.p2):
+                return _join(solutions, self._evaluate(pattern.p2, seeds))
+
+            return self._evaluate(pattern.p2, solutions)
+
+        if name == 'Union':
+            return self._evaluate(pattern.p1, seeds) +\
+                self._evaluate(pattern.p2, seeds)
+
+        raise UnsupportedQueryError(name)
+
+    def _evaluate_bgp(self, triples,
+                      solutions: List[Solution]) -> List[Solution]:
+        remaining = list(triples)
+
+        while remaining and solutions:
+            bound = set(solutions[0])
+            remaining.sort(key=lambda t: -sum(not _is_variable(x) or x in bound
+                                              for x in t))
+            triple = remaining.pop(0)
+
+            solutions = [extended
+                         for solution in solutions
+                         for extended in self._match(triple, solution)]
+
+        return solutions
+
+    def _match(self, triple, solution: Solution) -> Iterator[Solution]:
+        s, p, o = [solution.get(x, None) if _is_variable(x) else x
+                   for x in triple]
+
+        for ts, tp, to in self._triples(s, p, o):
+            extended = dict(solution)
+            consistent = True
+
+            for var, term in zip(triple, (ts, tp, to)):
+                if _is_variable(var):
+                    if extended.setdefault(var, term) != term:
+                        consistent = False
+                        break
+
+            if consistent:
+                yield extended
+
+    def _triples(self, s: Optional[Term], p: Optional[Term],
+                 o: Optional[Term]) -> Iterator[Tuple[Term, Term, Term]]:
+        if s is not None and p is not None:
+            objects = self._spo.get(s, {}).get(p, ())
+
+            if o is None:
+                yield from ((s, p, obj) for obj in objects)
+
+            elif o in objects:
+                yield s, p, o
+
+        elif p is not None and o is not None:
+            yield from ((subj, p, o)
+                        for subj in self._pos.get(p, {}).get(o, ()))
+
+        elif s is not None and o is not None:
+            yield from ((s, pred, o)
+                        for pred in self._osp.get(o, {}).get(s, ()))
+
+        elif s is not None:
+            yield from ((s, pred, obj)
+                        for pred, objects in self._spo.get(s, {}).items()
+                        for obj in objects)
+
+        elif p is not None:
+            yield from ((subj, p, obj)
+                        for obj, subjects in self._pos.get(p, {}).items()
+                        for subj in subjects)
+
+        elif o is not None:
+            yield from ((subj, pred, o)
+                        for subj, preds in self._osp.get(o, {}).items()
+                        for pred in preds)
+
+        else:
+            yield from ((subj, pred, obj)
+                        for subj, predobjs in self._spo.items()
+                        for pred, objects in predobjs.items()
+                        for obj in objects)
+
+    def _satisfies(self, expr, solution: Solution) -> bool:
+        try:
+            return _ebv(_evaluate_expression(expr, solution))
+
+        except _ExpressionError:
+            return False
+
+
+def _contains_filter(pattern) -> bool:
+    name = getattr(pattern, 'name', None)
+
+    if name == 'Filter':
+        return True
+
+    if name in ['Join', 'Union']:
+        return _contains_filter(pattern.p1) or _contains_filter(pattern.p2)
+
+    return False
+
+
+def _join(left: List[Solution], right: List[Solution]) -> List[Solution]:
+    """The merges of the compatible pairs of solutions"""
+    return [{**l, **r}
+            for l in left for r in right
+            if all(l[var] == r[var] for var in l.keys() & r.keys())]
+
+
+def _is_variable(term: Any) -> bool:
+    return isinstance(term, (Variable, BNode))
+
+
+def _evaluate_expression(expr, solution: Solution) -> Any:
+    if isinstance(expr, Variable):
+        if expr not in solution:
+            raise _ExpressionError('unbound variable ' + str(expr))
+
+        return solution[expr]
+
+    if isinstance(expr, (URIRef, Literal)):
+        return expr
+
+    name = getattr(expr, 'name', None)
+
+    if name == 'ConditionalAndExpression':
+        return _evaluate_connective(expr, solution, all)
+
+    if name == 'ConditionalOrExpression':
+        return _evaluate_connective(expr, solution, any)
+
+    if name == 'UnaryNot':
+        return Literal(not _ebv(_evaluate_expression(expr.expr, solution)))
+
+    if name == 'UnaryMinus':
+        return Literal(-_numeric(_evaluate_expression(expr.expr, solution)))
+
+    if name == 'UnaryPlus':
+        return Literal(_numeric(_evaluate_expression(expr.expr, solution)))
+
+    if name == 'RelationalExpression':
+        return _evaluate_relation(expr, solution)
+
+    if name in ['AdditiveExpression', 'MultiplicativeExpression']:
+        return _evaluate_arithmetic(expr, solution)
+
+    raise UnsupportedQueryError(name)
+
+
+def _evaluate_connective(expr, solution: Solution, combine) -> Literal:
+    # an error is only an error if the other operands do not
+    # determine the value of the connective on their own
+    values, error = [], False
+
+    for operand in [expr.expr] + list(expr.other or []):
+        try:
+            values.append(_ebv(_evaluate_expression(operand, solution)))
+
+        except _ExpressionError:
+            error = True
+
+    result = combine(values)
+
+    if error and (result if combine is all else not result):
+        raise _ExpressionError('error in connective operand')
+
+    return Literal(result)
+
+
+def _evaluate_relation(expr, solution: Solution) -> Literal:
+    left = _evaluate_expression(expr.expr, solution)
+    op = expr.op
+
+    if op in ['IN', 'NOT IN']:
+        members = [_evaluate_expression(other, solution)
+                   for other in expr.other]
+        found = any(_equal(left, member) for member in members)
+
+        return Literal(found if op == 'IN' else not found)
+
+    right = _evaluate_expression(expr.other, solution)
+
+    if op == '=':
+        return Literal(_equal(left, right))
+
+    if op == '!=':
+        return Literal(not _equal(left, right))
+
+    left, right = _comparable(left, right)
+
+    if op == '<':
+        return Literal(left < right)
+
+    if op == '>':
+        return Literal(left > right)
+
+    if op == '<=':
+        return Literal(left <= right)
+
+    if op == '>=':
+        return Literal(left >= right)
+
+    raise UnsupportedQueryError(op)
+
+
+def _evaluate_arithmetic(expr, solution: Solution) -> Literal:
+    value = _numeric(_evaluate_expression(expr.expr, solution))
+
+    for op, operand in zip(expr.op, expr.other):
+        other = _numeric(_evaluate_expression(operand, solution))
+
+        if isinstance(value, Decimal) != isinstance(other, Decimal):
+            value, other = float(value), float(other)
+
+        if op == '+':
+            value = value + other
+
+        elif op == '-':
+            value = value - other
+
+        elif op == '*':
+            value = value * other
+
+        elif other == 0:
+            raise _ExpressionError('division by zero')
+
+        else:
+            value = value / other
+
+    return Literal(value)
+
+
+def _is_numeric(term: Any) -> bool:
+    return isinstance(term, Literal) and term.datatype in NUMERIC_DATATYPES
+
+
+def _numeric(term: Any) -> Union[int, float, Decimal]:
+    if not _is_numeric(term):
+        raise _ExpressionError('expected a numeric literal')
+
+    return term.toPython()
+
+
+def _string(term: Any) -> Any:
+    """A simple literal as the equivalent xsd:string literal"""
+    if isinstance(term, Literal) and term.datatype is None and\
+       term.language is None:
+        return Literal(str(term), datatype=XSD.string)
+
+    return term
+
+
+def _equal(left: Any, right: Any) -> bool:
+    if _is_numeric(left) and _is_numeric(right):
+        return left.toPython() == right.toPython()
+
+    return _string(left) == _string(right)
+
+
+def _comparable(left: Any, right: Any) -> Tuple[Any, Any]:
+    if _is_numeric(left) and _is_numeric(right):
+        return left.toPython(), right.toPython()
+
+    left, right = _string(left), _string(right)
+
+    if isinstance(left, Literal) and isinstance(right, Literal) and\
+       left.datatype == right.datatype and\
+       left.datatype in [XSD.string, XSD.boolean]:
+        return left.toPython(), right.toPython()
+
+    raise _ExpressionError('incomparable terms')
+
+
+def _ebv(term: Any) -> bool:
+    """The effective boolean value of a term"""
+    if isinstance(term, Literal):
+        if term.datatype == XSD.boolean:
+            return bool(term.toPython())
+
+        if _is_numeric(term):
+            return term.toPython() != 0
+
+        if term.datatype in [None, XSD.string]:
+            return len(str(term)) > 0
+
+    raise _ExpressionError('no effective boolean value')
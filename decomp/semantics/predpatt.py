@@ -3,11 +3,15 @@
 # pylint: disable=R1704
 """Module for converting PredPatt objects to networkx digraphs"""
 
+import json
+
 from os.path import basename, splitext
+from concurrent.futures import ProcessPoolExecutor
 from typing import Tuple, Hashable, TextIO, Optional, Union
-from networkx import DiGraph
+from typing import Any, Dict, List, Type
+from networkx import DiGraph, adjacency_data, adjacency_graph
 from predpatt import load_conllu, PredPatt, PredPattOpts
-from ..corpus import Corpus
+from ..corpus import Corpus, BuildCache
 from ..syntax.dependency import CoNLLDependencyTreeCorpus
 
 DEFAULT_PREDPATT_OPTIONS = PredPattOpts(resolve_relcl=True,
@@ -15,6 +19,16 @@ DEFAULT_PREDPATT_OPTIONS = PredPattOpts(resolve_relcl=True,
                                         resolve_conj=False,
                                         cut=True)  # Resolve relative clause
 
+# the number of shards per worker when building graphs in parallel;
+# more shards than workers evens out the load across workers
+SHARDS_PER_WORKER = 4
+
+
+PREDPATT_ERRMSG = 'PredPatt was unable to parse the CoNLL you provided.' +\
+                  ' This is likely due to using a version of UD that is' +\
+                  ' incompatible with PredPatt. Use of version 1.2 is' +\
+                  ' suggested.'
+
 
 class PredPattCorpus(Corpus):
     """Container for predpatt graphs"""
@@ -40,7 +54,9 @@ class PredPattCorpus(Corpus):
     def from_conll(cls,
                    corpus: Union[str, TextIO],
                    name: str = 'ewt',
-                   options: Optional[PredPattOpts] = None) -> 'PredPattCorpus':
+                   options: Optional[PredPattOpts] = None,
+                   workers: Optional[int] = None,
+                   cache: Optional[BuildCache] = None) -> 'PredPattCorpus':
         """Load a CoNLL dependency corpus and apply predpatt
 
         Parameters
@@ -51,10 +67,44 @@ class PredPattCorpus(Corpus):
             the name of the corpus; used in constructing treeids
         options
             options for predpatt extraction
+        workers
+            the number of processes to extract predpatts and build
+            graphs in; if None (default), they are built in the
+            current process. The resulting graphs and their
+            identifiers are the same either way.
+        cache
+            a cache of graphs from previous builds; graphs for
+            sentences whose CoNLL, identifier, and predpatt options
+            are unchanged are read from it rather than rebuilt, and
+            newly built graphs are added to it
         """
 
         options = DEFAULT_PREDPATT_OPTIONS if options is None else options
 
+        data = cls._read_conll(corpus)
+
+        if (workers is not None and workers > 1) or cache is not None:
+            return cls.from_graphs(cls._build_conll_graphs(data, name,
+                                                           options, workers,
+                                                           cache=cache))
+
+        # load the CoNLL dependency parses as graphs
+        ud_corp = CoNLLDependencyTreeCorpus(cls._split_conll(data, name))
+
+        # extract the predpatt for those dependency parses
+        try:
+            predpatt = {name+'-'+sid.split('_')[1]: PredPatt(ud_parse,
+                                                             opts=options)
+                        for sid, ud_parse in load_conllu(data)}
+
+        except ValueError:
+            raise ValueError(PREDPATT_ERRMSG)
+            
+        return cls({n: (pp, ud_corp[n])
+                    for n, pp in predpatt.items()})
+
+    @staticmethod
+    def _read_conll(corpus: Union[str, TextIO]) -> str:
         corp_is_str = isinstance(corpus, str)
 
         if corp_is_str and splitext(basename(corpus))[1] == '.conllu':
@@ -67,30 +117,138 @@ class PredPattCorpus(Corpus):
         else:
             data = corpus.read()
 
-        # load the CoNLL dependency parses as graphs
-        ud_corp = {name+'-'+str(i+1): [line.split()
-                                       for line in block.split('\n')
-                                       if len(line) > 0
-                                       if line[0] != '#']
-                   for i, block in enumerate(data.split('\n\n'))}
-        ud_corp = CoNLLDependencyTreeCorpus(ud_corp)
+        return data
+
+    @staticmethod
+    def _split_conll(data: str, name: str) -> Dict[str, List[List[str]]]:
+        return {name+'-'+str(i+1): [line.split()
+                                    for line in block.split('\n')
+                                    if len(line) > 0
+                                    if line[0] != '#']
+                for i, block in enumerate(data.split('\n\n'))}
+
+    @staticmethod
+    def _options_key(options: PredPattOpts) -> str:
+        return repr(sorted(vars(options).items()))
+
+    @classmethod
+    def _build_conll_graphs(cls, data: str, name: str,
+                            options: PredPattOpts,
+                            workers: Optional[int] = None,
+                            graph_class: Optional[Type] = None,
+                            cache: Optional[BuildCache] = None) -> Dict[str, DiGraph]:
+        """Extract predpatts and build graphs, reusing cached graphs
+
+        The CoNLL is parsed in the current process, so that graph
+        identifiers are assigned exactly as in the serial path. The
+        parses of sentences that are not in the cache are then built
+        either in the current process or, if there are multiple
+        workers, sharded in order across a process pool. Graphs are
+        returned in the order of their sentences in the CoNLL.
+        """
+        ud_corp = cls._split_conll(data, name)
 
-        # extract the predpatt for those dependency parses
         try:
-            predpatt = {name+'-'+sid.split('_')[1]: PredPatt(ud_parse,
-                                                             opts=options)
-                        for sid, ud_parse in load_conllu(data)}
+            parses = [(name+'-'+sid.split('_')[1], ud_parse)
+                      for sid, ud_parse in load_conllu(data)]
 
         except ValueError:
-            errmsg = 'PredPatt was unable to parse the CoNLL you provided.' +\
-                     ' This is likely due to using a version of UD that is' +\
-                     ' incompatible with PredPatt. Use of version 1.2 is' +\
-                     ' suggested.'
+            raise ValueError(PREDPATT_ERRMSG)
 
-            raise ValueError(errmsg)
-            
-        return cls({n: (pp, ud_corp[n])
-                    for n, pp in predpatt.items()})
+        graphids = [n for n, _ in parses]
+        graphs = {}
+
+        if cache is not None:
+            options_key = cls._options_key(options)
+
+            # graphs built as a graph_class (e.g. UDSSentenceGraph) may
+            # have been augmented by it, so they are cached separately
+            # from plain predpatt graphs
+            kind = 'raw' if graph_class is None else graph_class.__name__
+            keys = {n: cache.digest('predpatt', kind, n,
+                                    json.dumps(ud_corp.get(n)), options_key)
+                    for n in graphids}
+
+            for n in graphids:
+                cached = cache.get(keys[n])
+
+                if cached is not None:
+                    graph = adjacency_graph(json.loads(cached))
+                    graphs[n] = graph if graph_class is None\
+                                else graph_class(graph, n)
+
+            parses = [(n, p) for n, p in parses if n not in graphs]
+
+        if workers is not None and workers > 1:
+            built = cls._build_graphs_in_parallel(ud_corp, parses, options,
+                                                  workers, graph_class)
+
+        else:
+            try:
+                built = _build_predpatt_graphs({n: ud_corp[n]
+                                                for n, _ in parses},
+                                               parses, options, graph_class)
+
+            except ValueError:
+                raise ValueError(PREDPATT_ERRMSG)
+
+        if cache is not None:
+            for n, graph in built.items():
+                graph = graph if graph_class is None else graph.graph
+                cache.put(keys[n], json.dumps(adjacency_data(graph)))
+
+        graphs.update(built)
+
+        return {n: graphs[n] for n in graphids if n in graphs}
+
+    @staticmethod
+    def _build_graphs_in_parallel(ud_corp: Dict[str, List[List[str]]],
+                                  parses: List[Tuple[str, Any]],
+                                  options: PredPattOpts, workers: int,
+                                  graph_class: Optional[Type] = None) -> Dict[str, DiGraph]:
+        # the parses are sharded in order across the workers, and the
+        # graphs built for each shard are merged in shard order
+        nshards = workers * SHARDS_PER_WORKER
+        shardsize = max(1, -(-len(parses) // nshards))
+        shards = [parses[i:i+shardsize]
+                  for i in range(0, len(parses), shardsize)]
+
+        graphs = {}
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_build_predpatt_graphs,
+                                       {n: ud_corp[n] for n, _ in shard},
+                                       shard, options, graph_class)
+                       for shard in shards]
+
+            try:
+                for future in futures:
+                    graphs.update(future.result())
+
+            except ValueError:
+                raise ValueError(PREDPATT_ERRMSG)
+
+        return graphs
+
+
+def _build_predpatt_graphs(ud_corp: Dict[str, List[List[str]]],
+                           parses: List[Tuple[str, Any]],
+                           options: PredPattOpts,
+                           graph_class: Optional[Type] = None) -> Dict[str, DiGraph]:
+    # this is defined at the module level so that it can be sent to
+    # worker processes
+    ud_corp = CoNLLDependencyTreeCorpus(ud_corp)
+
+    predpatt = {n: PredPatt(ud_parse, opts=options)
+                for n, ud_parse in parses}
+
+    corpus = PredPattCorpus({n: (pp, ud_corp[n])
+                             for n, pp in predpatt.items()})
+
+    if graph_class is None:
+        return dict(corpus.items())
+
+    return {n: graph_class(g, n) for n, g in corpus.items()}
 
 
 class PredPattGraphBuilder:
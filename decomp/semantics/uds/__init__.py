@@ -6,3 +6,4 @@ from .graph import UDSDocumentGraph
 from .graph import UDSSentenceGraph
 from .annotation import RawUDSAnnotation
 from .annotation import NormalizedUDSAnnotation
+from .annotation import UDSAnnotationStream
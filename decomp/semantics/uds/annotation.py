@@ -1,15 +1,17 @@
 """Module for representing UDS property annotations."""
 
-import json
-
+from array import array
 from typing import Union, Any, Optional, TextIO
-from typing import Dict, Set
+from typing import Dict, Hashable, Iterator, List, Set, Tuple, Type
+from io import StringIO
 from os.path import basename, splitext
-from collections import defaultdict
 from abc import ABC, abstractmethod
 from overrides import overrides
 from logging import warning
 
+from ...corpus import BuildCache
+from .cache import AnnotationCache
+from .serialization import iter_json_object, open_file, json_loads
 from .metadata import PrimitiveType
 from .metadata import UDSAnnotationMetadata
 from .metadata import UDSPropertyMetadata
@@ -18,32 +20,218 @@ NormalizedData = Dict[str, Dict[str, Dict[str, PrimitiveType]]]
 RawData = Dict[str, Dict[str, Dict[str, Dict[str, PrimitiveType]]]]
 
 
-def _nested_defaultdict(depth: int) -> Union[dict, defaultdict]:
-    """Constructs a nested defaultdict
+class _AnnotationColumns:
+    """Raw annotations stored as parallel columns
 
-    The lowest nesting level is a normal dictionary
+    Each row is one annotator's annotation of one property of a node
+    or edge. Graph, node/edge, subspace, property, and annotator
+    identifiers are interned and stored as integer codes, and the rows
+    for each graph are contiguous, so that the annotations for a graph
+    or for an annotator can be assembled when they are needed rather
+    than held as nested dictionaries.
 
     Parameters
     ----------
-    depth
-        The depth of the nesting   
+    excluded
+        attributes of nodes and edges that are not property subspaces
+        (or properties), which are kept as they are instead of being
+        split into rows
     """
-    if depth < 0:
-        raise ValueError('depth must be a nonnegative int')
 
-    if not depth:
-        return dict
-    else:
-        return defaultdict(lambda: _nested_defaultdict(depth-1))
+    def __init__(self, excluded: Set[str] = frozenset()):
+        self._excluded = excluded
+
+        self._codes = {}
+        self._keys = []
+
+        self._graph = array('i')
+        self._element = array('i')
+        self._subspace = array('i')
+        self._property = array('i')
+        self._annotator = array('i')
+        self._value = []
+        self._confidence = []
+
+        # the start and end rows of each graph along with the
+        # attributes of its nodes and edges that are not in rows
+        self._graph_rows = {}
+        self._other = {}
+
+        # built the first time annotations are assembled by annotator
+        self._annotator_rows = None
+
+    def _code(self, key: Hashable) -> int:
+        try:
+            return self._codes[key]
+
+        except KeyError:
+            code = self._codes[key] = len(self._keys)
+            self._keys.append(key)
+
+            return code
+
+    def __len__(self) -> int:
+        return len(self._value)
+
+    def add_graph(self, graphid: str,
+                  elements: Dict[Hashable, Dict[str, Any]]) -> None:
+        """Add the annotations of a graph's nodes or edges
+
+        Parameters
+        ----------
+        graphid
+            the identifier of the graph
+        elements
+            a mapping from node or edge identifiers to subspaces to
+            properties to values and confidences by annotator
+        """
+        start = len(self._value)
+        graph = self._code(graphid)
+        other = self._other[graph] = []
+
+        for elemid, subspaces in elements.items():
+            element = self._code(elemid)
+
+            if not subspaces:
+                other.append((elemid, (), None))
+
+            for subspace, properties in subspaces.items():
+                if subspace in self._excluded or\
+                   not isinstance(properties, dict):
+                    other.append((elemid, (subspace,), properties))
+                    continue
+
+                if not properties:
+                    other.append((elemid, (subspace,), {}))
+
+                for prop, annotation in properties.items():
+                    if prop in self._excluded or not annotation['value']:
+                        other.append((elemid, (subspace, prop), annotation))
+                        continue
+
+                    subcode = self._code(subspace)
+                    propcode = self._code(prop)
+
+                    for annid, val in annotation['value'].items():
+                        conf = annotation['confidence'][annid]
+
+                        self._graph.append(graph)
+                        self._element.append(element)
+                        self._subspace.append(subcode)
+                        self._property.append(propcode)
+                        self._annotator.append(self._code(annid))
+                        self._value.append(val)
+                        self._confidence.append(conf)
+
+        self._graph_rows[graph] = (start, len(self._value))
+        self._annotator_rows = None
+
+    @property
+    def graphids(self) -> List[str]:
+        """The identifiers of the graphs, in the order they were added"""
+        return [self._keys[graph] for graph in self._graph_rows]
+
+    @property
+    def annotatorids(self) -> Set[str]:
+        """The identifiers of the annotators with at least one row"""
+        if self._annotator_rows is None:
+            self._index_annotators()
+
+        return {self._keys[annotator] for annotator in self._annotator_rows}
+
+    def _index_annotators(self) -> None:
+        self._annotator_rows = {}
+
+        for row, annotator in enumerate(self._annotator):
+            if annotator not in self._annotator_rows:
+                self._annotator_rows[annotator] = array('i')
+
+            self._annotator_rows[annotator].append(row)
+
+    def by_graph(self, graphid: str) -> Dict[Hashable, Dict[str, Any]]:
+        """The annotations of a graph's nodes or edges
+
+        These have the same form as the annotations that were added:
+        for each property, a mapping from annotators to values and a
+        mapping from annotators to confidences.
+
+        Parameters
+        ----------
+        graphid
+            the identifier of the graph
+        """
+        graph = self._codes.get(graphid)
+
+        if graph not in self._graph_rows:
+            raise KeyError(graphid)
+
+        keys = self._keys
+        start, end = self._graph_rows[graph]
+        attrs = {}
+
+        # rows for the same property of the same node or edge are
+        # contiguous, so its annotation is only looked up when the
+        # property changes
+        current, values, confidences = None, None, None
+
+        for element, subspace, prop, annid, val, conf in zip(
+                self._element[start:end], self._subspace[start:end],
+                self._property[start:end], self._annotator[start:end],
+                self._value[start:end], self._confidence[start:end]):
+            if (element, subspace, prop) != current:
+                current = (element, subspace, prop)
+                subspaces = attrs.setdefault(keys[element], {})
+                properties = subspaces.setdefault(keys[subspace], {})
+                annotation = properties.setdefault(keys[prop],
+                                                   {'value': {},
+                                                    'confidence': {}})
+                values = annotation['value']
+                confidences = annotation['confidence']
 
-def _freeze_nested_defaultdict(d: defaultdict) -> dict:
-    d = dict(d)
+            annid = keys[annid]
+            values[annid] = val
+            confidences[annid] = conf
 
-    for k, v in d.items():
-        if isinstance(v, defaultdict):
-            d[k] = _freeze_nested_defaultdict(v)
+        for elemid, path, value in self._other[graph]:
+            subspaces = attrs.setdefault(elemid, {})
+
+            if len(path) == 1:
+                subspaces.setdefault(path[0], value)
+
+            elif len(path) == 2:
+                subspaces.setdefault(path[0], {})[path[1]] = value
+
+        return attrs
+
+    def by_annotator(self, annotatorid: str) -> Dict[str, Dict[Hashable, Dict[str, Any]]]:
+        """The annotations given by an annotator, grouped by graph
+
+        For each property, this gives the annotator's value and
+        confidence. Graphs the annotator did not annotate are omitted.
+
+        Parameters
+        ----------
+        annotatorid
+            the identifier of the annotator
+        """
+        if self._annotator_rows is None:
+            self._index_annotators()
+
+        keys = self._keys
+        rows = self._annotator_rows.get(self._codes.get(annotatorid), ())
+        attrs = {}
+
+        for row in rows:
+            elements = attrs.setdefault(keys[self._graph[row]], {})
+            subspaces = elements.setdefault(keys[self._element[row]], {})
+            properties = subspaces.setdefault(keys[self._subspace[row]], {})
+            properties[keys[self._property[row]]] = {
+                'confidence': self._confidence[row],
+                'value': self._value[row]
+            }
+
+        return attrs
 
-    return d
 
 class UDSAnnotation(ABC):
     """A Universal Decompositional Semantics annotation
@@ -67,7 +255,10 @@ class UDSAnnotation(ABC):
         identifiers must be represented as NODEID1%%NODEID2, and node
         identifiers must not contain %%.
     """
-    CACHE = {}
+    CACHE = AnnotationCache()
+
+    # Some attributes are not property subspaces and are thus excluded
+    _excluded_attributes = {'subpredof', 'subargof', 'headof', 'span', 'head'}
 
     @abstractmethod
     def __init__(self, metadata: UDSAnnotationMetadata,
@@ -92,8 +283,6 @@ class UDSAnnotation(ABC):
                                        if '%%' not in node}
                                  for gid, attrs in data.items()}
 
-        # Some attributes are not property subspaces and are thus excluded
-        self._excluded_attributes = {'subpredof', 'subargof', 'headof', 'span', 'head'}
         self._node_subspaces = {ss for gid, nodedict
                                 in self._node_attributes.items()
                                 for nid, subspaces in nodedict.items()
@@ -112,8 +301,8 @@ class UDSAnnotation(ABC):
                                 for ss in subspaces}
 
     def _validate(self):
-        node_graphids = set(self._node_attributes)
-        edge_graphids = set(self._edge_attributes)
+        node_graphids = self.node_graphids
+        edge_graphids = self.edge_graphids
 
         if node_graphids != edge_graphids:
             errmsg = 'The graph IDs that nodes are specified for ' +\
@@ -143,6 +332,12 @@ class UDSAnnotation(ABC):
                      'metadata: ' + ','.join(missing)
             raise ValueError(errmsg)
 
+        self._validate_metadata(self._metadata)
+
+    @classmethod
+    def _validate_metadata(cls, metadata: UDSAnnotationMetadata):
+        pass
+
     def __getitem__(self, graphid: str):
         node_attrs = self._node_attributes[graphid]
         edge_attrs = self._edge_attributes[graphid]
@@ -182,26 +377,41 @@ class UDSAnnotation(ABC):
         will be added. The subclass determines the form of DATA in the
         above.
 
+        Loaded annotations are cached in ``UDSAnnotation.CACHE`` (an
+        :class:`decomp.semantics.uds.cache.AnnotationCache`), keyed on
+        a digest of the JSON, whose limits can be adjusted and which
+        can be cleared using ``UDSAnnotation.CACHE.clear()``.
+
         Parameters
         ----------
         jsonfile
-            (path to) file containing annotations as JSON
+            (path to) file containing annotations as JSON. Paths may
+            be to members of zip archives (e.g.
+            ``annotations/protoroles.zip/protoroles.json``), which are
+            decompressed as they are read.
         """
 
-        if jsonfile in cls.CACHE:
-            return cls.CACHE[jsonfile]
-
-        ext = splitext(basename(jsonfile))[-1]
-
-        if isinstance(jsonfile, str) and ext == '.json':
-            with open(jsonfile) as infile:
-                annotation = json.load(infile)
+        if isinstance(jsonfile, str) and\
+           splitext(basename(jsonfile))[-1] == '.json':
+            with open_file(jsonfile) as infile:
+                text = infile.read()
 
         elif isinstance(jsonfile, str):
-            annotation = json.loads(jsonfile)
+            text = jsonfile
 
         else:
-            annotation = json.load(jsonfile)
+            text = jsonfile.read()
+
+        # annotations are cached on the contents of the JSON, so the
+        # same annotations are shared however they are read
+        key = BuildCache.digest(cls.__name__, text)
+
+        return cls.CACHE.lookup(key, lambda: cls._from_json_text(text),
+                                len(text))
+
+    @classmethod
+    def _from_json_text(cls, text: str) -> 'UDSAnnotation':
+        annotation = json_loads(text)
 
         if set(annotation) < {'metadata', 'data'}:
             errmsg = 'annotation JSON must specify both "metadata" and "data"'
@@ -214,10 +424,26 @@ class UDSAnnotation(ABC):
 
         metadata = UDSAnnotationMetadata.from_dict(annotation['metadata'])
 
-        cls.CACHE[jsonfile] = cls(metadata,
-                                  annotation['data'])
+        return cls(metadata, annotation['data'])
+
+    @classmethod
+    def stream_json(cls, jsonfile: Union[str, TextIO]) -> 'UDSAnnotationStream':
+        """Stream Universal Decompositional Semantics annotations from JSON
+
+        The JSON must have the same format as for ``from_json``, but
+        rather than being loaded all at once, it is decoded
+        incrementally whenever the returned stream is iterated over,
+        so that only the annotations for a single graph are held in
+        memory at a time. The stream can be passed anywhere a
+        UDSAnnotation can be added to a corpus.
 
-        return cls.CACHE[jsonfile]
+        Parameters
+        ----------
+        jsonfile
+            (path to) file containing annotations as JSON, which may
+            be a member of a zip archive as for ``from_json``
+        """
+        return UDSAnnotationStream(cls, jsonfile)
 
     def items(self, annotation_type: Optional[str] = None):
         """Dictionary-like items generator for attributes
@@ -318,10 +544,10 @@ class NormalizedUDSAnnotation(UDSAnnotation):
                  data: Dict[str, Dict[str, NormalizedData]]):
         super().__init__(metadata, data)
 
-    def _validate(self):
-        super()._validate()
-
-        if self._metadata.has_annotators():
+    @classmethod
+    @overrides
+    def _validate_metadata(cls, metadata: UDSAnnotationMetadata):
+        if metadata.has_annotators():
             errmsg = 'metadata for NormalizedUDSAnnotation should ' +\
                      'not specify annotators'
             raise ValueError(errmsg)
@@ -399,51 +625,125 @@ class RawUDSAnnotation(UDSAnnotation):
         super().__init__(metadata, data)
 
     def _process_node_data(self, data: Dict[str, Dict[str, RawData]]):
-        super()._process_node_data(data)
-
-        self.node_attributes_by_annotator = _nested_defaultdict(5)
-
-        for gid, attrs in self.node_attributes.items():
-            for nid, subspaces in attrs.items():
-                for subspace, properties in subspaces.items():
-                    if subspace in self._excluded_attributes:
-                        continue                  
-                    for prop, annotation in properties.items():
-                        if prop in self._excluded_attributes:
-                            continue
-                        for annid, val in annotation['value'].items():
-                            conf = annotation['confidence'][annid]
-                            self.node_attributes_by_annotator[annid][gid][nid][subspace][prop] = \
-                                {'confidence': conf, 'value': val}
-
-        self.node_attributes_by_annotator =\
-            _freeze_nested_defaultdict(self.node_attributes_by_annotator)
+        # annotations are stored as columns rather than as nested
+        # dictionaries, from which the annotations by graph and by
+        # annotator are assembled when they are requested
+        self._node_columns = _AnnotationColumns(self._excluded_attributes)
+
+        for gid, attrs in data.items():
+            self._node_columns.add_graph(gid, {node: a
+                                               for node, a in attrs.items()
+                                               if '%%' not in node})
+
+        # nested dictionaries built from the columns, which are kept
+        # once they have been requested
+        self._node_attributes = None
+        self._node_attributes_by_annotator = None
+
+        self._node_subspaces = {ss for gid, attrs in data.items()
+                                for node, subspaces in attrs.items()
+                                if '%%' not in node
+                                for ss in subspaces}
+        self._node_subspaces = self._node_subspaces - self._excluded_attributes
 
     def _process_edge_data(self, data: Dict[str, Dict[str, RawData]]):
-        super()._process_edge_data(data)
+        self._edge_columns = _AnnotationColumns()
 
-        self.edge_attributes_by_annotator = _nested_defaultdict(5)
+        for gid, attrs in data.items():
+            self._edge_columns.add_graph(gid, {tuple(edge.split('%%')): a
+                                               for edge, a in attrs.items()
+                                               if '%%' in edge})
 
-        for gid, attrs in self.edge_attributes.items():
-            for nid, subspaces in attrs.items():
-                for subspace, properties in subspaces.items():                    
-                    for prop, annotation in properties.items():
-                        for annid, val in annotation['value'].items():
-                            conf = annotation['confidence'][annid]
-                            self.edge_attributes_by_annotator[annid][gid][nid][subspace][prop] = \
-                                {'confidence': conf, 'value': val}
+        self._edge_attributes = None
+        self._edge_attributes_by_annotator = None
 
-        self.edge_attributes_by_annotator =\
-            _freeze_nested_defaultdict(self.edge_attributes_by_annotator)
+        self._edge_subspaces = {ss for gid, attrs in data.items()
+                                for edge, subspaces in attrs.items()
+                                if '%%' in edge
+                                for ss in subspaces}
 
+    def __getitem__(self, graphid: str):
+        node_attrs = self._node_columns.by_graph(graphid)
+        edge_attrs = self._edge_columns.by_graph(graphid)
 
-    @overrides
-    def _validate(self):
-        super()._validate()
+        return node_attrs, edge_attrs
 
-        if not all(self._metadata.has_annotators(ss, p)
-                   for ss in self._metadata.subspaces
-                   for p in self._metadata.properties(ss)):
+    @property
+    def node_attributes(self):
+        """The node attributes
+
+        These are built from the stored annotations the first time
+        they are accessed and kept afterwards, so later accesses
+        return the same dictionary and see changes made to it. The
+        stored annotations, which ``__getitem__`` and ``items``
+        return copies of, are not changed.
+        """
+        if self._node_attributes is None:
+            self._node_attributes = {gid: self._node_columns.by_graph(gid)
+                                     for gid in self._node_columns.graphids}
+
+        return self._node_attributes
+
+    @property
+    def edge_attributes(self):
+        """The edge attributes
+
+        These are built and kept in the same way as
+        ``node_attributes``.
+        """
+        if self._edge_attributes is None:
+            self._edge_attributes = {gid: self._edge_columns.by_graph(gid)
+                                     for gid in self._edge_columns.graphids}
+
+        return self._edge_attributes
+
+    @property
+    def node_graphids(self) -> Set[str]:
+        """The identifiers for graphs with node annotations"""
+        return set(self._node_columns.graphids)
+
+    @property
+    def edge_graphids(self) -> Set[str]:
+        """The identifiers for graphs with edge annotations"""
+        return set(self._edge_columns.graphids)
+
+    @property
+    def node_attributes_by_annotator(self):
+        """The node attributes for each annotator
+
+        These are built and kept in the same way as
+        ``node_attributes``, but independently of it, so changes to
+        one are not seen in the other.
+        """
+        if self._node_attributes_by_annotator is None:
+            self._node_attributes_by_annotator = {
+                annid: self._node_columns.by_annotator(annid)
+                for annid in self._node_columns.annotatorids
+            }
+
+        return self._node_attributes_by_annotator
+
+    @property
+    def edge_attributes_by_annotator(self):
+        """The edge attributes for each annotator
+
+        These are built and kept in the same way as
+        ``node_attributes``.
+        """
+        if self._edge_attributes_by_annotator is None:
+            self._edge_attributes_by_annotator = {
+                annid: self._edge_columns.by_annotator(annid)
+                for annid in self._edge_columns.annotatorids
+            }
+
+        return self._edge_attributes_by_annotator
+
+    @classmethod
+    @overrides
+    def _validate_metadata(cls, metadata: UDSAnnotationMetadata):
+        if not all(metadata.has_annotators(ss, p)
+                   for ss in metadata.subspaces
+                   for p in metadata.properties(ss)):
             errmsg = 'metadata for RawUDSAnnotation should ' +\
                      'specify annotators for all subspaces and properties'
             raise ValueError(errmsg)
@@ -577,11 +877,11 @@ class RawUDSAnnotation(UDSAnnotation):
                 yield gid, self[gid]
 
         elif annotation_type == "node":
-            if annotator_id in self.node_attributes_by_annotator:
-                for gid in self.graphids:
-                    node_attrs = self.node_attributes_by_annotator[annotator_id][gid]
+            if annotator_id in self._node_columns.annotatorids:
+                node_attrs = self._node_columns.by_annotator(annotator_id)
 
-                    yield gid, node_attrs
+                for gid in self.graphids:
+                    yield gid, node_attrs.get(gid, {})
 
             else:
                 errmsg = '{} does not have associated '.format(annotator_id) +\
@@ -589,11 +889,11 @@ class RawUDSAnnotation(UDSAnnotation):
                 raise ValueError(errmsg)
 
         elif annotation_type == "edge":
-            if annotator_id in self.edge_attributes_by_annotator:
-                for gid in self.graphids:
-                    edge_attrs = self.edge_attributes_by_annotator[annotator_id][gid]
+            if annotator_id in self._edge_columns.annotatorids:
+                edge_attrs = self._edge_columns.by_annotator(annotator_id)
 
-                    yield gid, edge_attrs
+                for gid in self.graphids:
+                    yield gid, edge_attrs.get(gid, {})
 
             else:
                 errmsg = '{} does not have associated '.format(annotator_id) +\
@@ -601,17 +901,137 @@ class RawUDSAnnotation(UDSAnnotation):
                 raise ValueError(errmsg)
 
         else:
+            node_attrs = self._node_columns.by_annotator(annotator_id)
+            edge_attrs = self._edge_columns.by_annotator(annotator_id)
+
             for gid in self.graphids:
-                if annotator_id in self.node_attributes_by_annotator:
-                    node_attrs = self.node_attributes_by_annotator[annotator_id][gid]
+                yield gid, (node_attrs.get(gid, {}), edge_attrs.get(gid, {}))
+
+
+class UDSAnnotationStream:
+    """Universal Decompositional Semantics annotations decoded incrementally
+
+    Each iteration over the stream decodes the annotation JSON anew,
+    one graph at a time, so that the annotations for at most one
+    graph are held in memory. Streams are constructed using
+    ``UDSAnnotation.stream_json``.
+
+    Parameters
+    ----------
+    annotation_type
+        the subclass of UDSAnnotation whose constraints the
+        annotations must satisfy
+    jsonfile
+        (path to) file containing annotations as JSON; file objects
+        must be seekable for the stream to be iterated over more
+        than once
+    """
+
+    def __init__(self, annotation_type: Type[UDSAnnotation],
+                 jsonfile: Union[str, TextIO]):
+        if isinstance(jsonfile, str) and\
+           splitext(basename(jsonfile))[-1] != '.json':
+            jsonfile = StringIO(jsonfile)
+
+        self._annotation_type = annotation_type
+        self._jsonfile = jsonfile
+        self._metadata = None
+        self._pending = None
+
+        if isinstance(jsonfile, str):
+            self._start = None
+
+        else:
+            self._start = jsonfile.tell() if jsonfile.seekable() else None
+            self._consumed = False
+
+    def _members(self) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+        if not isinstance(self._jsonfile, str):
+            if self._consumed and self._start is None:
+                errmsg = 'annotation JSON can only be streamed once ' +\
+                         'from a file object that is not seekable'
+                raise ValueError(errmsg)
+
+            if self._consumed:
+                self._jsonfile.seek(self._start)
+
+            self._consumed = True
+
+        for path, value in iter_json_object(self._jsonfile):
+            if path[0] == 'metadata' and self._metadata is None:
+                metadata = UDSAnnotationMetadata.from_dict(value)
+                self._annotation_type._validate_metadata(metadata)
+                self._metadata = metadata
+
+            elif path[0] not in ['metadata', 'data']:
+                warnmsg = 'ignoring the following field in ' +\
+                          'annotation JSON: ' + path[0]
+                warning(warnmsg)
+
+            yield path, value
 
-                else:
-                    node_attrs = {}
+    @property
+    def metadata(self) -> UDSAnnotationMetadata:
+        """All metadata for these annotations
+
+        The metadata are usually at the start of the JSON, but if not,
+        the JSON is decoded (without being retained) until they are
+        found.
+        """
+        if self._metadata is None:
+            members, skipped = self._members(), False
+
+            for path, _ in members:
+                if path[0] == 'metadata':
+                    # unless graphs were skipped to get here, iteration
+                    # resumes from here rather than decoding the JSON
+                    # from the start again
+                    self._pending = None if skipped else members
+                    break
+
+                skipped = True
+
+        if self._metadata is None:
+            errmsg = 'annotation JSON must specify both "metadata" and "data"'
+            raise ValueError(errmsg)
+
+        return self._metadata
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any],
+                                         Dict[Tuple[str, str], Any]]]:
+        """Generate graph identifiers with their node and edge attributes"""
+        metadata = self.metadata
+        excluded = self._annotation_type._excluded_attributes
+
+        members, self._pending = self._pending or self._members(), None
+
+        for path, attrs in members:
+            if path[0] != 'data':
+                continue
+
+            node_attrs = {node: a for node, a in attrs.items()
+                          if '%%' not in node}
+            edge_attrs = {tuple(edge.split('%%')): a
+                          for edge, a in attrs.items()
+                          if '%%' in edge}
 
-                if annotator_id in self.edge_attributes_by_annotator:    
-                    edge_attrs = self.edge_attributes_by_annotator[annotator_id][gid]
+            subspaces = {ss for a in node_attrs.values() for ss in a} -\
+                        excluded
+            subspaces |= {ss for a in edge_attrs.values() for ss in a}
 
-                else:
-                    edge_attrs = {}
+            if subspaces - metadata.subspaces:
+                missing = subspaces - metadata.subspaces
+                errmsg = 'The following subspaces do not have associated ' +\
+                         'metadata: ' + ','.join(missing)
+                raise ValueError(errmsg)
+
+            yield path[1], node_attrs, edge_attrs
 
-                yield gid, (node_attrs, edge_attrs)
+    def items(self):
+        """Dictionary-like items generator for attributes
+
+        This generator yields a graph identifier and a tuple of its
+        node and edge attributes, as ``UDSAnnotation.items`` does.
+        """
+        for gid, node_attrs, edge_attrs in self:
+            yield gid, (node_attrs, edge_attrs)
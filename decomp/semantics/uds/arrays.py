@@ -0,0 +1,139 @@
+"""Module for extracting UDS properties into NumPy arrays"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from typing import Union
+
+import numpy as np
+
+from .metadata import UDSDataType
+
+ElementId = Union[str, Tuple[str, str]]
+
+
+class PropertyArrays(NamedTuple):
+    """The values of a property for every node or edge in a corpus
+
+    All arrays are aligned: the ith entry of each describes the ith
+    node or edge, which is ``elementids[i]`` in the graph
+    ``graphids[graph_index[i]]``.
+
+    Attributes
+    ----------
+    values
+        the property values: floats, or integer codes into
+        ``categories`` if the property is categorical. Missing values
+        are NaN (or -1 for codes).
+    confidences
+        the confidences of the values; NaN if missing
+    graph_index
+        the index into graphids of the graph each node or edge is in
+    elementids
+        the identifier of each node or edge
+    mask
+        True where the node or edge does not have the property, as
+        for the mask of a ``numpy.ma.MaskedArray``
+    graphids
+        the identifiers of the graphs
+    categories
+        the categories of a categorical property, in the order their
+        codes refer to them: in their order for an ordered property,
+        and sorted by their string forms otherwise. None if the
+        property is not categorical
+    """
+
+    values: np.ndarray
+    confidences: np.ndarray
+    graph_index: np.ndarray
+    elementids: List[ElementId]
+    mask: np.ndarray
+    graphids: List[str]
+    categories: Optional[List[Any]]
+
+
+def property_arrays(elements: Iterable[Tuple[str, Dict[ElementId,
+                                                       Dict[str, Any]]]],
+                    subspace: str, prop: str,
+                    datatype: Optional[UDSDataType] = None) -> PropertyArrays:
+    """Collect the values of a property into aligned arrays
+
+    Parameters
+    ----------
+    elements
+        pairs of graph identifiers and the nodes or edges (with their
+        attributes) to collect the property from in that graph
+    subspace
+        the subspace of the property
+    prop
+        the property
+    datatype
+        the datatype of the property's values; if it is categorical,
+        values are encoded as integer codes
+    """
+    categories = None
+
+    if datatype is not None and datatype.is_categorical:
+        # unordered categories may be of mixed types (e.g. ints and
+        # strs), so they are sorted by their string forms
+        categories = list(datatype.categories)\
+                     if datatype.is_ordered_categorical\
+                     else sorted(datatype.categories, key=str)
+
+        codes = {category: code for code, category in enumerate(categories)}
+
+    graphids, graph_index, elementids = [], [], []
+    values, confidences, mask = [], [], []
+
+    for gid, elems in elements:
+        graphids.append(gid)
+
+        for elemid, attrs in elems.items():
+            graph_index.append(len(graphids) - 1)
+            elementids.append(elemid)
+
+            try:
+                annotation = attrs[subspace][prop]
+
+            except KeyError:
+                values.append(-1 if categories is not None else np.nan)
+                confidences.append(np.nan)
+                mask.append(True)
+
+                continue
+
+            value = annotation['value']
+
+            if isinstance(value, dict):
+                errmsg = 'only normalized annotations can be extracted ' +\
+                         'into arrays, but ' + subspace + '/' + prop +\
+                         ' in ' + gid + ' is raw'
+                raise ValueError(errmsg)
+
+            if categories is not None:
+                try:
+                    value = codes[value]
+
+                except KeyError:
+                    errmsg = str(value) + ' is not a category of ' +\
+                             subspace + '/' + prop
+                    raise ValueError(errmsg)
+
+            values.append(value)
+            confidences.append(annotation['confidence'])
+            mask.append(False)
+
+    arrays = PropertyArrays(np.array(values,
+                                     dtype=np.int64 if categories is not None
+                                     else np.float64),
+                            np.array(confidences, dtype=np.float64),
+                            np.array(graph_index, dtype=np.int64),
+                            elementids,
+                            np.array(mask, dtype=bool),
+                            graphids,
+                            categories)
+
+    # the arrays may be cached and shared, so they are made read-only
+    for array in [arrays.values, arrays.confidences,
+                  arrays.graph_index, arrays.mask]:
+        array.flags.writeable = False
+
+    return arrays
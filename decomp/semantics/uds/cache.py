@@ -0,0 +1,322 @@
+"""Module for caching method results and loaded annotations"""
+
+from threading import Lock
+from weakref import WeakValueDictionary
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+AnnotationCacheInfo = namedtuple('AnnotationCacheInfo',
+                                 ['hits', 'misses', 'evictions',
+                                  'maxsize', 'currsize',
+                                  'maxbytes', 'currbytes', 'weaksize'])
+
+
+class MethodCache:
+    """A bounded cache of method results for a single object
+
+    Unlike ``functools.lru_cache`` applied to a method, which keys on
+    the object and is shared by all instances of its class, a
+    MethodCache belongs to one object: it is discarded along with the
+    object and can be cleared when the object is modified. It may be
+    used by several threads at once.
+
+    Parameters
+    ----------
+    maxsize
+        the maximum number of results to keep; the least recently
+        used results are discarded beyond this. If None, all results
+        are kept, and if 0, nothing is cached.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError('maxsize must be a nonnegative int or None')
+
+        self._maxsize = maxsize
+        self._results = OrderedDict()
+        self._stamp = None
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """The maximum number of results to keep"""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: Optional[int]) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError('maxsize must be a nonnegative int or None')
+
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def _evict(self) -> None:
+        if self._maxsize is not None:
+            while len(self._results) > self._maxsize:
+                self._results.popitem(last=False)
+
+    def validate(self, stamp: Hashable) -> None:
+        """Clear the cache if stamp differs from the last one seen
+
+        Parameters
+        ----------
+        stamp
+            a summary of the state of the object that cached results
+            depend on
+        """
+        with self._lock:
+            if stamp != self._stamp:
+                self._results.clear()
+                self._stamp = stamp
+
+    def lookup(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """The cached result for key, computing it if necessary
+
+        Parameters
+        ----------
+        key
+            the key for the result
+        compute
+            a function of no arguments that computes the result
+        """
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                self._results.move_to_end(key)
+
+                return self._results[key]
+
+            self.misses += 1
+
+        # the result is computed without holding the lock, so that
+        # other results can be looked up in the meantime
+        result = compute()
+
+        with self._lock:
+            if self._maxsize != 0:
+                self._results[key] = result
+                self._evict()
+
+        return result
+
+    def clear(self) -> None:
+        """Discard all cached results; the counters are kept"""
+        with self._lock:
+            self._results.clear()
+
+    def info(self) -> CacheInfo:
+        """Hit and miss counts and the current and maximum size"""
+        return CacheInfo(self.hits, self.misses,
+                         self._maxsize, len(self._results))
+
+
+class CachedMethodsMixin:
+    """Gives each instance a MethodCache used by cached_method
+
+    Subclasses set CACHE_SIZE to bound the cache of each instance
+    and may override _cache_stamp to return a summary of the instance
+    state that cached results depend on; whenever it changes, the
+    cache is cleared.
+    """
+
+    CACHE_SIZE: Optional[int] = 128
+
+    @property
+    def method_cache(self) -> MethodCache:
+        """The cache of method results for this object"""
+        cache = self.__dict__.get('_method_cache')
+
+        if cache is None:
+            cache = self._method_cache = MethodCache(self.CACHE_SIZE)
+
+        return cache
+
+    def _cache_stamp(self) -> Hashable:
+        return None
+
+    def cache_info(self) -> CacheInfo:
+        """Hit and miss counts and the size of the method cache"""
+        return self.method_cache.info()
+
+    def clear_cache(self) -> None:
+        """Discard all cached method results"""
+        self.method_cache.clear()
+
+
+def cached_method(method: Callable) -> Callable:
+    """Cache the results of a method of a CachedMethodsMixin
+
+    Results are keyed on the method and its arguments, which must be
+    hashable, and stored in the cache of the instance the method is
+    called on.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.method_cache
+        cache.validate(self._cache_stamp())
+
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+
+        return cache.lookup(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+class AnnotationCache:
+    """A bounded cache of loaded annotations
+
+    Annotations are keyed on a digest of the JSON they were loaded
+    from rather than on the JSON itself, so that neither long JSON
+    strings nor open files are kept alive as keys, and annotations
+    loaded from the same JSON are shared however it was read.
+
+    The most recently used annotations are held until there are more
+    than maxsize of them or the JSON they were loaded from totals more
+    than maxbytes. Annotations evicted beyond these limits are only
+    weakly referenced: they are still returned while something else
+    (e.g. a corpus) holds them, but are otherwise freed. The cache may
+    be used by several threads at once.
+
+    Parameters
+    ----------
+    maxsize
+        the maximum number of annotations to hold; if None, the number
+        is unbounded, and if 0, annotations are only weakly referenced
+    maxbytes
+        the maximum total size of the JSON (in characters) that held
+        annotations were loaded from, which is a proxy for the memory
+        they use; if None, the size is unbounded
+    """
+
+    def __init__(self, maxsize: Optional[int] = 8,
+                 maxbytes: Optional[int] = None):
+        for name, limit in [('maxsize', maxsize), ('maxbytes', maxbytes)]:
+            if limit is not None and limit < 0:
+                raise ValueError(name + ' must be a nonnegative int or None')
+
+        self._maxsize = maxsize
+        self._maxbytes = maxbytes
+
+        self._held = OrderedDict()
+        self._weak = WeakValueDictionary()
+        self._bytes = 0
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """The maximum number of annotations to hold"""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: Optional[int]) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError('maxsize must be a nonnegative int or None')
+
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    @property
+    def maxbytes(self) -> Optional[int]:
+        """The maximum total size of the JSON of held annotations"""
+        return self._maxbytes
+
+    @maxbytes.setter
+    def maxbytes(self, maxbytes: Optional[int]) -> None:
+        if maxbytes is not None and maxbytes < 0:
+            raise ValueError('maxbytes must be a nonnegative int or None')
+
+        with self._lock:
+            self._maxbytes = maxbytes
+            self._evict()
+
+    def _over(self) -> bool:
+        return (self._maxsize is not None and
+                len(self._held) > self._maxsize) or\
+               (self._maxbytes is not None and self._bytes > self._maxbytes)
+
+    def _evict(self) -> None:
+        while self._held and self._over():
+            _, (_, size) = self._held.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def _hold(self, key: str, annotation: Any, size: int) -> None:
+        self._held[key] = (annotation, size)
+        self._bytes += size
+        self._evict()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._held or key in self._weak
+
+    def __len__(self) -> int:
+        return len(self._held)
+
+    def lookup(self, key: str, compute: Callable[[], Any],
+               size: int = 0) -> Any:
+        """The cached annotation for key, loading it if necessary
+
+        Parameters
+        ----------
+        key
+            the digest of the JSON the annotation is loaded from
+        compute
+            a function of no arguments that loads the annotation
+        size
+            the size of the JSON the annotation is loaded from
+        """
+        with self._lock:
+            if key in self._held:
+                self.hits += 1
+                self._held.move_to_end(key)
+
+                return self._held[key][0]
+
+            annotation = self._weak.get(key)
+
+            if annotation is not None:
+                # annotations that are in use elsewhere are held again
+                self.hits += 1
+                self._hold(key, annotation, size)
+
+                return annotation
+
+            self.misses += 1
+
+        # the annotation is loaded without holding the lock, so that
+        # other annotations can be looked up in the meantime
+        annotation = compute()
+
+        with self._lock:
+            if key not in self._held:
+                self._weak[key] = annotation
+                self._hold(key, annotation, size)
+
+        return annotation
+
+    def clear(self) -> None:
+        """Discard all cached annotations; the counters are kept"""
+        with self._lock:
+            self._held.clear()
+            self._weak.clear()
+            self._bytes = 0
+
+    def info(self) -> AnnotationCacheInfo:
+        """Hit, miss, and eviction counts and the current and maximum sizes"""
+        with self._lock:
+            return AnnotationCacheInfo(self.hits, self.misses,
+                                       self.evictions,
+                                       self._maxsize, len(self._held),
+                                       self._maxbytes, self._bytes,
+                                       len(self._weak))
@@ -7,7 +7,7 @@
 """Module for representing UDS corpora."""
 
 import os
-import json
+import gc
 import requests
 
 from pkg_resources import resource_filename
@@ -15,29 +15,48 @@ from os.path import basename, splitext
 from logging import warn
 from glob import glob
 from random import sample
-from functools import lru_cache
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from threading import Lock
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Union, Optional, Any, TextIO
-from typing import Dict, List, Set
-from io import BytesIO
+from typing import Dict, List, Set, Tuple, Iterator, Iterable, Hashable
+from io import BytesIO, StringIO
 from zipfile import ZipFile
+from networkx import DiGraph
+from rdflib import Dataset, URIRef
 from rdflib.query import Result
+from rdflib.plugins.sparql import prepareQuery
 from rdflib.plugins.sparql.sparql import Query
+from pyparsing import ParseException
+from ...graph import RDFConverter
+from ...corpus import LazyGraphDict, BuildCache
 from ..predpatt import PredPattCorpus
+from ..predpatt import DEFAULT_PREDPATT_OPTIONS
+from ..predpatt import SHARDS_PER_WORKER
 
 from .document import UDSDocument
 from .annotation import UDSAnnotation
 from .annotation import RawUDSAnnotation
 from .annotation import NormalizedUDSAnnotation
+from .annotation import UDSAnnotationStream
 from .graph import UDSSentenceGraph
 from .metadata import UDSCorpusMetadata
 from .metadata import UDSAnnotationMetadata
 from .metadata import UDSPropertyMetadata
+from .store import UDSGraphStore
+from .serialization import iter_json_object
+from .serialization import archive_members, open_file
+from .cache import CachedMethodsMixin, cached_method
+from .arrays import PropertyArrays, property_arrays
+from .serialization import write_jsonl, iter_jsonl, jsonl_chunks
+from .serialization import json_load, json_loads, json_dump, json_dumps
 
 
 Location = Union[str, TextIO]
 
 
-class UDSCorpus(PredPattCorpus):
+class UDSCorpus(PredPattCorpus, CachedMethodsMixin):
     """A collection of Universal Decompositional Semantics graphs
 
     Parameters
@@ -60,6 +79,15 @@ class UDSCorpus(PredPattCorpus):
         the split to load: "train", "dev", or "test"
     annotation_format
         which annotation type to load ("raw" or "normalized")
+    lazy
+        whether to defer building each sentence- and document-level
+        graph loaded from a split until it is first accessed
+    cache_size
+        if lazy, the maximum number of built sentence-level graphs
+        (and, separately, documents) to keep in memory; the least
+        recently accessed are discarded (and rebuilt on their next
+        access) beyond this, unless they have been annotated. If None
+        (default), all built graphs are kept.
     """
 
     UD_URL = 'https://github.com/UniversalDependencies/' +\
@@ -74,7 +102,9 @@ class UDSCorpus(PredPattCorpus):
                  document_annotations: List[UDSAnnotation] = [],
                  version: str = '1.0',
                  split: Optional[str] = None,
-                 annotation_format: str = 'normalized'):
+                 annotation_format: str = 'normalized',
+                 lazy: bool = False,
+                 cache_size: Optional[int] = None):
         self._validate_arguments(sentences, documents,
                                  version, split, annotation_format)
 
@@ -83,10 +113,21 @@ class UDSCorpus(PredPattCorpus):
 
         self._metadata = UDSCorpusMetadata()
 
+        # the names of the graphs and documents modified since the
+        # corpus was constructed
+        self._modified_sentences = set()
+        self._modified_documents = set()
+
         # methods inherited from Corpus that reference the self._graphs
         # attribute will operate on sentence-level graphs only        
-        self._graphs = self._sentences = {}
-        self._documents = {}
+        if lazy:
+            self._sentences, self._documents = self._lazy_graphs({}, {},
+                                                                 cache_size)
+        else:
+            self._sentences = {}
+            self._documents = {}
+
+        self._graphs = self._sentences
 
         self._initialize_paths(version, annotation_format)
         all_built = self._check_build_status()
@@ -108,11 +149,14 @@ class UDSCorpus(PredPattCorpus):
             self._process_conll(split, udewt)
 
         else:
-            self._sentences = sentences
+            self._graphs = self._sentences = sentences
             self._documents = documents
 
             self.add_annotation(sentence_annotations, document_annotations)
 
+            self._modified_sentences.clear()
+            self._modified_documents.clear()
+
     def _validate_arguments(self, sentences, documents,
                             version, split, annotation_format):
         # neither documents nor graphs should be supplied to the constructor
@@ -163,35 +207,17 @@ class UDSCorpus(PredPattCorpus):
                                                       'document',
                                                       'annotations')
 
+        # out of the box, the annotations are stored as zip files,
+        # whose JSON members are read directly rather than extracted
+        # (JSON that has already been extracted is still used)
         sent_ann_paths = glob(os.path.join(self._sentences_annotation_dir,
-                                           '*.json'))
+                                           '*.json')) or\
+            archive_members(glob(os.path.join(self._sentences_annotation_dir,
+                                              '*.zip')))
         doc_ann_paths = glob(os.path.join(self._documents_annotation_dir,
-                                          '*.json'))
-
-        # out of the box, the annotations are stored as zip files and the
-        # JSON they contain must be extracted
-        if not sent_ann_paths:
-            zipped_sent_paths = os.path.join(self._sentences_annotation_dir,
-                                             '*.zip')
-            zipped_sentence_annotations = glob(zipped_sent_paths)
-
-            for zipped in zipped_sentence_annotations:
-                ZipFile(zipped).extractall(path=self._sentences_annotation_dir)
-
-            sent_ann_paths = glob(os.path.join(self._sentences_annotation_dir,
-                                               '*.json'))
-
-        if not doc_ann_paths:
-            zipped_doc_paths = os.path.join(self._documents_annotation_dir,
-                                            '*.zip')
-
-            zipped_document_annotations = glob(zipped_doc_paths)
-
-            for zipped in zipped_document_annotations:
-                ZipFile(zipped).extractall(path=self._documents_annotation_dir)
-
-            doc_ann_paths = glob(os.path.join(self._documents_annotation_dir,
-                                              '*.json'))
+                                          '*.json')) or\
+            archive_members(glob(os.path.join(self._documents_annotation_dir,
+                                              '*.zip')))
 
         self._sentence_annotation_paths = sent_ann_paths
         self._document_annotation_paths = doc_ann_paths
@@ -209,60 +235,83 @@ class UDSCorpus(PredPattCorpus):
     def _load_split(self, split):
         sentence_fpath = self._sentences_paths[split]
         doc_fpath = self._documents_paths[split]
-        split = self.__class__.from_json(sentence_fpath, doc_fpath)
 
-        self._metadata += split.metadata
+        if isinstance(self._sentences, LazyGraphDict):
+            # the raw graphs are added directly, rather than loading
+            # the split as a separate corpus, so that its documents
+            # are built from this corpus's sentence-level graphs
+            sentences_json = self.__class__._read_json(sentence_fpath)
+            documents_json = self.__class__._read_json(doc_fpath)
+
+            self._sentences.add_raw(sentences_json['data'])
+            self._documents.add_raw(documents_json['data'])
+
+            metadata_dict = {'sentence_metadata': sentences_json['metadata'],
+                             'document_metadata': documents_json['metadata']}
+            self._metadata += UDSCorpusMetadata.from_dict(metadata_dict)
+
+        else:
+            split = self.__class__.from_json(sentence_fpath, doc_fpath)
+
+            self._metadata += split.metadata
 
-        self._sentences.update(split._sentences)
-        self._documents.update(split._documents)
+            self._sentences.update(split._sentences)
+            self._documents.update(split._documents)
 
     def _process_conll(self, split, udewt):
+        # graphs from previous builds are reused for sentences whose
+        # CoNLL is unchanged
+        cache = BuildCache(os.path.join(self.__class__.CACHE_DIR, 'build'))
+
+        conlls = {}
+
         with ZipFile(BytesIO(udewt)) as zf:
             conll_names = [fname for fname in zf.namelist()
                            if splitext(fname)[-1] == '.conllu']
             for fn in conll_names:
                 with zf.open(fn) as conll:
-                    conll_str = conll.read().decode('utf-8')
                     sname = splitext(basename(fn))[0].split('-')[-1]
-                    spl = self.__class__.from_conll(conll_str,
-                                                    self._sentence_annotation_paths,
-                                                    self._document_annotation_paths,
-                                                    annotation_format=self.annotation_format,
-                                                    version=self.version,
-                                                    name='ewt-'+sname)
-
-                    if sname == split or split is None:
-                        # add metadata
-                        self._metadata += spl.metadata
-
-                        # prepare sentences
-                        sentences_json_name = '-'.join(['uds', 'ewt', 'sentences',
-                                                        sname, self.annotation_format]) +\
-                                              '.json'
-                        sentences_json_path = os.path.join(self.__class__.CACHE_DIR,
-                                                           self.version,
-                                                           self.annotation_format,
-                                                           'sentence',
-                                                           sentences_json_name)
-
-                        self._sentences.update(spl._sentences)
-                        self._sentences_paths[sname] = sentences_json_path
-
-                        # prepare documents
-                        documents_json_name = '-'.join(['uds', 'ewt', 'documents',
-                                                        sname, self.annotation_format]) +\
-                                              '.json'
-                        documents_json_path = os.path.join(self.__class__.CACHE_DIR,
-                                                           self.version,
-                                                           self.annotation_format,
-                                                           'document',
-                                                           documents_json_name)
-
-                        self._documents.update(spl._documents)
-                        self._documents_paths[sname] = documents_json_path
-
-                        # serialize both
-                        spl.to_json(sentences_json_path, documents_json_path)
+                    conlls['ewt-'+sname] = conll.read().decode('utf-8')
+
+        # all splits are built at once, so that each annotation file
+        # is only decoded once
+        splits = self.__class__._from_conll_splits(conlls,
+                                                   self._sentence_annotation_paths,
+                                                   self._document_annotation_paths,
+                                                   annotation_format=self.annotation_format,
+                                                   version=self.version,
+                                                   cache=cache)
+
+        for name, spl in splits.items():
+            sname = name.split('-')[-1]
+
+            if sname == split or split is None:
+                # add metadata
+                self._metadata += spl.metadata
+
+                # prepare sentences
+                sentences_json_path = self.__class__._sentences_json_path(sname,
+                                                                          self.version,
+                                                                          self.annotation_format)
+
+                self._sentences.update(spl._sentences)
+                self._sentences_paths[sname] = sentences_json_path
+
+                # prepare documents
+                documents_json_name = '-'.join(['uds', 'ewt', 'documents',
+                                                sname, self.annotation_format]) +\
+                                      '.json'
+                documents_json_path = os.path.join(self.__class__.CACHE_DIR,
+                                                   self.version,
+                                                   self.annotation_format,
+                                                   'document',
+                                                   documents_json_name)
+
+                self._documents.update(spl._documents)
+                self._documents_paths[sname] = documents_json_path
+
+                # serialize both
+                spl.to_json(sentences_json_path, documents_json_path)
 
     @classmethod
     def from_conll(cls,
@@ -271,7 +320,9 @@ class UDSCorpus(PredPattCorpus):
                    document_annotations: List[Location] = [],
                    annotation_format: str = 'normalized',
                    version: str = '2.0',
-                   name: str = 'ewt') -> 'UDSCorpus':
+                   name: str = 'ewt',
+                   workers: Optional[int] = None,
+                   cache: Optional[BuildCache] = None) -> 'UDSCorpus':
         """Load UDS graph corpus from CoNLL (dependencies) and JSON (annotations)
 
         This method should only be used if the UDS corpus is being
@@ -285,57 +336,173 @@ class UDSCorpus(PredPattCorpus):
             (path to) Universal Dependencies corpus in conllu format
         sentence_annotations
             a list of paths to JSON files or open JSON files containing
-            sentence-level annotations
+            sentence-level annotations, which are streamed into the
+            graphs one graph at a time
         document_annotations
             a list of paths to JSON files or open JSON files containing
-            document-level annotations
+            document-level annotations, which are streamed into the
+            documents one document at a time
         annotation_format
             Whether the annotation is raw or normalized
         version
             the version of UDS datasets to use
         name
             corpus name to be appended to the beginning of graph ids
+        workers
+            the number of processes to extract predpatts and build
+            sentence-level graphs in; if None (default), they are
+            built in the current process. The resulting graphs and
+            their identifiers are the same either way.
+        cache
+            a cache of results from previous builds. Sentence-level
+            graphs whose CoNLL, identifier, and predpatt options are
+            unchanged are read from it rather than rebuilt. If the
+            annotations are paths, the annotated corpus as a whole is
+            also cached, keyed on the CoNLL and the contents of the
+            annotation files, and is reused if none of them change.
         """
+        data = PredPattCorpus._read_conll(corpus)
+
+        return cls._from_conll_splits({name: data},
+                                      sentence_annotations,
+                                      document_annotations,
+                                      annotation_format, version,
+                                      workers, cache)[name]
+
+    @classmethod
+    def _from_conll_splits(cls, conlls: Dict[str, str],
+                           sentence_annotations: List[Location],
+                           document_annotations: List[Location],
+                           annotation_format: str = 'normalized',
+                           version: str = '2.0',
+                           workers: Optional[int] = None,
+                           cache: Optional[BuildCache] = None) -> Dict[str, 'UDSCorpus']:
+        # annotations are streamed into the graphs rather than loaded
+        # whole, so that only one graph's annotations are in memory.
+        # Each annotation file is streamed once into the graphs of
+        # every split being built, rather than once per split
         if annotation_format == 'raw':
-            loader = RawUDSAnnotation.from_json
+            loader = RawUDSAnnotation.stream_json
         elif annotation_format == 'normalized':
-            loader = NormalizedUDSAnnotation.from_json
+            loader = NormalizedUDSAnnotation.stream_json
         else:
             raise ValueError('annotation_format must be either'
                              '"raw" or "normalized"')
 
-        predpatt_corpus = PredPattCorpus.from_conll(corpus, name=name)
-        predpatt_sentence_graphs = {name: UDSSentenceGraph(g, name)
-                                    for name, g in predpatt_corpus.items()}
-        predpatt_documents = cls._initialize_documents(predpatt_sentence_graphs)
+        corpora, corpus_keys = {}, {}
+
+        for name, data in conlls.items():
+            if cache is not None:
+                corpus_keys[name] = cls._corpus_key(cache, data, name,
+                                                    sentence_annotations,
+                                                    document_annotations,
+                                                    annotation_format,
+                                                    version)
+
+            if corpus_keys.get(name) is not None:
+                key = corpus_keys[name]
+                sentences_cached = cache.get(cache.digest(key, 'sentences'))
+                documents_cached = cache.get(cache.digest(key, 'documents'))
+
+                if sentences_cached is not None and documents_cached is not None:
+                    corpora[name] = cls._from_json_dicts(json_loads(sentences_cached),
+                                                         json_loads(documents_cached),
+                                                         version=version,
+                                                         annotation_format=annotation_format)
+
+        built = [name for name in conlls if name not in corpora]
 
-        # process sentence-level graph annotations
-        processed_sentence_annotations = []
+        if not built:
+            return corpora
 
-        for ann_path in sentence_annotations:
-            ann = loader(ann_path)
-            processed_sentence_annotations.append(ann)
+        sentences, documents = {}, {}
 
-        # process document-level graph annotations
-        processed_document_annotations = []
+        for name in built:
+            data = conlls[name]
 
-        for ann_path in document_annotations:
-            ann = loader(ann_path)
-            processed_document_annotations.append(ann)
+            if (workers is not None and workers > 1) or cache is not None:
+                predpatt_sentence_graphs =\
+                    PredPattCorpus._build_conll_graphs(data, name,
+                                                       DEFAULT_PREDPATT_OPTIONS,
+                                                       workers, UDSSentenceGraph,
+                                                       cache)
 
-        return cls(predpatt_sentence_graphs, predpatt_documents, 
-                   processed_sentence_annotations,
-                   processed_document_annotations,
-                   version=version,
-                   annotation_format=annotation_format)
+            else:
+                predpatt_corpus = PredPattCorpus.from_conll(data, name=name)
+                predpatt_sentence_graphs = {gid: UDSSentenceGraph(g, gid)
+                                            for gid, g in predpatt_corpus.items()}
+
+            predpatt_documents = cls._initialize_documents(predpatt_sentence_graphs)
+
+            corpora[name] = cls(predpatt_sentence_graphs, predpatt_documents,
+                                version=version,
+                                annotation_format=annotation_format)
+
+            sentences.update(predpatt_sentence_graphs)
+            documents.update(predpatt_documents)
+
+        # process sentence- and document-level graph annotations
+        processed_sentence_annotations = [loader(ann_path) for ann_path
+                                          in sentence_annotations]
+        processed_document_annotations = [loader(ann_path) for ann_path
+                                          in document_annotations]
+
+        for name in built:
+            for ann in processed_sentence_annotations:
+                corpora[name]._metadata.add_sentence_metadata(ann.metadata)
+
+            for ann in processed_document_annotations:
+                corpora[name]._metadata.add_document_metadata(ann.metadata)
+
+        cls._apply_annotations(processed_sentence_annotations, sentences)
+        cls._apply_annotations(processed_document_annotations, documents)
+
+        for name in built:
+            if corpus_keys.get(name) is not None:
+                key = corpus_keys[name]
+                sentences_out, documents_out = StringIO(), StringIO()
+                corpora[name].to_json(sentences_out, documents_out)
+
+                cache.put(cache.digest(key, 'sentences'),
+                          sentences_out.getvalue())
+                cache.put(cache.digest(key, 'documents'),
+                          documents_out.getvalue())
+
+        return {name: corpora[name] for name in conlls}
+
+    @staticmethod
+    def _corpus_key(cache: BuildCache, data: str, name: str,
+                    sentence_annotations: List[Location],
+                    document_annotations: List[Location],
+                    annotation_format: str, version: str) -> Optional[str]:
+        # annotations passed as open files cannot be digested without
+        # consuming them, so the corpus as a whole is not cached
+        if not all(isinstance(ann, str)
+                   for ann in sentence_annotations + document_annotations):
+            return None
+
+        options_key = PredPattCorpus._options_key(DEFAULT_PREDPATT_OPTIONS)
+
+        return cache.digest('uds', data, name, options_key,
+                            annotation_format, version,
+                            'sentence', *[UDSCorpus._file_digest(cache, ann)
+                                          for ann in sentence_annotations],
+                            'document', *[UDSCorpus._file_digest(cache, ann)
+                                          for ann in document_annotations])
+
+    @staticmethod
+    def _file_digest(cache: BuildCache, path: str) -> str:
+        # annotation files may be members of zip archives
+        with open_file(path, 'rb') as infile:
+            return cache.file_digest(infile)
 
     @classmethod
     def _load_ud_ids(cls, sentence_ids_only: bool = False) -> Dict[str, Dict[str, str]]:
         # load in the document and sentence IDs for each sentence-level graph
         ud_ids_path = os.path.join(cls.ANN_DIR, 'ud_ids.json')
 
-        with open(ud_ids_path) as ud_ids_file:
-            ud_ids = json.load(ud_ids_file)
+        with open(ud_ids_path, 'rb') as ud_ids_file:
+            ud_ids = json_load(ud_ids_file)
 
             if sentence_ids_only:
                 return {k: v['sentence_id'] for k, v in ud_ids.items()}
@@ -343,9 +510,81 @@ class UDSCorpus(PredPattCorpus):
             else:
                 return ud_ids
 
+    @staticmethod
+    def _is_jsonl(jsonfile: Location, jsonl: Optional[bool] = None) -> bool:
+        if jsonl is not None:
+            return jsonl
+
+        return isinstance(jsonfile, str) and\
+            splitext(basename(jsonfile))[-1] == '.jsonl'
+
+    @classmethod
+    def _read_json(cls, jsonfile: Location,
+                   jsonl: Optional[bool] = None) -> Dict[str, Any]:
+        if cls._is_jsonl(jsonfile, jsonl):
+            metadata, data = cls._read_jsonl_records(iter_jsonl(jsonfile))
+
+            return {'metadata': metadata, 'data': data}
+
+        elif isinstance(jsonfile, str) and splitext(basename(jsonfile))[-1] == '.json':
+            with open(jsonfile, 'rb') as infile:
+                return json_load(infile)
+
+        elif isinstance(jsonfile, str):
+            return json_loads(jsonfile)
+
+        else:
+            return json_load(jsonfile)
+
+    @staticmethod
+    def _read_jsonl_records(records: Iterator[Dict[str, Any]],
+                            build: Optional[Any] = None) -> Tuple[Dict, Dict]:
+        metadata = UDSAnnotationMetadata({})
+        data = {}
+
+        for record in records:
+            if 'metadata' in record:
+                metadata += UDSAnnotationMetadata.from_dict(record['metadata'])
+
+            elif build is None:
+                data[record['name']] = record['data']
+
+            else:
+                data[record['name']] = build(record['name'], record['data'])
+
+        return metadata.to_dict(), data
+
+    @classmethod
+    def _read_sentences_jsonl(cls, path: str,
+                              workers: int) -> Dict[str, Any]:
+        chunks = jsonl_chunks(path, workers)
+        ud_ids = cls._load_ud_ids()
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_read_sentences_jsonl_chunk,
+                                       path, start, end, ud_ids)
+                       for start, end in chunks]
+
+            results = [future.result() for future in futures]
+
+        # chunks are merged in file order, so that later records for
+        # the same graph take precedence, as when reading serially
+        metadata = UDSAnnotationMetadata({})
+        sentences = {}
+
+        for chunk_metadata, chunk_sentences in results:
+            metadata += UDSAnnotationMetadata.from_dict(chunk_metadata)
+            sentences.update(chunk_sentences)
+
+        return {'metadata': metadata.to_dict(), 'data': sentences}
+
     @classmethod
     def from_json(cls, sentences_jsonfile: Location,
-                  documents_jsonfile: Location) -> 'UDSCorpus':
+                  documents_jsonfile: Location,
+                  lazy: bool = False,
+                  cache_size: Optional[int] = None,
+                  jsonl: Optional[bool] = None,
+                  workers: Optional[int] = None) -> 'UDSCorpus':
         """Load annotated UDS graph corpus (including annotations) from JSON
 
         This is the suggested method for loading the UDS corpus.
@@ -358,41 +597,67 @@ class UDSCorpus(PredPattCorpus):
         documents_jsonfile
             file containing Universal Decompositional Semantics corpus
             document-level graphs in JSON format
+        lazy
+            whether to defer building each graph until it is first
+            accessed; the JSON itself is still read in full
+        cache_size
+            if lazy, the maximum number of built sentence-level graphs
+            (and, separately, documents) to keep in memory
+        jsonl
+            whether the files are in the line-delimited JSON (JSONL)
+            layout written by UDSCorpus.to_json; if None (default),
+            this is inferred from a ".jsonl" extension
+        workers
+            the number of processes to parse and build sentence-level
+            graphs in if the sentence-level graphs are in a JSONL file
+            (not a file object) and lazy is False; if None (default),
+            they are parsed in the current process
         """
-        sentences_ext = splitext(basename(sentences_jsonfile))[-1]
-        documents_ext = splitext(basename(documents_jsonfile))[-1]
-        sent_ids = cls._load_ud_ids(sentence_ids_only=True)
-
-        # process sentence-level graphs
-        if isinstance(sentences_jsonfile, str) and sentences_ext == '.json':
-            with open(sentences_jsonfile) as infile:
-                sentences_json = json.load(infile)
-
-        elif isinstance(sentences_jsonfile, str):
-            sentences_json = json.loads(sentences_jsonfile)
+        if workers is not None and workers > 1 and not lazy and\
+           isinstance(sentences_jsonfile, str) and\
+           cls._is_jsonl(sentences_jsonfile, jsonl):
+            sentences_json = cls._read_sentences_jsonl(sentences_jsonfile,
+                                                       workers)
+            prebuilt = True
 
         else:
-            sentences_json = json.load(sentences_jsonfile)
+            sentences_json = cls._read_json(sentences_jsonfile, jsonl)
+            prebuilt = False
 
-        sentences = {name: UDSSentenceGraph.from_dict(g_json, name)
-                     for name, g_json in sentences_json['data'].items()}
+        documents_json = cls._read_json(documents_jsonfile, jsonl)
 
-        # process document-level graphs
-        if isinstance(documents_jsonfile, str) and documents_ext == '.json':
-            with open(documents_jsonfile) as infile:
-                documents_json = json.load(infile)
+        return cls._from_json_dicts(sentences_json, documents_json,
+                                    prebuilt, lazy, cache_size)
 
-        elif isinstance(documents_jsonfile, str):
-            documents_json = json.loads(documents_jsonfile)
+    @classmethod
+    def _from_json_dicts(cls, sentences_json: Dict[str, Any],
+                         documents_json: Dict[str, Any],
+                         prebuilt: bool = False,
+                         lazy: bool = False,
+                         cache_size: Optional[int] = None,
+                         **kwargs) -> 'UDSCorpus':
+        if lazy:
+            sentences, documents = cls._lazy_graphs(sentences_json['data'],
+                                                    documents_json['data'],
+                                                    cache_size)
 
         else:
-            documents_json = json.load(documents_jsonfile)
+            sent_ids = cls._load_ud_ids(sentence_ids_only=True)
 
-        documents = {name: UDSDocument.from_dict(d_json, sentences,
-                                                 sent_ids, name)
-                     for name, d_json in documents_json['data'].items()}
+            # process sentence-level graphs
+            if prebuilt:
+                sentences = sentences_json['data']
 
-        corpus = cls(sentences, documents)
+            else:
+                sentences = {name: UDSSentenceGraph.from_dict(g_json, name)
+                             for name, g_json in sentences_json['data'].items()}
+
+            # process document-level graphs
+            documents = {name: UDSDocument.from_dict(d_json, sentences,
+                                                     sent_ids, name)
+                         for name, d_json in documents_json['data'].items()}
+
+        corpus = cls(sentences, documents, **kwargs)
 
         metadata_dict = {'sentence_metadata': sentences_json['metadata'],
                          'document_metadata': documents_json['metadata']}
@@ -401,27 +666,233 @@ class UDSCorpus(PredPattCorpus):
 
         return corpus
 
+    @classmethod
+    def from_store(cls, sentences_storefile: str,
+                   documents_storefile: str,
+                   cache_size: Optional[int] = None) -> 'UDSCorpus':
+        """Load annotated UDS graph corpus from indexed binary stores
+
+        Unlike UDSCorpus.from_json, only the index of each store is
+        read when the corpus is loaded. Each sentence- or
+        document-level graph is deserialized the first time it is
+        accessed.
+
+        Parameters
+        ----------
+        sentences_storefile
+            path to a store containing Universal Decompositional
+            Semantics corpus sentence-level graphs, as written by
+            UDSCorpus.to_store
+        documents_storefile
+            path to a store containing Universal Decompositional
+            Semantics corpus document-level graphs, as written by
+            UDSCorpus.to_store
+        cache_size
+            the maximum number of built sentence-level graphs (and,
+            separately, documents) to keep in memory; the least
+            recently accessed are discarded (and rebuilt on their next
+            access) beyond this. If None (default), all built graphs
+            are kept.
+        """
+        sentences_store = UDSGraphStore(sentences_storefile)
+        documents_store = UDSGraphStore(documents_storefile)
+
+        sentences, documents = cls._lazy_graphs(sentences_store,
+                                                documents_store,
+                                                cache_size)
+
+        corpus = cls(sentences, documents)
+
+        metadata_dict = {'sentence_metadata': sentences_store.metadata,
+                         'document_metadata': documents_store.metadata}
+        metadata = UDSCorpusMetadata.from_dict(metadata_dict)
+        corpus.add_corpus_metadata(metadata)
+
+        return corpus
+
+    @classmethod
+    def _lazy_graphs(cls, sentences_raw: Dict[str, Dict],
+                     documents_raw: Dict[str, Dict],
+                     cache_size: Optional[int] = None):
+        # the document and sentence IDs are only loaded once the first
+        # graph is built, so that opening a corpus does not read them
+        ud_ids, sent_ids = None, None
+
+        def load_ud_ids():
+            nonlocal ud_ids, sent_ids
+
+            if ud_ids is None:
+                ud_ids = cls._load_ud_ids()
+                sent_ids = {k: v['sentence_id'] for k, v in ud_ids.items()}
+
+        def build_sentence(name, g_json):
+            load_ud_ids()
+
+            return cls._build_sentence_graph(name, g_json, ud_ids)
+
+        def build_document(name, d_json):
+            load_ud_ids()
+
+            document = UDSDocument.from_dict(d_json, sentences, sent_ids, name)
+
+            # sentence-level graphs may be discarded and rebuilt, so the
+            # document looks them up in the corpus rather than holding
+            # the graphs it was built with
+            document.sentence_graphs = _LazySentenceGraphs(document.sentence_graphs,
+                                                           sentences)
+
+            return document
+
+        sentences = LazyGraphDict(sentences_raw, build_sentence, cache_size)
+        documents = LazyGraphDict(documents_raw, build_document, cache_size)
+
+        return sentences, documents
+
+    @staticmethod
+    def _build_sentence_graph(name: str, g_json: Dict,
+                              ud_ids: Dict[str, Dict[str, str]]) -> UDSSentenceGraph:
+        graph = UDSSentenceGraph.from_dict(g_json, name)
+
+        # documents set these identifiers when they are built, but
+        # sentence-level graphs may be accessed on their own
+        if name in ud_ids:
+            graph.sentence_id = ud_ids[name]['sentence_id']
+            graph.document_id = ud_ids[name]['document_id']
+
+        return graph
+
+    @classmethod
+    def iter_graphs(cls, split: Optional[str] = None,
+                    path: Optional[Union[Location, List[Location]]] = None,
+                    version: str = '1.0',
+                    annotation_format: str = 'normalized') -> Iterator[Tuple[str, UDSSentenceGraph]]:
+        """Iterate over annotated sentence-level graphs one at a time
+
+        Unlike loading a UDSCorpus, only a single graph is held in
+        memory at a time: graphs are decoded incrementally from
+        sentence-level graph JSON or JSONL (as written by
+        UDSCorpus.to_json) or read one record at a time from a store
+        (as written by UDSCorpus.to_store).
+
+        Parameters
+        ----------
+        split
+            the split to iterate over: "train", "dev", or "test". If
+            neither this nor path is specified, all splits are
+            iterated over. The corpus must already have been built
+            for the splits to be available.
+        path
+            (path to) a file, or a list of such, containing
+            sentence-level graphs to iterate over instead of a split
+        version
+            the version of UDS datasets to use if iterating over a split
+        annotation_format
+            the annotation type ("raw" or "normalized") to use if
+            iterating over a split
+        """
+        if path is None:
+            splits = ['train', 'dev', 'test'] if split is None else [split]
+            paths = [cls._sentences_json_path(s, version, annotation_format)
+                     for s in splits]
+
+            for p in paths:
+                if not os.path.exists(p):
+                    errmsg = p + ' does not exist; initialize a ' +\
+                             'UDSCorpus to build it first'
+                    raise ValueError(errmsg)
+
+        elif isinstance(path, list):
+            paths = path
+
+        else:
+            paths = [path]
+
+        ud_ids = cls._load_ud_ids()
+
+        for p in paths:
+            if isinstance(p, str) and UDSGraphStore.is_store(p):
+                with UDSGraphStore(p) as store:
+                    for name, g_json in store.items():
+                        yield name, cls._build_sentence_graph(name, g_json,
+                                                              ud_ids)
+
+                continue
+
+            if cls._is_jsonl(p):
+                for record in iter_jsonl(p):
+                    if 'name' in record:
+                        yield record['name'],\
+                            cls._build_sentence_graph(record['name'],
+                                                      record['data'], ud_ids)
+
+                continue
+
+            if isinstance(p, str) and splitext(basename(p))[-1] != '.json':
+                p = StringIO(p)
+
+            for (key, *name), g_json in iter_json_object(p):
+                if key == 'data' and name:
+                    yield name[0], cls._build_sentence_graph(name[0], g_json,
+                                                             ud_ids)
+
+    @classmethod
+    def _sentences_json_path(cls, split: str, version: str,
+                             annotation_format: str) -> str:
+        sentences_json_name = '-'.join(['uds', 'ewt', 'sentences',
+                                        split, annotation_format]) + '.json'
+
+        return os.path.join(cls.CACHE_DIR, version, annotation_format,
+                            'sentence', sentences_json_name)
+
     def add_corpus_metadata(self, metadata: UDSCorpusMetadata) -> None:
         self._metadata += metadata
 
-    def add_annotation(self, sentence_annotation: UDSAnnotation,
-                       document_annotation: UDSAnnotation) -> None:
+    def add_annotation(self, sentence_annotation: List[Union[UDSAnnotation,
+                                                             UDSAnnotationStream]],
+                       document_annotation: List[Union[UDSAnnotation,
+                                                       UDSAnnotationStream]],
+                       workers: Optional[int] = None) -> None:
         """Add annotations to UDS sentence and document graphs
 
+        Annotations are applied graph by graph, so that each graph
+        receives all of its annotations at once, in the order the
+        annotations are given. Adding several annotations with one
+        call is thus faster than adding them one at a time.
+
         Parameters
         ----------
         sentence_annotation
             the annotations to add to the sentence graphs in the corpus
         document_annotation
             the annotations to add to the document graphs in the corpus
+        workers
+            the number of processes to add the sentence annotations in;
+            if None (default), they are added in the current process.
+            The sentence graphs are sharded in order across the
+            workers, and the annotated graphs are the same either way.
+            Streamed annotations and document annotations are always
+            added in the current process.
         """
         for ann in sentence_annotation:
-            self.add_sentence_annotation(ann)
+            self._metadata.add_sentence_metadata(ann.metadata)
 
         for ann in document_annotation:
-            self.add_document_annotation(ann)
+            self._metadata.add_document_metadata(ann.metadata)
+
+        self._modified_sentences |= self._apply_annotations(sentence_annotation,
+                                                            self._sentences,
+                                                            workers)
+        self._modified_documents |= self._apply_annotations(document_annotation,
+                                                            self._documents)
+
+        self.clear_cache()
 
-    def add_sentence_annotation(self, annotation: UDSAnnotation) -> None:
+        if sentence_annotation:
+            self._corpus_rdf = (None, None, None)
+            self.shutdown_workers()
+
+    def add_sentence_annotation(self, annotation: Union[UDSAnnotation,
+                                                        UDSAnnotationStream]) -> None:
         """Add annotations to UDS sentence graphs
 
         Parameters
@@ -429,14 +900,10 @@ class UDSCorpus(PredPattCorpus):
         annotation
             the annotations to add to the graphs in the corpus
         """
-        self._metadata.add_sentence_metadata(annotation.metadata)
-
-        for gname, (node_attrs, edge_attrs) in annotation.items():
-            if gname in self._sentences:
-                self._sentences[gname].add_annotation(node_attrs,
-                                                      edge_attrs)
+        self.add_annotation([annotation], [])
 
-    def add_document_annotation(self, annotation: UDSAnnotation) -> None:
+    def add_document_annotation(self, annotation: Union[UDSAnnotation,
+                                                        UDSAnnotationStream]) -> None:
         """Add annotations to UDS documents
 
         Parameters
@@ -444,12 +911,85 @@ class UDSCorpus(PredPattCorpus):
         annotation
             the annotations to add to the documents in the corpus
         """
-        self._metadata.add_document_metadata(annotation.metadata)
+        self.add_annotation([], [annotation])
 
-        for dname, (node_attrs, edge_attrs) in annotation.items():
-            if dname in self._documents:
-                self._documents[dname].add_annotation(node_attrs,
-                                                      edge_attrs)
+    @classmethod
+    def _apply_annotations(cls, annotations: List[Union[UDSAnnotation,
+                                                        UDSAnnotationStream]],
+                           graphs: Dict[str, Any],
+                           workers: Optional[int] = None) -> Set[str]:
+        # runs of annotations that can be looked up by graph are
+        # applied graph by graph, so that each graph is retrieved (and
+        # for a lazy corpus, loaded) once for all of them; streamed
+        # annotations can only be applied in the order they are read.
+        # The names of the graphs annotated are returned
+        batch, annotated = [], set()
+
+        for ann in list(annotations) + [None]:
+            if isinstance(ann, UDSAnnotation):
+                batch.append(ann)
+                continue
+
+            # the garbage collector is only paused while annotations
+            # are added in this process, and not while workers do so
+            if batch and workers is not None and workers > 1:
+                annotated.update(cls._apply_annotations_in_parallel(batch,
+                                                                    graphs,
+                                                                    workers))
+
+            elif batch:
+                with _gc_paused():
+                    annotated.update(_apply_annotation_batch(batch, graphs))
+
+            batch = []
+
+            if ann is not None:
+                with _gc_paused():
+                    for gname, (node_attrs, edge_attrs) in ann.items():
+                        if gname in graphs:
+                            graph = graphs[gname]
+                            graph.add_annotation(node_attrs, edge_attrs)
+                            graphs[gname] = graph
+
+                            annotated.add(gname)
+
+        return annotated
+
+    @staticmethod
+    def _apply_annotations_in_parallel(batch: List[UDSAnnotation],
+                                       graphs: Dict[str, 'UDSSentenceGraph'],
+                                       workers: int) -> List[str]:
+        # the graphs are sharded in order across the workers, each of
+        # which receives the annotations once, and the annotated
+        # graphs are installed in shard order. Documents hold the
+        # sentence graphs themselves, so only the underlying NetworkX
+        # graphs are replaced
+        gids = [gid for gid in dict.fromkeys(gid for ann in batch
+                                             for gid in ann.graphids)
+                if gid in graphs]
+
+        nshards = workers * SHARDS_PER_WORKER
+        shardsize = max(1, -(-len(gids) // nshards))
+
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_load_annotation_batch,
+                                 initargs=(batch,)) as executor:
+            futures = [executor.submit(_annotate_shard,
+                                       {gid: graphs[gid]
+                                        for gid in gids[i:i+shardsize]})
+                       for i in range(0, len(gids), shardsize)]
+
+            for future in futures:
+                for gid, nxgraph in future.result().items():
+                    graph = graphs[gid]
+                    graph.graph = nxgraph
+                    graph._discard_derived()
+
+                    # reassigning a lazily built graph prevents it from
+                    # being discarded (and its annotations with it)
+                    graphs[gid] = graph
+
+        return gids
 
     @classmethod
     def _initialize_documents(cls, graphs: Dict[str, 'UDSSentenceGraph']) -> Dict[str, UDSDocument]:
@@ -479,7 +1019,10 @@ class UDSCorpus(PredPattCorpus):
 
     def to_json(self,
                 sentences_outfile: Optional[Location] = None,
-                documents_outfile: Optional[Location] = None) -> Optional[str]:
+                documents_outfile: Optional[Location] = None,
+                jsonl: Optional[bool] = None,
+                append: bool = False,
+                modified_only: bool = False) -> Optional[str]:
         """Serialize corpus to json
 
         Parameters
@@ -488,7 +1031,36 @@ class UDSCorpus(PredPattCorpus):
             file to serialize sentence-level graphs to
         documents_outfile
             file to serialize document-level graphs to
+        jsonl
+            whether to use a line-delimited JSON (JSONL) layout: a
+            metadata record followed by one graph per line. This
+            layout can be appended to and parsed in parallel by
+            UDSCorpus.from_json. If None (default), this is inferred
+            from a ".jsonl" extension on sentences_outfile.
+        append
+            whether to append the graphs (and metadata) to existing
+            JSONL files rather than overwriting them. Graphs in the
+            appended records take precedence over earlier graphs
+            with the same name when the files are loaded.
+        modified_only
+            whether to append only the graphs and documents modified
+            (e.g. by UDSCorpus.add_annotation) since the corpus was
+            constructed or last written with modified_only, so that
+            files written from the corpus can be brought up to date
+            without rewriting them. Requires append.
         """
+        if modified_only and not append:
+            errmsg = 'modified graphs can only be written by appending them'
+            raise ValueError(errmsg)
+
+        if self._is_jsonl(sentences_outfile, jsonl):
+            return self._to_jsonl(sentences_outfile, documents_outfile,
+                                  append, modified_only)
+
+        elif append:
+            errmsg = 'only JSONL files can be appended to'
+            raise ValueError(errmsg)
+
         metadata_serializable = self._metadata.to_dict()
 
         # convert graphs to dictionaries
@@ -498,14 +1070,14 @@ class UDSCorpus(PredPattCorpus):
                                            in self._sentences.items()}}
 
         if sentences_outfile is None:
-            return json.dumps(sentences_serializable)
+            return json_dumps(sentences_serializable)
 
         elif isinstance(sentences_outfile, str):
-            with open(sentences_outfile, 'w') as out:
-                json.dump(sentences_serializable, out)
+            with open(sentences_outfile, 'w', encoding='utf-8') as out:
+                json_dump(sentences_serializable, out)
 
         else:
-            json.dump(sentences_serializable, sentences_outfile)
+            json_dump(sentences_serializable, sentences_outfile)
 
         # Serialize documents (Note: we serialize only the *graphs*
         # for each document — not the metadata, which is loaded by
@@ -516,22 +1088,179 @@ class UDSCorpus(PredPattCorpus):
                                            in self._documents.items()}}
 
         if documents_outfile is None:
-            return json.dumps(documents_serializable)
+            return json_dumps(documents_serializable)
 
         elif isinstance(documents_outfile, str):
-            with open(documents_outfile, 'w') as out:
-                json.dump(documents_serializable, out)
+            with open(documents_outfile, 'w', encoding='utf-8') as out:
+                json_dump(documents_serializable, out)
 
         else:
-            json.dump(documents_serializable, documents_outfile)
+            json_dump(documents_serializable, documents_outfile)
+
+    def _to_jsonl(self, sentences_outfile: Optional[Location],
+                  documents_outfile: Optional[Location],
+                  append: bool,
+                  modified_only: bool = False) -> Optional[str]:
+        metadata_serializable = self._metadata.to_dict()
+
+        sentences_records = self._sentence_records(modified_only)
+        documents_records = self._document_records(modified_only)
+
+        if sentences_outfile is None:
+            out = StringIO()
+            write_jsonl(out, sentences_records,
+                        metadata_serializable['sentence_metadata'])
+
+            return out.getvalue()
+
+        write_jsonl(sentences_outfile, sentences_records,
+                    metadata_serializable['sentence_metadata'], append)
+
+        if modified_only:
+            self._modified_sentences.clear()
+
+        if documents_outfile is None:
+            out = StringIO()
+            write_jsonl(out, documents_records,
+                        metadata_serializable['document_metadata'])
+
+            return out.getvalue()
+
+        write_jsonl(documents_outfile, documents_records,
+                    metadata_serializable['document_metadata'], append)
+
+        if modified_only:
+            self._modified_documents.clear()
+
+    def _sentence_records(self, modified_only: bool = False) -> Iterator[Tuple[str, Dict]]:
+        # only the names of the graphs are iterated over, so that the
+        # unmodified graphs in a lazy corpus are not built
+        for name in self._sentences:
+            if not modified_only or name in self._modified_sentences:
+                yield name, self._sentences[name].to_dict()
+
+    def _document_records(self, modified_only: bool = False) -> Iterator[Tuple[str, Dict]]:
+        for name in self._documents:
+            if not modified_only or name in self._modified_documents:
+                yield name, self._documents[name].document_graph.to_dict()
+
+    def to_store(self, sentences_outfile: str,
+                 documents_outfile: str,
+                 append: bool = False,
+                 modified_only: bool = False) -> None:
+        """Serialize corpus to indexed binary stores
+
+        Stores written by this method can be loaded using
+        UDSCorpus.from_store, which defers deserializing each graph
+        until it is accessed.
+
+        Parameters
+        ----------
+        sentences_outfile
+            path to write sentence-level graphs to
+        documents_outfile
+            path to write document-level graphs to
+        append
+            whether to append the graphs to existing stores rather
+            than overwriting them. Appended graphs replace earlier
+            graphs with the same name, and the metadata is replaced
+            by the corpus metadata.
+        modified_only
+            whether to append only the graphs and documents modified
+            (e.g. by UDSCorpus.add_annotation) since the corpus was
+            constructed or last written with modified_only, so that
+            stores written from the corpus can be brought up to date
+            without rewriting them. Requires append.
+        """
+        if modified_only and not append:
+            errmsg = 'modified graphs can only be written by appending them'
+            raise ValueError(errmsg)
+
+        metadata_serializable = self._metadata.to_dict()
+
+        UDSGraphStore.write(sentences_outfile,
+                            self._sentence_records(modified_only),
+                            metadata_serializable['sentence_metadata'],
+                            append)
+
+        UDSGraphStore.write(documents_outfile,
+                            self._document_records(modified_only),
+                            metadata_serializable['document_metadata'],
+                            append)
+
+        if modified_only:
+            self._modified_sentences.clear()
+            self._modified_documents.clear()
+
+    @property
+    def rdf(self) -> Dataset:
+        """The sentence-level graphs in the corpus as a single RDF store
+
+        The triples for each graph are stored in a named graph whose
+        identifier is the graph's name, and queries against the store
+        are evaluated against the union of all of them.
+        """
+        stamp, rdf, owners = getattr(self, '_corpus_rdf', (None, None, None))
+
+        if rdf is None or stamp != self._cache_stamp():
+            rdf, owners = Dataset(default_union=True), {}
+
+            for gid, graph in self.items():
+                context = rdf.graph(URIRef(gid))
+                context.addN((s, p, o, context) for s, p, o
+                             in RDFConverter.networkx_to_rdf(graph.graph))
+
+                owners.update({nid: gid for nid in graph.graph.nodes})
+                owners.update({nid1 + '%%' + nid2: gid
+                               for nid1, nid2 in graph.graph.edges})
+
+            self._corpus_rdf = (self._cache_stamp(), rdf, owners)
+
+        return rdf
 
-    @lru_cache(maxsize=128)
+    def populate_rdf_cache(self, cache: Optional[BuildCache] = None) -> int:
+        """Save the RDF for every sentence-level graph to a cache
+
+        This is intended to be run as a batch job ahead of querying
+        the corpus in other processes, which then load the RDF for
+        each graph from the cache rather than constructing it.
+
+        Parameters
+        ----------
+        cache
+            the cache to save the RDF to; if None (default),
+            UDSSentenceGraph.RDF_CACHE is used
+
+        Returns
+        -------
+        the number of graphs whose RDF was not already cached
+        """
+        cache = UDSSentenceGraph.RDF_CACHE if cache is None else cache
+
+        if cache is None:
+            errmsg = 'no cache was passed and UDSSentenceGraph.RDF_CACHE ' +\
+                     'is not set'
+            raise ValueError(errmsg)
+
+        nconverted = 0
+
+        for gid, graph in self.items():
+            if graph.rdf_key() not in cache:
+                graph._cached_rdf(cache)
+                nconverted += 1
+
+        return nconverted
+
+    @cached_method
     def query(self, query: Union[str, Query],
               query_type: Optional[str] = None,
               cache_query: bool = True,
-              cache_rdf: bool = True) -> Union[Result,
-                                               Dict[str,
-                                                    Dict[str, Any]]]:
+              cache_rdf: bool = True,
+              shared_rdf: bool = False,
+              workers: Optional[int] = None) -> Dict[str,
+                                                Union[Result,
+                                                      Dict[str,
+                                                           Dict[str, Any]]]]:
         """Query all graphs in the corpus using SPARQL 1.1
 
         Parameters
@@ -552,11 +1281,301 @@ class UDSCorpus(PredPattCorpus):
             whether to delete the RDF constructed for querying
             against. This will slow down future queries but saves a
             lot of memory
+        shared_rdf
+            whether to evaluate the query once against a single RDF
+            store for the whole corpus (see UDSCorpus.rdf) rather than
+            once per graph. Each result is assigned to the graph that
+            the nodes and edges it binds belong to, so every result
+            must bind at least one node or edge; results binding nodes
+            or edges from more than one graph are discarded.
+        workers
+            the number of worker processes to evaluate the query in.
+            The graphs are split into one shard per worker, which is
+            sent to that worker the first time the corpus is queried
+            with this number of workers and kept there for later
+            queries until the corpus changes (see
+            UDSCorpus.shutdown_workers). If None (default), the query
+            is evaluated in this process.
         """
+        if workers is not None and workers > 1 and not shared_rdf:
+            return self._parallel_query(query, query_type, cache_query,
+                                        cache_rdf, workers)
+
+        if shared_rdf:
+            return self._shared_query(query, query_type,
+                                      cache_query, cache_rdf)
+
         return {gid: graph.query(query, query_type,
                                  cache_query, cache_rdf)
                 for gid, graph in self.items()}
 
+    @staticmethod
+    def prepare_query(name: str, query: str) -> Query:
+        """Parse a query once and register it under a name
+
+        This is the same as UDSSentenceGraph.prepare_query: queries
+        registered with either can be run on a single graph as well as
+        on the whole corpus.
+
+        Parameters
+        ----------
+        name
+            the name to register the query under
+        query
+            a SPARQL 1.1 query
+        """
+        return UDSSentenceGraph.prepare_query(name, query)
+
+    def execute_query(self, name: str,
+                      query_type: Optional[str] = None,
+                      **bindings: Any) -> Dict[str,
+                                               Union[Result,
+                                                     Dict[str,
+                                                          Dict[str, Any]]]]:
+        """Run a prepared query on all graphs in the corpus
+
+        Parameters
+        ----------
+        name
+            the name the query was registered under
+        query_type
+            whether this is a 'node' query or 'edge' query, as for
+            UDSCorpus.query
+        bindings
+            values for variables in the query, as for
+            UDSSentenceGraph.execute_query
+        """
+        return {gid: graph.execute_query(name, query_type, **bindings)
+                for gid, graph in self.items()}
+
+    def _shared_query(self, query: Union[str, Query],
+                      query_type: Optional[str],
+                      cache_query: bool,
+                      cache_rdf: bool) -> Dict[str,
+                                               Union[Result,
+                                                     Dict[str,
+                                                          Dict[str, Any]]]]:
+        try:
+            if isinstance(query, str) and cache_query:
+                query = UDSSentenceGraph.QUERIES.lookup(query,
+                                                        lambda: prepareQuery(query))
+
+            result = self.rdf.query(query)
+
+        except ParseException:
+            errmsg = 'invalid SPARQL 1.1 query'
+            raise ValueError(errmsg)
+
+        _, _, owners = self._corpus_rdf
+
+        if not cache_rdf:
+            del self._corpus_rdf
+
+        if result.type != 'SELECT':
+            errmsg = 'only SELECT queries can be evaluated against ' +\
+                     'a shared store'
+            raise ValueError(errmsg)
+
+        if query_type in ['node', 'edge']:
+            results = {gid: {} for gid in self}
+
+            for row in result:
+                elemid = row[0].toPython()
+
+                try:
+                    gid = owners[elemid]
+
+                    if query_type == 'node':
+                        results[gid][elemid] = self[gid].graph.nodes[elemid]
+
+                    else:
+                        edge = tuple(elemid.split('%%'))
+                        results[gid][edge] = self[gid].graph.edges[edge]
+
+                except KeyError:
+                    errmsg = 'invalid ' + query_type + ' query: your query ' +\
+                             'must be guaranteed to capture only ' +\
+                             query_type + 's'
+                    raise ValueError(errmsg)
+
+            return results
+
+        bindings = {gid: [] for gid in self}
+
+        for row in result:
+            gids = {owners[term.toPython()] for term in row
+                    if isinstance(term, URIRef) and
+                    term.toPython() in owners}
+
+            if not gids:
+                errmsg = 'invalid query: each result must bind at least ' +\
+                         'one node or edge when querying a shared store'
+                raise ValueError(errmsg)
+
+            if len(gids) == 1:
+                bindings[gids.pop()].append({var: term for var, term
+                                             in zip(result.vars, row)
+                                             if term is not None})
+
+        results = {}
+
+        for gid, gbindings in bindings.items():
+            results[gid] = Result('SELECT')
+            results[gid].vars = result.vars
+            results[gid].bindings = gbindings
+
+        return results
+
+    def _query_pools(self, workers: int) -> List[ProcessPoolExecutor]:
+        stamp, nworkers, pools = getattr(self, '_query_workers',
+                                         (None, None, []))
+
+        # the workers are reloaded whenever graphs are added, replaced,
+        # removed, or annotated, so that they never query stale graphs
+        if nworkers != workers or stamp != self._cache_stamp():
+            self.shutdown_workers()
+
+            gids = list(self)
+            nshards = min(workers, len(gids))
+            shardsize = -(-len(gids) // nshards) if nshards else 1
+
+            # each pool has a single process, so that a shard is
+            # always queried by the process it was loaded into
+            pools = [ProcessPoolExecutor(max_workers=1,
+                                         initializer=_load_query_shard,
+                                         initargs=({gid: self[gid] for gid
+                                                    in gids[i:i+shardsize]},))
+                     for i in range(0, len(gids), shardsize)]
+
+            self._query_workers = (self._cache_stamp(), workers, pools)
+
+        return pools
+
+    def shutdown_workers(self) -> None:
+        """Shut down the worker processes used for parallel queries"""
+        _, _, pools = getattr(self, '_query_workers', (None, None, []))
+
+        for pool in pools:
+            pool.shutdown()
+
+        self._query_workers = (None, None, [])
+
+    def _parallel_query(self, query: Union[str, Query],
+                        query_type: Optional[str],
+                        cache_query: bool,
+                        cache_rdf: bool,
+                        workers: int) -> Dict[str,
+                                              Union[Result,
+                                                    Dict[str,
+                                                         Dict[str, Any]]]]:
+        if not len(self):
+            return {}
+
+        futures = [pool.submit(_query_shard, query, query_type,
+                               cache_query, cache_rdf)
+                   for pool in self._query_pools(workers)]
+
+        results = {}
+
+        for future in as_completed(futures):
+            results.update(future.result())
+
+        if query_type is None:
+            results = {gid: _attach_result(result)
+                       for gid, result in results.items()}
+
+        # return the results in the order of the graphs in the corpus
+        return {gid: results[gid] for gid in self}
+
+    def _cache_stamp(self) -> Hashable:
+        # results computed before graphs were added, replaced, or
+        # removed, or before any sentence graph was annotated, are
+        # discarded. The graphs themselves (rather than their ids,
+        # which may be reused) are compared if they are not in a
+        # LazyGraphDict, which counts the changes made to it
+        if isinstance(self._sentences, LazyGraphDict):
+            sentences = self._sentences.version
+        else:
+            sentences = tuple(self._sentences.values())
+
+        return (sentences, len(self._documents),
+                UDSSentenceGraph._annotation_count)
+
+    @cached_method
+    def to_arrays(self, subspace: str, prop: str,
+                  domain: str = 'node') -> PropertyArrays:
+        """The values of a property for every semantics node or edge
+
+        The values and confidences of the property are collected from
+        every sentence-level graph in a single pass into aligned NumPy
+        arrays, along with the graph and identifier of each node or
+        edge and a mask for those that do not have the property.
+        Categorical properties are encoded as integer codes for their
+        categories, as given by the corpus metadata. The result is
+        cached until the corpus is changed.
+
+        Parameters
+        ----------
+        subspace
+            the subspace of the property (e.g. 'factuality')
+        prop
+            the property (e.g. 'factual')
+        domain
+            whether to collect the property from semantics nodes
+            ('node') or semantics edges ('edge')
+        """
+        if domain == 'node':
+            elements = ((gid, graph.semantics_nodes)
+                        for gid, graph in self.items())
+
+        elif domain == 'edge':
+            elements = ((gid, graph.semantics_edges())
+                        for gid, graph in self.items())
+
+        else:
+            errmsg = 'domain must be "node" or "edge"'
+            raise ValueError(errmsg)
+
+        try:
+            datatype = self._metadata.sentence_metadata[subspace, prop].value
+
+        except KeyError:
+            datatype = None
+
+        return property_arrays(elements, subspace, prop, datatype)
+
+    def maxima(self, nodeids: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+        """The maxima of sentence-level graphs in the corpus
+
+        Parameters
+        ----------
+        nodeids
+            a mapping from graph identifiers to the nodes in that
+            graph to find the maxima of; if None (default), the
+            maxima of all nodes in every graph are found
+        """
+        if nodeids is None:
+            return {name: graph.maxima() for name, graph in self.items()}
+
+        return {name: self[name].maxima(nids)
+                for name, nids in nodeids.items()}
+
+    def minima(self, nodeids: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+        """The minima of sentence-level graphs in the corpus
+
+        Parameters
+        ----------
+        nodeids
+            a mapping from graph identifiers to the nodes in that
+            graph to find the minima of; if None (default), the
+            minima of all nodes in every graph are found
+        """
+        if nodeids is None:
+            return {name: graph.minima() for name, graph in self.items()}
+
+        return {name: self[name].minima(nids)
+                for name, nids in nodeids.items()}
+
     @property
     def documents(self) -> Dict[str, UDSDocument]:
         """The documents in the corpus"""
@@ -572,6 +1591,22 @@ class UDSCorpus(PredPattCorpus):
         """The number of IDs in the corpus"""
         return len(self._documents)
 
+    @property
+    def modified_sentenceids(self) -> Set[str]:
+        """The IDs of sentences modified since the corpus was constructed
+
+        This is reset when the corpus is written with ``modified_only``
+        """
+        return set(self._modified_sentences)
+
+    @property
+    def modified_documentids(self) -> Set[str]:
+        """The IDs of documents modified since the corpus was constructed
+
+        This is reset when the corpus is written with ``modified_only``
+        """
+        return set(self._modified_documents)
+
     def sample_documents(self, k: int) -> Dict[str, UDSDocument]:
         """Sample k documents without replacement
 
@@ -654,3 +1689,173 @@ class UDSCorpus(PredPattCorpus):
             The property in the subspace
         """
         raise NotImplementedError
+
+
+def _read_sentences_jsonl_chunk(path: str, start: int, end: int,
+                                ud_ids: Dict[str, Dict[str, str]]) -> Tuple[Dict, Dict]:
+    # this is defined at the module level so that it can be sent to
+    # worker processes
+    def build(name, g_json):
+        return UDSCorpus._build_sentence_graph(name, g_json, ud_ids)
+
+    return UDSCorpus._read_jsonl_records(iter_jsonl(path, start, end), build)
+
+
+class _LazySentenceGraphs(MutableMapping):
+    """The sentence-level graphs of a document in a lazy corpus
+
+    Parameters
+    ----------
+    graphids
+        the identifiers of the document's sentence-level graphs
+    sentences
+        the sentence-level graphs of the corpus, in which the graphs
+        are looked up whenever they are accessed
+    """
+
+    def __init__(self, graphids: Iterable[str],
+                 sentences: LazyGraphDict):
+        self._graphids = dict.fromkeys(graphids)
+        self._sentences = sentences
+
+    def __getitem__(self, graphid: str) -> UDSSentenceGraph:
+        if graphid not in self._graphids:
+            raise KeyError(graphid)
+
+        return self._sentences[graphid]
+
+    def __setitem__(self, graphid: str, graph: UDSSentenceGraph) -> None:
+        self._graphids[graphid] = None
+        self._sentences[graphid] = graph
+
+    def __delitem__(self, graphid: str) -> None:
+        del self._graphids[graphid]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._graphids)
+
+    def __len__(self) -> int:
+        return len(self._graphids)
+
+
+# the number of threads in _gc_paused, and whether the collector
+# was enabled when the first of them entered it
+_GC_PAUSE = {'depth': 0, 'enabled': False}
+_GC_PAUSE_LOCK = Lock()
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # annotation attributes are acyclic, so there is nothing for the
+    # cyclic garbage collector to find in them; without pausing it,
+    # it repeatedly rescans every attribute added so far. The
+    # collector is process-wide, so it is paused for other threads
+    # too, and it is only restored to the state it was in before the
+    # pause once every thread that paused it has finished
+    with _GC_PAUSE_LOCK:
+        if not _GC_PAUSE['depth']:
+            _GC_PAUSE['enabled'] = gc.isenabled()
+            gc.disable()
+
+        _GC_PAUSE['depth'] += 1
+
+    try:
+        yield
+
+    finally:
+        with _GC_PAUSE_LOCK:
+            _GC_PAUSE['depth'] -= 1
+
+            if not _GC_PAUSE['depth'] and _GC_PAUSE['enabled']:
+                gc.enable()
+
+
+def _apply_annotation_batch(batch: List[UDSAnnotation],
+                            graphs: Dict[str, Any]) -> List[str]:
+    batch = [(ann, set(ann.graphids)) for ann in batch]
+    graphids = [gid for gid in dict.fromkeys(gid for _, ids in batch
+                                             for gid in ids)
+                if gid in graphs]
+
+    for gname in graphids:
+        graph = graphs[gname]
+
+        for ann, ids in batch:
+            if gname in ids:
+                graph.add_annotation(*ann[gname])
+
+        # reassigning a lazily built graph prevents it from being
+        # discarded (and its annotations with it)
+        graphs[gname] = graph
+
+    return graphids
+
+
+# the annotations applied by an annotation worker process
+_ANNOTATION_BATCH = []
+
+
+def _load_annotation_batch(batch: List[UDSAnnotation]) -> None:
+    _ANNOTATION_BATCH[:] = batch
+
+
+def _annotate_shard(graphs: Dict[str, UDSSentenceGraph]) -> Dict[str, DiGraph]:
+    with _gc_paused():
+        _apply_annotation_batch(_ANNOTATION_BATCH, graphs)
+
+    return {gid: graph.graph for gid, graph in graphs.items()}
+
+
+# the shard of a corpus held by a query worker process
+_QUERY_SHARD = {}
+
+
+def _load_query_shard(graphs: Dict[str, UDSSentenceGraph]) -> None:
+    _QUERY_SHARD.clear()
+    _QUERY_SHARD.update(graphs)
+
+
+def _query_shard(query: Union[str, Query],
+                 query_type: Optional[str],
+                 cache_query: bool,
+                 cache_rdf: bool) -> Dict[str,
+                                          Union[Result,
+                                                Dict[str, Dict[str, Any]]]]:
+    results = {gid: graph.query(query, query_type, cache_query, cache_rdf)
+               for gid, graph in _QUERY_SHARD.items()}
+
+    if query_type is None:
+        # RDFLib results cannot be pickled, so their contents are sent
+        # back instead and the results are rebuilt from them
+        results = {gid: _detach_result(result)
+                   for gid, result in results.items()}
+
+    return results
+
+
+def _detach_result(result: Result) -> Tuple[str, Any, Any]:
+    if result.type == 'SELECT':
+        return result.type, result.vars, list(result.bindings)
+
+    if result.type == 'ASK':
+        return result.type, None, result.askAnswer
+
+    return result.type, None, result.graph
+
+
+def _attach_result(detached: Tuple[str, Any, Any]) -> Result:
+    restype, resvars, contents = detached
+
+    result = Result(restype)
+
+    if restype == 'SELECT':
+        result.vars = resvars
+        result.bindings = contents
+
+    elif restype == 'ASK':
+        result.askAnswer = contents
+
+    else:
+        result.graph = contents
+
+    return result
@@ -1,19 +1,26 @@
 """Module for representing UDS sentence and document graphs."""
 
+import json
+import pickle
+import rdflib
+
 from logging import info, warning
 from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
 from overrides import overrides
-from functools import lru_cache
 from typing import Union, Optional, Any
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Hashable
 from memoized_property import memoized_property
 from pyparsing import ParseException
-from rdflib import Graph
+from rdflib import Graph, URIRef, Literal, Variable
 from rdflib.query import Result
 from rdflib.plugins.sparql.sparql import Query
 from rdflib.plugins.sparql import prepareQuery
 from networkx import DiGraph, adjacency_data, adjacency_graph
+from ...corpus import BuildCache
 from ...graph import RDFConverter
+from ...graph.sparql import NXQueryEngine, UnsupportedQueryError
+from .cache import MethodCache, CachedMethodsMixin, cached_method
 
 
 class UDSGraph(ABC):
@@ -61,7 +68,74 @@ class UDSGraph(ABC):
         return cls(adjacency_graph(graph), name)
 
 
-class UDSSentenceGraph(UDSGraph):
+class _GraphIndex:
+    """Secondary indexes over the nodes and edges of a DiGraph
+
+    Nodes are indexed by domain and type, and edges are indexed by
+    domain and type as well as by the nodes they are incident on, so
+    that lookups take time proportional to the size of their results.
+
+    Parameters
+    ----------
+    graph
+        the graph to index
+    """
+
+    def __init__(self, graph: DiGraph):
+        self.graph = graph
+        self.size = (graph.number_of_nodes(), graph.number_of_edges())
+
+        self._nodes = defaultdict(dict)
+        self._edges = defaultdict(dict)
+        self._incident = defaultdict(dict)
+
+        for nid, attrs in graph.nodes.items():
+            domain, typ = attrs.get('domain'), attrs.get('type')
+
+            self._nodes[domain, None][nid] = attrs
+            self._nodes[domain, typ][nid] = attrs
+
+        for eid, attrs in graph.edges.items():
+            domain, typ = attrs.get('domain'), attrs.get('type')
+
+            self._edges[domain, None][eid] = attrs
+            self._edges[domain, typ][eid] = attrs
+
+            for nid in set(eid):
+                self._incident[nid, domain, None][eid] = attrs
+                self._incident[nid, domain, typ][eid] = attrs
+
+    def is_current(self, graph: DiGraph) -> bool:
+        """Whether the index may be used for graph
+
+        Nodes and edges added to or removed from the graph are
+        detected by comparing its size to its size when it was
+        indexed. Changes to attributes are not, so the index must be
+        discarded whenever they are made.
+        """
+        return graph is self.graph and\
+            (graph.number_of_nodes(), graph.number_of_edges()) == self.size
+
+    def nodes(self, domain: str,
+              typ: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """The nodes with a domain and (optionally) type"""
+        return dict(self._nodes.get((domain, typ), {}))
+
+    def edges(self, domain: str,
+              typ: Optional[str] = None,
+              nodeid: Optional[str] = None) -> Dict[Tuple[str, str],
+                                                    Dict[str, Any]]:
+        """The edges with a domain and (optionally) type
+
+        If nodeid is not None, only edges incident on it are returned.
+        """
+        if nodeid is None:
+            return dict(self._edges.get((domain, typ), {}))
+
+        return dict(self._incident.get((nodeid, domain, typ), {}))
+
+
+class UDSSentenceGraph(UDSGraph, CachedMethodsMixin):
     """A Universal Decompositional Semantics sentence-level graph
 
     Parameters
@@ -77,7 +151,19 @@ class UDSSentenceGraph(UDSGraph):
         the UD identifier for the document associated with this graph
     """
 
-    QUERIES = {}
+    # prepared queries shared by all graphs
+    QUERIES = MethodCache(maxsize=1024)
+
+    # queries registered by name using prepare_query
+    PREPARED_QUERIES: Dict[str, Query] = {}
+
+    # if set, RDF for graphs is loaded from and saved to this cache
+    RDF_CACHE: Optional[BuildCache] = None
+
+    # incremented whenever any sentence graph is annotated, so that
+    # results computed from many graphs (e.g. by a corpus) can be
+    # discarded
+    _annotation_count = 0
 
     @overrides
     def __init__(self, graph: DiGraph, name: str, sentence_id: Optional[str] = None,
@@ -87,15 +173,105 @@ class UDSSentenceGraph(UDSGraph):
         self.document_id = document_id
         self._add_performative_nodes()
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # the index and cached results are rebuilt on demand, so they
+        # are not worth pickling
+        state = dict(self.__dict__)
+        state.pop('_graph_index', None)
+        state.pop('_method_cache', None)
+        state.pop('_nx_query_engine', None)
+        state.pop('_rdf_digest', None)
+
+        return state
+
+    def _cache_stamp(self) -> Hashable:
+        # results computed before nodes or edges were added to (or
+        # the underlying graph was replaced) are discarded
+        return (id(self.graph),
+                self.graph.number_of_nodes(),
+                self.graph.number_of_edges())
+
+    @property
+    def _index(self) -> _GraphIndex:
+        index = getattr(self, '_graph_index', None)
+
+        if index is None or not index.is_current(self.graph):
+            index = self._graph_index = _GraphIndex(self.graph)
+
+        return index
+
+    @property
+    def _query_engine(self) -> NXQueryEngine:
+        stamp, engine = getattr(self, '_nx_query_engine', (None, None))
+
+        if engine is None or stamp != self._cache_stamp():
+            engine = NXQueryEngine(self.graph)
+
+            self._nx_query_engine = (self._cache_stamp(), engine)
+
+        return engine
+
     @property
     def rdf(self) -> Graph:
-        """The graph as RDF"""
-        if hasattr(self, '_rdf'):
-            return self._rdf
-        else:
-            self._rdf = RDFConverter.networkx_to_rdf(self.graph)
+        """The graph as RDF
+
+        If UDSSentenceGraph.RDF_CACHE is set, the RDF is loaded from
+        that cache when this graph (with its current annotations) has
+        been converted before, and saved to it otherwise. Since cached
+        RDF is unpickled, the cache should only ever be written by
+        trusted processes.
+        """
+        cache = self.__class__.RDF_CACHE
+
+        if cache is None:
+            if not hasattr(self, '_rdf'):
+                self._rdf = RDFConverter.networkx_to_rdf(self.graph)
+
             return self._rdf
 
+        # the key changes when the graph is modified, so RDF converted
+        # before the graph was modified is never returned
+        key = self.rdf_key()
+
+        if not hasattr(self, '_rdf') or getattr(self, '_rdf_key', None) != key:
+            self._rdf = self._cached_rdf(cache, key)
+            self._rdf_key = key
+
+        return self._rdf
+
+    def rdf_key(self) -> str:
+        """The key for the RDF for this graph in a BuildCache
+
+        The key depends on the graph's name and the full contents of
+        the graph, so that it changes when annotations are added. It
+        is computed once and recomputed only after annotations are
+        added or nodes or edges are added to the graph, so attributes
+        changed directly on the underlying graph are not detected.
+        """
+        stamp, key = getattr(self, '_rdf_digest', (None, None))
+
+        if key is None or stamp != self._cache_stamp():
+            key = BuildCache.digest('rdf', rdflib.__version__, self.name,
+                                    json.dumps(self.to_dict(),
+                                               sort_keys=True))
+
+            self._rdf_digest = (self._cache_stamp(), key)
+
+        return key
+
+    def _cached_rdf(self, cache: BuildCache,
+                    key: Optional[str] = None) -> Graph:
+        key = self.rdf_key() if key is None else key
+        pickled = cache.get(key, binary=True)
+
+        if pickled is not None:
+            return pickle.loads(pickled)
+
+        rdf = RDFConverter.networkx_to_rdf(self.graph)
+        cache.put(key, pickle.dumps(rdf, protocol=pickle.HIGHEST_PROTOCOL))
+
+        return rdf
+
     @memoized_property
     def rootid(self):
         """The ID of the graph's root node"""
@@ -164,7 +340,7 @@ class UDSSentenceGraph(UDSGraph):
                             domain='interface', type='dependency',
                             frompredpatt=False)
 
-    @lru_cache(maxsize=128)
+    @cached_method
     def query(self, query: Union[str, Query],
               query_type: Optional[str] = None,
               cache_query: bool = True,
@@ -193,10 +369,8 @@ class UDSSentenceGraph(UDSGraph):
         """
         try:
             if isinstance(query, str) and cache_query:
-                if query not in self.__class__.QUERIES:
-                    self.__class__.QUERIES[query] = prepareQuery(query)
-
-                query = self.__class__.QUERIES[query]
+                query = self.__class__.QUERIES.lookup(query,
+                                                      lambda: prepareQuery(query))
 
             if query_type == 'node':
                 results = self._node_query(query,
@@ -218,13 +392,97 @@ class UDSSentenceGraph(UDSGraph):
         
         return results
 
+    @classmethod
+    def prepare_query(cls, name: str, query: str) -> Query:
+        """Parse a query once and register it under a name
+
+        Registered queries are run using UDSSentenceGraph.execute_query,
+        which binds the query's variables to values on each execution,
+        so that parameterized queries (e.g. those for a particular
+        node) do not need to be formatted and parsed again each time.
+
+        Parameters
+        ----------
+        name
+            the name to register the query under
+        query
+            a SPARQL 1.1 query
+        """
+        try:
+            cls.PREPARED_QUERIES[name] = prepareQuery(query)
+
+        except ParseException:
+            errmsg = 'invalid SPARQL 1.1 query'
+            raise ValueError(errmsg)
+
+        return cls.PREPARED_QUERIES[name]
+
+    def execute_query(self, name: str,
+                      query_type: Optional[str] = None,
+                      **bindings: Any) -> Union[Result,
+                                                Dict[str,
+                                                     Dict[str, Any]]]:
+        """Run a query registered using UDSSentenceGraph.prepare_query
+
+        Parameters
+        ----------
+        name
+            the name the query was registered under
+        query_type
+            whether this is a 'node' query or 'edge' query, as for
+            UDSSentenceGraph.query
+        bindings
+            values for variables in the query, keyed by variable name
+            (without the leading ``?``). Strings are bound as node or
+            edge identifiers and other values as literals; RDFLib terms
+            are bound as they are.
+        """
+        try:
+            query = self.__class__.PREPARED_QUERIES[name]
+
+        except KeyError:
+            errmsg = 'no query has been prepared under the name ' + name
+            raise ValueError(errmsg)
+
+        bindings = {Variable(var): _bound_term(val)
+                    for var, val in bindings.items()}
+
+        if query_type == 'node':
+            return self._node_query(query, True, bindings)
+
+        elif query_type == 'edge':
+            return self._edge_query(query, True, bindings)
+
+        else:
+            return self.rdf.query(query, initBindings=bindings)
+
+    def _select(self, query: Union[str, Query],
+                cache_query: bool,
+                bindings: Optional[Dict[Variable, Any]] = None) -> List[Tuple[Any, ...]]:
+        # common queries are evaluated directly against the NetworkX
+        # graph, and everything else is left to RDFLib
+        try:
+            if isinstance(query, str):
+                return self._query_engine.select(prepareQuery(query),
+                                                 bindings)
+
+            return self._query_engine.select(query, bindings)
+
+        except UnsupportedQueryError:
+            pass
+
+        if bindings:
+            return list(self.rdf.query(query, initBindings=bindings))
+
+        return list(self.query(query, cache_query=cache_query))
+
     def _node_query(self, query: Union[str, Query],
-                    cache_query: bool) -> Dict[str,
-                                               Dict[str, Any]]:
+                    cache_query: bool,
+                    bindings: Optional[Dict[Variable, Any]] = None) -> Dict[str,
+                                                                            Dict[str, Any]]:
 
         results = [r[0].toPython()
-                   for r in self.query(query,
-                                       cache_query=cache_query)]
+                   for r in self._select(query, cache_query, bindings)]
 
         try:
             return {nodeid: self.graph.nodes[nodeid] for nodeid in results}
@@ -235,12 +493,12 @@ class UDSSentenceGraph(UDSGraph):
             raise ValueError(errmsg)
 
     def _edge_query(self, query: Union[str, Query],
-                    cache_query: bool) -> Dict[Tuple[str, str],
-                                               Dict[str, Any]]:
+                    cache_query: bool,
+                    bindings: Optional[Dict[Variable, Any]] = None) -> Dict[Tuple[str, str],
+                                                                            Dict[str, Any]]:
 
         results = [tuple(edge[0].toPython().split('%%'))
-                   for edge in self.query(query,
-                                          cache_query=cache_query)]
+                   for edge in self._select(query, cache_query, bindings)]
 
         try:
             return {edge: self.graph.edges[edge]
@@ -255,36 +513,25 @@ class UDSSentenceGraph(UDSGraph):
     def syntax_nodes(self) -> Dict[str, Dict[str, Any]]:
         """The syntax nodes in the graph"""
 
-        return {nid: attrs for nid, attrs
-                in self.graph.nodes.items()
-                if attrs['domain'] == 'syntax'
-                if attrs['type'] == 'token'}
+        return self._index.nodes('syntax', 'token')
 
     @property
     def semantics_nodes(self) -> Dict[str, Dict[str, Any]]:
         """The semantics nodes in the graph"""
 
-        return {nid: attrs for nid, attrs
-                in self.graph.nodes.items()
-                if attrs['domain'] == 'semantics'}
+        return self._index.nodes('semantics')
 
     @property
     def predicate_nodes(self) -> Dict[str, Dict[str, Any]]:
         """The predicate (semantics) nodes in the graph"""
 
-        return {nid: attrs for nid, attrs
-                in self.graph.nodes.items()
-                if attrs['domain'] == 'semantics'
-                if attrs['type']  == 'predicate'}
+        return self._index.nodes('semantics', 'predicate')
 
     @property
     def argument_nodes(self) -> Dict[str, Dict[str, Any]]:
         """The argument (semantics) nodes in the graph"""
 
-        return {nid: attrs for nid, attrs
-                in self.graph.nodes.items()
-                if attrs['domain'] == 'semantics'
-                if attrs['type']  == 'argument'}
+        return self._index.nodes('semantics', 'argument')
 
     @property
     def syntax_subgraph(self) -> DiGraph:
@@ -298,7 +545,7 @@ class UDSSentenceGraph(UDSGraph):
 
         return self.graph.subgraph(list(self.semantics_nodes))
 
-    @lru_cache(maxsize=128)
+    @cached_method
     def semantics_edges(self,
                         nodeid: Optional[str] = None,
                         edgetype: Optional[str] = None) -> Dict[Tuple[str, str],
@@ -313,24 +560,9 @@ class UDSSentenceGraph(UDSGraph):
             The type of edge ("dependency" or "head")
         """
 
-        if nodeid is None:
-            candidates = {eid: attrs for eid, attrs
-                          in self.graph.edges.items()
-                          if attrs['domain'] == 'semantics'}
- 
-        else:
-            candidates = {eid: attrs for eid, attrs
-                          in self.graph.edges.items()
-                          if attrs['domain'] == 'semantics'
-                          if nodeid in eid}
-            
-        if edgetype is None:
-            return candidates
-        else:
-            return {eid: attrs for eid, attrs in candidates.items()
-                    if attrs['type'] == edgetype}
+        return self._index.edges('semantics', edgetype, nodeid)
 
-    @lru_cache(maxsize=128)
+    @cached_method
     def argument_edges(self,
                        nodeid: Optional[str] = None) -> Dict[Tuple[str, str],
                                                              Dict[str, Any]]:
@@ -344,7 +576,7 @@ class UDSSentenceGraph(UDSGraph):
 
         return self.semantics_edges(nodeid, edgetype='dependency')
         
-    @lru_cache(maxsize=128)
+    @cached_method
     def argument_head_edges(self,
                             nodeid: Optional[str] = None) -> Dict[Tuple[str,
                                                                         str],
@@ -360,7 +592,7 @@ class UDSSentenceGraph(UDSGraph):
 
         return self.semantics_edges(nodeid, edgetype='head')
 
-    @lru_cache(maxsize=128)
+    @cached_method
     def syntax_edges(self,
                      nodeid: Optional[str] = None) -> Dict[Tuple[str, str],
                                                            Dict[str, Any]]:
@@ -373,18 +605,9 @@ class UDSSentenceGraph(UDSGraph):
             The node that must be incident on an edge
         """
 
-        if nodeid is None:
-            return {eid: attrs for eid, attrs
-                          in self.graph.edges.items()
-                          if attrs['domain'] == 'syntax'}
+        return self._index.edges('syntax', nodeid=nodeid)
 
-        else:
-            return {eid: attrs for eid, attrs
-                          in self.graph.edges.items()
-                          if attrs['domain'] == 'syntax'
-                          if nodeid in eid}
-
-    @lru_cache(maxsize=128)
+    @cached_method
     def instance_edges(self,
                        nodeid: Optional[str] = None) -> Dict[Tuple[str, str],
                                                              Dict[str, Any]]:
@@ -396,16 +619,7 @@ class UDSSentenceGraph(UDSGraph):
             The node that must be incident on an edge
         """
 
-        if nodeid is None:
-            return {eid: attrs for eid, attrs
-                          in self.graph.edges.items()
-                          if attrs['domain'] == 'interface'}
-
-        else:
-            return {eid: attrs for eid, attrs
-                          in self.graph.edges.items()
-                          if attrs['domain'] == 'interface'
-                          if nodeid in eid}
+        return self._index.edges('interface', nodeid=nodeid)
 
     def span(self,
              nodeid: str,
@@ -476,8 +690,7 @@ class UDSSentenceGraph(UDSGraph):
         
         return [(self.graph.nodes[e[1]]['position'],
                  [self.graph.nodes[e[1]][a] for a in attrs])
-                for e, attr in self.instance_edges(nodeid).items()
-                if attr['type'] == 'head'][0]
+                for e in self._index.edges('interface', 'head', nodeid)][0]
 
     def maxima(self, nodeids: Optional[List[str]] = None) -> List[str]:
         """The nodes in nodeids not dominated by any other nodes in nodeids"""
@@ -485,12 +698,14 @@ class UDSSentenceGraph(UDSGraph):
         if nodeids is None:
             nodeids = list(self.graph.nodes)
 
+        nodeset = set(nodeids)
+        pred = self.graph.pred
+
+        # only the edges incident on each node need to be checked, and
+        # a node does not dominate itself through a loop
         return [nid for nid in nodeids
-                if all(e[0] == nid
-                       for e in self.graph.edges
-                       if e[0] in nodeids
-                       if e[1] in nodeids
-                       if nid in e)]
+                if nid not in pred
+                or all(p == nid or p not in nodeset for p in pred[nid])]
 
     def minima(self, nodeids: Optional[List[str]] = None) -> List[str]:
         """The nodes in nodeids not dominating any other nodes in nodeids"""
@@ -498,12 +713,13 @@ class UDSSentenceGraph(UDSGraph):
         if nodeids is None:
             nodeids = list(self.graph.nodes)
 
+        nodeset = set(nodeids)
+        succ = self.graph.succ
+
+        # unlike for maxima, a loop makes a node dominate itself
         return [nid for nid in nodeids
-                if all(e[0] != nid
-                       for e in self.graph.edges
-                       if e[0] in nodeids
-                       if e[1] in nodeids
-                       if nid in e)]
+                if nid not in succ
+                or all(s not in nodeset for s in succ[nid])]
 
     def add_annotation(self,
                        node_attrs: Dict[str, Dict[str, Any]],
@@ -523,17 +739,59 @@ class UDSSentenceGraph(UDSGraph):
         add_subpreds
         add_orphans
         """
+        nodes = self.graph.nodes
+        edges = self.graph.edges
+
+        # annotations of existing nodes and edges, which are nearly
+        # all of them, are applied directly; the rest may add nodes
+        # and edges to the graph, and what is done with them is
+        # counted and logged once rather than node by node
+        outcomes = Counter()
+
         for node, attrs in node_attrs.items():
-            self._add_node_annotation(node, attrs,
-                                      add_heads, add_subargs,
-                                      add_subpreds, add_orphans)
+            if node in nodes:
+                nodes[node].update(attrs)
+
+            else:
+                outcome = self._add_node_annotation(node, attrs,
+                                                    add_heads, add_subargs,
+                                                    add_subpreds, add_orphans)
+                outcomes[outcome] += 1
 
         for edge, attrs in edge_attrs.items():
-            self._add_edge_annotation(edge, attrs)
+            if edge in edges:
+                edges[edge].update(attrs)
+
+            else:
+                self._add_edge_annotation(edge, attrs)
+
+        outcomes.pop(None, None)
+
+        if outcomes:
+            infomsg = 'annotations of nodes not in ' + self.name + ': ' +\
+                      ', '.join(str(n) + ' ' + outcome
+                                for outcome, n in outcomes.items())
+            info(infomsg)
+
+        self._discard_derived()
+
+    def _discard_derived(self) -> None:
+        # annotations may change the domain or type of existing nodes
+        # and edges, which neither the index nor the cache can detect
+        self._graph_index = None
+        self._nx_query_engine = (None, None)
+        self._rdf_digest = (None, None)
+        self.clear_cache()
+
+        UDSSentenceGraph._annotation_count += 1
+
+        if hasattr(self, '_rdf'):
+            del self._rdf
 
     def _add_node_annotation(self, node, attrs,
                              add_heads, add_subargs,
-                             add_subpreds, add_orphans):
+                             add_subpreds, add_orphans) -> Optional[str]:
+        # what was done with the annotation is returned for logging
         if node in self.graph.nodes:
             self.graph.nodes[node].update(attrs)
 
@@ -541,14 +799,9 @@ class UDSSentenceGraph(UDSGraph):
             edge = (attrs['headof'], node)
 
             if not add_heads:
-                infomsg = 'head edge ' + str(edge) + ' in ' + self.name +\
-                          ' found in annotations but not added'
-                info(infomsg)
+                return 'head edges not added'
 
             else:
-                infomsg = 'adding head edge ' + str(edge) + ' to ' + self.name
-                info(infomsg)
-
                 attrs = dict(attrs,
                              **{'domain': 'semantics',
                                 'type': 'argument',
@@ -570,19 +823,15 @@ class UDSSentenceGraph(UDSGraph):
                 #         instedge = (node, nonhead)
                 #         self.graph.add_edge(*instedge, domain='interface', type='head')
 
+                return 'head edges added'
+
         elif 'subargof' in attrs and attrs['subargof'] in self.graph.nodes:
             edge = (attrs['subargof'], node)
 
             if not add_subargs:
-                infomsg = 'subarg edge ' + str(edge) + ' in ' + self.name +\
-                          ' found in annotations but not added'
-                info(infomsg)
+                return 'subarg edges not added'
 
             else:
-                infomsg = 'adding subarg edge ' + str(edge) + ' to ' +\
-                          self.name
-                info(infomsg)
-
                 attrs = dict(attrs,
                              **{'domain': 'semantics',
                                 'type': 'argument',
@@ -599,19 +848,15 @@ class UDSSentenceGraph(UDSGraph):
                 instedge = (node, node.replace('semantics-subarg', 'syntax'))
                 self.graph.add_edge(*instedge, domain='interface', type='head')
 
+                return 'subarg edges added'
+
         elif 'subpredof' in attrs and attrs['subpredof'] in self.graph.nodes:
             edge = (attrs['subpredof'], node)
 
             if not add_subpreds:
-                infomsg = 'subpred edge ' + str(edge) + ' in ' + self.name +\
-                          ' found in annotations but not added'
-                info(infomsg)
+                return 'subpred edges not added'
 
             else:
-                infomsg = 'adding subpred edge ' + str(edge) + ' to ' +\
-                          self.name
-                info(infomsg)
-
                 attrs = dict(attrs,
                              **{'domain': 'semantics',
                                 'type': 'predicate',
@@ -629,10 +874,10 @@ class UDSSentenceGraph(UDSGraph):
                 instedge = (node, node.replace('semantics-subpred', 'syntax'))
                 self.graph.add_edge(*instedge, domain='interface', type='head')
 
+                return 'subpred edges added'
+
         elif not add_orphans:
-            infomsg = 'orphan node ' + node + ' in ' + self.name +\
-                      ' found in annotations but not added'
-            info(infomsg)
+            return 'orphan nodes not added'
 
         else:
             warnmsg = 'adding orphan node ' + node + ' in ' + self.name
@@ -658,6 +903,8 @@ class UDSSentenceGraph(UDSGraph):
             if self.rootid is not None:
                 self.graph.add_edge(self.rootid, node)
 
+            return 'orphan nodes added'
+
     def _add_edge_annotation(self, edge, attrs):
         if edge in self.graph.edges:
             self.graph.edges[edge].update(attrs)
@@ -731,3 +978,13 @@ class UDSDocumentGraph(UDSGraph):
             warnmsg = f'Attempting to add annotation to unknown node {node} '\
                       f'in document graph {self.name}'
             warning(warnmsg)
+
+
+def _bound_term(value: Any) -> Union[URIRef, Literal]:
+    if isinstance(value, (URIRef, Literal)):
+        return value
+
+    if isinstance(value, str):
+        return URIRef(value)
+
+    return Literal(value)
@@ -0,0 +1,631 @@
+"""Module for (de)serializing UDS corpora and annotations"""
+
+import os
+import json
+import math
+
+from io import TextIOWrapper
+from os.path import splitext
+from zipfile import ZipFile, ZipInfo
+from typing import Any, Iterable, Iterator, Tuple, Union, IO, TextIO
+from typing import Callable, Container, Dict, List, NamedTuple, Optional
+
+CHUNK_SIZE = 1 << 16
+
+# the JSON backends, in order of preference
+JSON_BACKENDS = ['orjson', 'ujson', 'msgspec', 'json']
+
+# the members of each zip archive that has been indexed, along with
+# the modification time and size of the archive when it was indexed
+_ARCHIVE_INDEX = {}
+
+
+class JSONBackend(NamedTuple):
+    """A JSON parser and serializer
+
+    Attributes
+    ----------
+    name
+        the name of the module implementing the backend
+    loads
+        a function decoding JSON from a string or UTF-8 bytes
+    dumps
+        a function encoding a value as a JSON string
+    """
+
+    name: str
+    loads: Callable[[Union[str, bytes]], Any]
+    dumps: Callable[[Any], str]
+
+
+def _has_nonfinite(value: Any) -> bool:
+    """Whether a value contains a NaN or infinite float"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+
+    if isinstance(value, dict):
+        return any(_has_nonfinite(k) or _has_nonfinite(v)
+                   for k, v in value.items())
+
+    if isinstance(value, (list, tuple)):
+        return any(_has_nonfinite(v) for v in value)
+
+    return False
+
+
+def _json_dumps(value: Any) -> str:
+    """Encode a value as JSON using the standard library json module
+
+    Non-ASCII characters are written unescaped, as the accelerated
+    backends write them, so that every backend writes strings in the
+    same way
+    """
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _orjson_backend() -> JSONBackend:
+    import orjson
+
+    def loads(text):
+        try:
+            return orjson.loads(text)
+
+        except ValueError:
+            # orjson rejects the NaN and Infinity literals that json
+            # writes for non-finite floats, and json raises the error
+            # for truly invalid JSON
+            return json.loads(text)
+
+    def dumps(value):
+        try:
+            dumped = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+        except TypeError:
+            # e.g. integers that do not fit in 64 bits
+            return _json_dumps(value)
+
+        # orjson writes NaN and infinite floats as null, so values
+        # that may contain them are written by json instead
+        if b'null' in dumped and _has_nonfinite(value):
+            return _json_dumps(value)
+
+        return dumped.decode('utf-8')
+
+    return JSONBackend('orjson', loads, dumps)
+
+
+def _ujson_backend() -> JSONBackend:
+    import ujson
+
+    def loads(text):
+        try:
+            return ujson.loads(text)
+
+        except ValueError:
+            return json.loads(text)
+
+    # later versions of ujson write NaN and infinite floats in their
+    # own way unless told not to, and earlier versions refuse to; in
+    # either case they are written by json instead
+    try:
+        ujson.dumps(0.0, allow_nan=False)
+        options = {'allow_nan': False}
+
+    except TypeError:
+        options = {}
+
+    def dumps(value):
+        try:
+            return ujson.dumps(value, ensure_ascii=False,
+                               escape_forward_slashes=False, **options)
+
+        except (TypeError, ValueError, OverflowError):
+            return _json_dumps(value)
+
+    return JSONBackend('ujson', loads, dumps)
+
+
+def _msgspec_backend() -> JSONBackend:
+    import msgspec
+
+    def loads(text):
+        try:
+            return msgspec.json.decode(text)
+
+        except msgspec.DecodeError:
+            return json.loads(text)
+
+    def dumps(value):
+        try:
+            dumped = msgspec.json.encode(value)
+
+        except (TypeError, ValueError, OverflowError, msgspec.EncodeError):
+            return _json_dumps(value)
+
+        # msgspec, like orjson, writes NaN and infinite floats as null
+        if b'null' in dumped and _has_nonfinite(value):
+            return _json_dumps(value)
+
+        return dumped.decode('utf-8')
+
+    return JSONBackend('msgspec', loads, dumps)
+
+
+def _json_backend() -> JSONBackend:
+    return JSONBackend('json', json.loads, _json_dumps)
+
+
+_BACKEND_CONSTRUCTORS = {'orjson': _orjson_backend,
+                         'ujson': _ujson_backend,
+                         'msgspec': _msgspec_backend,
+                         'json': _json_backend}
+
+# the backend in use, which is chosen the first time it is needed
+_JSON_BACKEND = None
+
+
+def set_json_backend(name: Optional[str] = None) -> JSONBackend:
+    """Set the JSON backend used to read and write corpora and annotations
+
+    Every backend reads and writes the same JSON, though the
+    accelerated backends write it without whitespace. Every backend
+    writes non-ASCII characters unescaped, as UTF-8. JSON that a
+    backend cannot handle (e.g. integers that do not fit in 64 bits,
+    or the NaN and Infinity literals) is handled by the standard
+    library json module, so that NaN and infinite floats are written
+    and read in the same way by every backend.
+
+    Parameters
+    ----------
+    name
+        the name of the backend, which must be in JSON_BACKENDS. If
+        None (default), the first backend in JSON_BACKENDS that is
+        installed is used.
+
+    Returns
+    -------
+    the backend that was set
+    """
+    global _JSON_BACKEND
+
+    if name is None:
+        for candidate in JSON_BACKENDS:
+            try:
+                _JSON_BACKEND = _BACKEND_CONSTRUCTORS[candidate]()
+
+            except ImportError:
+                continue
+
+            return _JSON_BACKEND
+
+    if name not in _BACKEND_CONSTRUCTORS:
+        errmsg = 'JSON backend must be one of ' + ', '.join(JSON_BACKENDS)
+        raise ValueError(errmsg)
+
+    try:
+        _JSON_BACKEND = _BACKEND_CONSTRUCTORS[name]()
+
+    except ImportError:
+        errmsg = 'JSON backend ' + name + ' is not installed'
+        raise ValueError(errmsg)
+
+    return _JSON_BACKEND
+
+
+def json_backend() -> JSONBackend:
+    """The JSON backend used to read and write corpora and annotations"""
+    if _JSON_BACKEND is None:
+        return set_json_backend()
+
+    return _JSON_BACKEND
+
+
+def json_loads(text: Union[str, bytes]) -> Any:
+    """Decode JSON using the current backend
+
+    Parameters
+    ----------
+    text
+        the JSON, as a string or UTF-8 bytes
+    """
+    return json_backend().loads(text)
+
+
+def json_dumps(value: Any) -> str:
+    """Encode a value as JSON using the current backend
+
+    Parameters
+    ----------
+    value
+        the value to encode
+    """
+    return json_backend().dumps(value)
+
+
+def json_load(jsonfile: IO) -> Any:
+    """Decode the JSON in a (text or binary) file using the current backend
+
+    Parameters
+    ----------
+    jsonfile
+        the file to read
+    """
+    return json_loads(jsonfile.read())
+
+
+def json_dump(value: Any, jsonfile: TextIO) -> None:
+    """Encode a value as JSON in a file using the current backend
+
+    Parameters
+    ----------
+    value
+        the value to encode
+    jsonfile
+        the file to write to
+    """
+    jsonfile.write(json_dumps(value))
+
+
+def archive_member(path: str) -> Optional[Tuple[str, str]]:
+    """Split a path to a member of a zip archive
+
+    As for ``zipimport``, a path to a member of a zip archive is the
+    path to the archive followed by the name of the member, e.g.
+    ``annotations/protoroles.zip/protoroles.json``.
+
+    Parameters
+    ----------
+    path
+        the path to split
+
+    Returns
+    -------
+    the path to the archive and the name of the member, or None if
+    the path is not to a member of a zip archive
+    """
+    if os.path.exists(path):
+        return None
+
+    index = path.find('.zip/')
+
+    while index >= 0:
+        archive = path[:index+4]
+
+        if os.path.isfile(archive):
+            return archive, path[index+5:]
+
+        index = path.find('.zip/', index+1)
+
+    return None
+
+
+def archive_index(archive: str) -> Dict[str, ZipInfo]:
+    """The members of a zip archive
+
+    Only the archive's central directory is read, and the index is
+    reused until the archive is modified.
+
+    Parameters
+    ----------
+    archive
+        path to the zip archive
+    """
+    stat = os.stat(archive)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    if archive not in _ARCHIVE_INDEX or _ARCHIVE_INDEX[archive][0] != key:
+        with ZipFile(archive) as zf:
+            members = {info.filename: info for info in zf.infolist()
+                       if not info.is_dir()}
+
+        _ARCHIVE_INDEX[archive] = (key, members)
+
+    return _ARCHIVE_INDEX[archive][1]
+
+
+def archive_members(archives: Iterable[str],
+                    ext: str = '.json') -> List[str]:
+    """Paths to the members of zip archives with a particular extension
+
+    Parameters
+    ----------
+    archives
+        paths to zip archives
+    ext
+        the extension of the members to list
+    """
+    return [archive + '/' + name
+            for archive in archives
+            for name in archive_index(archive)
+            if splitext(name)[-1] == ext]
+
+
+def open_file(path: str, mode: str = 'r') -> IO:
+    """Open a file for reading, which may be a member of a zip archive
+
+    Members of zip archives are decompressed as they are read rather
+    than extracted.
+
+    Parameters
+    ----------
+    path
+        the path to the file or to the member of a zip archive (see
+        :func:`archive_member`)
+    mode
+        "r" to read text or "rb" to read bytes
+    """
+    if mode not in ['r', 'rb']:
+        raise ValueError('mode must be "r" or "rb"')
+
+    member = archive_member(path)
+
+    if member is None:
+        return open(path, mode)
+
+    archive, name = member
+
+    if name not in archive_index(archive):
+        errmsg = name + ' is not a member of ' + archive
+        raise FileNotFoundError(errmsg)
+
+    # the member remains readable after the archive is closed
+    with ZipFile(archive) as zf:
+        infile = zf.open(name)
+
+    return infile if mode == 'rb' else TextIOWrapper(infile, encoding='utf-8')
+
+
+class _JSONStreamReader:
+    """A buffered reader that decodes JSON values from a text stream
+
+    Parameters
+    ----------
+    infile
+        the stream to read from
+    chunk_size
+        the number of characters to read from the stream at a time
+    """
+
+    def __init__(self, infile: TextIO, chunk_size: int = CHUNK_SIZE):
+        self._infile = infile
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> None:
+        chunk = self._infile.read(size)
+
+        if not chunk:
+            self._eof = True
+
+        # drop everything that has already been decoded
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos].isspace():
+                self._pos += 1
+
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+
+            if self._eof:
+                raise ValueError('unexpected end of JSON input')
+
+            self._fill(self._chunk_size)
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of chars"""
+        char = self.peek()
+
+        if char not in chars:
+            errmsg = 'expected one of ' + repr(chars) +\
+                     ' but found ' + repr(char) + ' in JSON input'
+            raise ValueError(errmsg)
+
+        self._pos += 1
+
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+
+        size = self._chunk_size
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            else:
+                # a number at the end of the buffer may be truncated
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+
+            # read geometrically larger chunks so that large values
+            # are not redecoded many times
+            self._fill(size)
+            size *= 2
+
+
+def iter_json_object(jsonfile: Union[str, TextIO],
+                     stream: Container[str] = ('data',),
+                     chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[Tuple[str, ...],
+                                                                       Any]]:
+    """Incrementally decode a JSON object
+
+    Members of the top-level object are yielded as they are
+    decoded. Members whose key is in stream and whose value is an
+    object are not decoded whole; rather, each member of their value
+    is yielded separately, so that at most one such member is held in
+    memory at a time.
+
+    Parameters
+    ----------
+    jsonfile
+        (path to) file containing a JSON object, which may be a
+        member of a zip archive
+    stream
+        the keys of top-level members whose values should be streamed
+    chunk_size
+        the number of characters to read at a time
+
+    Returns
+    -------
+    an iterator over pairs of a path and a value. Paths for
+    top-level members are of the form ``(KEY,)`` and paths for
+    members of streamed values are of the form ``(KEY, SUBKEY)``.
+    """
+    if isinstance(jsonfile, str):
+        with open_file(jsonfile) as infile:
+            yield from iter_json_object(infile, stream, chunk_size)
+
+        return
+
+    reader = _JSONStreamReader(jsonfile, chunk_size)
+
+    reader.expect('{')
+
+    if reader.peek() == '}':
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(':')
+
+        if key in stream and reader.peek() == '{':
+            reader.expect('{')
+
+            if reader.peek() != '}':
+                while True:
+                    subkey = reader.value()
+                    reader.expect(':')
+
+                    yield (key, subkey), reader.value()
+
+                    if reader.expect(',}') == '}':
+                        break
+
+            else:
+                reader.expect('}')
+
+        else:
+            yield (key,), reader.value()
+
+        if reader.expect(',}') == '}':
+            break
+
+
+def write_jsonl(jsonlfile: Union[str, TextIO],
+                records: Iterable[Tuple[str, Dict[str, Any]]],
+                metadata: Optional[Dict[str, Any]] = None,
+                append: bool = False) -> None:
+    """Write graphs to a line-delimited JSON (JSONL) file
+
+    Each line of the file is a JSON object. A metadata record has the
+    form ``{"metadata": METADATA}`` and a graph record has the form
+    ``{"name": NAME, "data": GRAPH}``. A file normally begins with a
+    single metadata record, but appending to a file may add further
+    metadata records, which readers should merge. If the same name
+    occurs in multiple graph records, the last one takes precedence.
+
+    Parameters
+    ----------
+    jsonlfile
+        (path to) file to write to
+    records
+        pairs of a graph name and a dictionary constructed by
+        ``UDSGraph.to_dict``
+    metadata
+        the serialized metadata for the graphs; if None, no metadata
+        record is written
+    append
+        whether to append to the file rather than overwrite it, if
+        jsonlfile is a path
+    """
+    if isinstance(jsonlfile, str):
+        with open(jsonlfile, 'a' if append else 'w', encoding='utf-8') as out:
+            write_jsonl(out, records, metadata)
+
+        return
+
+    if metadata is not None:
+        jsonlfile.write(json_dumps({'metadata': metadata}) + '\n')
+
+    for name, data in records:
+        jsonlfile.write(json_dumps({'name': name, 'data': data}) + '\n')
+
+
+def iter_jsonl(jsonlfile: Union[str, TextIO],
+               start: int = 0,
+               end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Iterate over the records in a line-delimited JSON (JSONL) file
+
+    Parameters
+    ----------
+    jsonlfile
+        (path to) file to read from
+    start
+        the byte offset to start reading from, if jsonlfile is a
+        path; reading starts at the first line beginning at or after
+        this offset
+    end
+        the byte offset to stop reading at, if jsonlfile is a path;
+        every line beginning before this offset is read
+    """
+    if not isinstance(jsonlfile, str):
+        if start or end is not None:
+            errmsg = 'byte offsets can only be used with a path'
+            raise ValueError(errmsg)
+
+        for line in jsonlfile:
+            if line.strip():
+                yield json_loads(line)
+
+        return
+
+    with open(jsonlfile, 'rb') as infile:
+        if start > 0:
+            # skip the remainder of the line containing the byte just
+            # before start, which belongs to the previous chunk
+            infile.seek(start - 1)
+            infile.readline()
+
+        while end is None or infile.tell() < end:
+            line = infile.readline()
+
+            if not line:
+                break
+
+            if line.strip():
+                yield json_loads(line)
+
+
+def jsonl_chunks(path: str, nchunks: int) -> List[Tuple[int, int]]:
+    """Split a line-delimited JSON (JSONL) file into byte ranges
+
+    The ranges are of roughly equal size and can be passed to
+    :func:`iter_jsonl` to read each record exactly once.
+
+    Parameters
+    ----------
+    path
+        path to the file to split
+    nchunks
+        the number of ranges to split the file into
+    """
+    if nchunks < 1:
+        raise ValueError('nchunks must be at least 1')
+
+    size = os.path.getsize(path)
+    bounds = [size * i // nchunks for i in range(nchunks + 1)]
+
+    return [(s, e) for s, e in zip(bounds[:-1], bounds[1:]) if e > s]
@@ -0,0 +1,223 @@
+"""Module for reading and writing indexed binary stores of UDS graphs."""
+
+import os
+import mmap
+import zlib
+import struct
+
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator, Tuple, Union
+from typing import Dict
+
+from .serialization import json_loads, json_dumps
+
+MAGIC = b'UDSGRAPH'
+FORMAT_VERSION = 1
+
+# magic string, format version, number of graphs, position of the
+# index, and length of the index (all little-endian)
+HEADER = struct.Struct('<8sIQQQ')
+
+GraphRecords = Union[Dict[str, Dict[str, Any]],
+                     Iterable[Tuple[str, Dict[str, Any]]]]
+
+
+class UDSGraphStore(Mapping):
+    """A memory-mapped store of serialized UDS graphs
+
+    A store consists of a fixed-size header, followed by one
+    compressed record per graph, followed by an index. Each record is
+    the zlib-compressed JSON of a graph's ``to_dict`` output. The
+    index holds the corpus metadata as well as the identifier, offset,
+    and length of each record, so that opening a store only requires
+    reading the index: records are decompressed and decoded only when
+    the corresponding graph is accessed.
+
+    Parameters
+    ----------
+    path
+        path to the store
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+
+        index = self._read_index(self._mmap)
+
+        self._metadata = index['metadata']
+        self._records = dict(zip(index['graphids'],
+                                 zip(index['offsets'],
+                                     index['lengths'])))
+
+    @staticmethod
+    def is_store(path: str) -> bool:
+        """Whether a file is a UDS graph store
+
+        Parameters
+        ----------
+        path
+            path to the file to check
+        """
+        try:
+            with open(path, 'rb') as infile:
+                return infile.read(len(MAGIC)) == MAGIC
+
+        except (OSError, ValueError):
+            return False
+
+    @staticmethod
+    def _read_index(buf) -> Dict[str, Any]:
+        if len(buf) < HEADER.size:
+            raise ValueError('file is too short to be a UDS graph store')
+
+        magic, version, ngraphs, index_pos, index_len = HEADER.unpack_from(buf)
+
+        if magic != MAGIC:
+            raise ValueError('file is not a UDS graph store')
+
+        if version != FORMAT_VERSION:
+            errmsg = 'unsupported UDS graph store version ' + str(version)
+            raise ValueError(errmsg)
+
+        index = json_loads(zlib.decompress(buf[index_pos:index_pos+index_len]))
+
+        if len(index['graphids']) != ngraphs:
+            raise ValueError('UDS graph store index is corrupted')
+
+        return index
+
+    def __getitem__(self, graphid: str) -> Dict[str, Any]:
+        offset, length = self._records[graphid]
+
+        return json_loads(zlib.decompress(self._mmap[offset:offset+length]))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, graphid: Any) -> bool:
+        return graphid in self._records
+
+    def __enter__(self) -> 'UDSGraphStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying memory map and file"""
+        self._mmap.close()
+        self._file.close()
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """The metadata serialized with the graphs"""
+        return self._metadata
+
+    @classmethod
+    def _read_file_index(cls, path: str) -> Dict[str, Any]:
+        with open(path, 'rb') as infile:
+            with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return cls._read_index(buf)
+
+    @classmethod
+    def write(cls, path: str, graphs: GraphRecords,
+              metadata: Dict[str, Any], append: bool = False) -> None:
+        """Write graphs and their metadata to a store
+
+        Parameters
+        ----------
+        path
+            path to write the store to
+        graphs
+            a mapping (or iterable of pairs) from graph identifiers to
+            dictionaries constructed by ``UDSGraph.to_dict``
+        metadata
+            the serialized metadata for the graphs (e.g. the
+            ``"sentence_metadata"`` entry of ``UDSCorpusMetadata.to_dict``)
+        append
+            whether to add the graphs to an existing store rather than
+            overwriting it. The records already in the store are left
+            in place, and the graphs are appended after them along
+            with a new index, which replaces the records of graphs
+            with the same identifiers and the metadata. Since replaced
+            records are not reclaimed, a store that has been appended
+            to many times can be compacted by rewriting it without
+            appending. If the store does not exist, it is created.
+        """
+        if isinstance(graphs, Mapping):
+            graphs = graphs.items()
+
+        if append and os.path.exists(path):
+            index = cls._read_file_index(path)
+            records = dict(zip(index['graphids'],
+                               zip(index['offsets'], index['lengths'])))
+
+            with open(path, 'r+b') as out:
+                # records are written after the current index, so that
+                # the store remains readable until the header is
+                # rewritten to point to the new one
+                out.seek(0, os.SEEK_END)
+
+                cls._write_records(out, graphs, records, metadata)
+
+        else:
+            # the store is written to a temporary file that then
+            # replaces the old one, so that stores that have the old
+            # file mapped (e.g. the stores of a corpus constructed by
+            # UDSCorpus.from_store) can still read it
+            tmppath = path + '.tmp'
+
+            try:
+                with open(tmppath, 'wb') as out:
+                    # reserve space for the header, which can only be
+                    # written once the position of the index is known
+                    out.write(b'\x00' * HEADER.size)
+
+                    cls._write_records(out, graphs, {}, metadata)
+
+                os.replace(tmppath, path)
+
+            except BaseException:
+                if os.path.exists(tmppath):
+                    os.remove(tmppath)
+
+                raise
+
+    @staticmethod
+    def _write_records(out, graphs: Iterable[Tuple[str, Dict[str, Any]]],
+                       records: Dict[str, Tuple[int, int]],
+                       metadata: Dict[str, Any]) -> None:
+        for graphid, graph in graphs:
+            record = zlib.compress(json_dumps(graph).encode('utf-8'))
+
+            records[graphid] = (out.tell(), len(record))
+
+            out.write(record)
+
+        index = {'metadata': metadata,
+                 'graphids': list(records),
+                 'offsets': [offset for offset, _ in records.values()],
+                 'lengths': [length for _, length in records.values()]}
+        index = zlib.compress(json_dumps(index).encode('utf-8'))
+
+        index_pos = out.tell()
+        out.write(index)
+
+        # the records and the index must be on disk before the header
+        # points to them, so that an interrupted write leaves the
+        # previous index in effect
+        out.flush()
+        os.fsync(out.fileno())
+
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(records),
+                              index_pos, len(index)))
+        out.flush()
+        os.fsync(out.fileno())
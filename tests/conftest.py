@@ -1,6 +1,9 @@
 import pytest
 
 import os
+import json
+
+from networkx import DiGraph, adjacency_data
 
 from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
 from decomp.semantics.uds.annotation import RawUDSAnnotation
@@ -78,3 +81,30 @@ def raw_sentence_annotations(raw_node_sentence_annotation,
     raw_edge_ann = RawUDSAnnotation.from_json(raw_edge_sentence_annotation)
 
     return raw_node_ann, raw_edge_ann
+
+@pytest.fixture
+def make_sentence_graphs():
+    def make(n=3, prefix='ewt-dev'):
+        graphs = {}
+
+        for i in range(1, n+1):
+            name = prefix + '-' + str(i)
+
+            graph = DiGraph()
+            graph.name = name
+            graph.add_node(name+'-root-0', domain='root', type='root', position=0)
+            graph.add_node(name+'-syntax-1', domain='syntax', type='token',
+                           position=1, form='word'+str(i % 2), value=-1.5e-3*i)
+            graph.add_edge(name+'-root-0', name+'-syntax-1',
+                           domain='syntax', type='dependency', deprel='root')
+
+            # round trip through JSON so that tuples become lists
+            graphs[name] = json.loads(json.dumps(adjacency_data(graph)))
+
+        return graphs
+
+    return make
+
+@pytest.fixture
+def sentence_graphs(make_sentence_graphs):
+    return make_sentence_graphs()
@@ -0,0 +1,63 @@
+import os
+
+from decomp.corpus import BuildCache
+
+
+class TestBuildCache:
+
+    def test_digest(self):
+        assert BuildCache.digest('a', 'b') == BuildCache.digest('a', b'b')
+        assert BuildCache.digest('a', 'b') != BuildCache.digest('b', 'a')
+        assert BuildCache.digest('ab', 'c') != BuildCache.digest('a', 'bc')
+
+    def test_file_digest(self, tmp_path):
+        path = str(tmp_path / 'annotation.json')
+
+        with open(path, 'w') as out:
+            out.write('{"metadata": {}, "data": {}}')
+
+        digest = BuildCache.file_digest(path)
+
+        assert digest == BuildCache.file_digest(path)
+
+        with open(path, 'w') as out:
+            out.write('{"metadata": {}, "data": {"ewt-dev-1": {}}}')
+
+        assert digest != BuildCache.file_digest(path)
+
+        with open(path, 'rb') as infile:
+            assert BuildCache.file_digest(infile) == BuildCache.file_digest(path)
+
+    def test_put_get(self, tmp_path):
+        cache = BuildCache(str(tmp_path / 'cache'))
+        key = cache.digest('predpatt', 'ewt-dev-1')
+
+        assert key not in cache
+        assert cache.get(key) is None
+
+        cache.put(key, '{"nodes": []}')
+
+        assert key in cache
+        assert cache.get(key) == '{"nodes": []}'
+
+        # entries persist across instances
+        assert BuildCache(str(tmp_path / 'cache')).get(key) == '{"nodes": []}'
+
+    def test_binary(self, tmp_path):
+        cache = BuildCache(str(tmp_path / 'cache'))
+        key = cache.digest('rdf', 'ewt-dev-1')
+
+        cache.put(key, b'\x00\x80\xff')
+
+        assert cache.get(key, binary=True) == b'\x00\x80\xff'
+
+    def test_corrupted(self, tmp_path):
+        cache = BuildCache(str(tmp_path / 'cache'))
+        key = cache.digest('predpatt', 'ewt-dev-1')
+
+        cache.put(key, '{"nodes": []}')
+
+        with open(os.path.join(cache.cache_dir, key[:2], key), 'wb') as out:
+            out.write(b'not compressed')
+
+        assert cache.get(key) is None
@@ -1,3 +1,5 @@
+import pytest
+
 from numpy import array
 from networkx import DiGraph
 from decomp.syntax.dependency import DependencyGraphBuilder, CoNLLDependencyTreeCorpus
@@ -69,3 +71,101 @@ def test_dependency_tree_corpus():
     assert all([isinstance(t, DiGraph) for gid, t in corpus.graphs.items()])
     assert all([isinstance(t, DiGraph) for gid, t in corpus.items()])
     assert all([isinstance(gid, str) for gid in corpus])
+
+
+def test_lazy_dependency_tree_corpus():
+    listtrees = {'tree1': listtree,
+                 'tree2': listtree,
+                 'tree3': listtree}
+
+    corpus = CoNLLDependencyTreeCorpus(listtrees, lazy=True, cache_size=2)
+
+    # nothing is built until it is accessed
+    assert corpus.ngraphs == 3
+    assert 'tree1' in corpus
+    assert corpus.graphs.nbuilt == 0
+
+    tree1 = corpus['tree1']
+
+    assert tree1.name == 'tree1'
+    assert corpus.graphs.nbuilt == 1
+    assert corpus['tree1'] is tree1
+
+    # the least recently accessed tree is discarded and rebuilt
+    corpus['tree2']
+    corpus['tree3']
+
+    assert corpus.graphs.nbuilt == 2
+    assert corpus['tree1'] is not tree1
+    assert all([isinstance(t, DiGraph) for gid, t in corpus.items()])
+
+
+def test_lazy_corpus_with_unbuildable_tree():
+    # a feature without a value cannot be parsed
+    badtree = [row[:5] + ['Case'] + row[6:] if i == 0 else row
+               for i, row in enumerate(listtree)]
+    listtrees = {'tree1': listtree,
+                 'bad': badtree,
+                 'tree3': listtree}
+
+    eager = CoNLLDependencyTreeCorpus(listtrees)
+    lazy = CoNLLDependencyTreeCorpus(listtrees, lazy=True, cache_size=1)
+
+    assert eager.ngraphs == 2
+    assert 'bad' not in eager
+
+    # the tree that cannot be built is counted until it is accessed
+    assert lazy.ngraphs == 3
+    assert lazy.graphs.nbuilt == 0
+
+    # but it is skipped when the trees are iterated over
+    assert [gid for gid, _ in lazy.items()] == eager.graphids
+    assert 'bad' not in lazy
+    assert list(lazy) == list(eager)
+    assert lazy.ngraphs == eager.ngraphs
+
+
+def test_lazy_corpus_verified():
+    badtree = [row[:5] + ['Case'] + row[6:] if i == 0 else row
+               for i, row in enumerate(listtree)]
+    listtrees = {'tree1': listtree,
+                 'bad': badtree,
+                 'tree3': listtree}
+
+    eager = CoNLLDependencyTreeCorpus(listtrees)
+    lazy = CoNLLDependencyTreeCorpus(listtrees, lazy=True, cache_size=1,
+                                     verify=True)
+
+    # counting the trees builds them, keeping no more of them than
+    # the cache holds
+    assert lazy.ngraphs == eager.ngraphs
+    assert lazy.graphs.nbuilt == 1
+
+    assert 'bad' not in lazy
+    assert list(lazy) == list(eager)
+
+    # a tree built to check that it can be built is kept
+    tree3 = lazy['tree3']
+
+    assert lazy.graphs.nbuilt == 1
+    assert lazy['tree3'] is tree3
+
+
+def test_lazy_corpus_builder_error(monkeypatch):
+    def graphbuilder(self, graphid, rawgraph):
+        raise KeyError('head')
+
+    monkeypatch.setattr(CoNLLDependencyTreeCorpus, '_graphbuilder',
+                        graphbuilder)
+
+    corpus = CoNLLDependencyTreeCorpus({'tree1': listtree}, lazy=True)
+
+    # errors in the graphbuilder are not mistaken for trees that
+    # cannot be built
+    with pytest.raises(KeyError, match='head'):
+        corpus['tree1']
+
+    assert 'tree1' in corpus
+
+    with pytest.raises(KeyError, match='head'):
+        CoNLLDependencyTreeCorpus({'tree1': listtree})
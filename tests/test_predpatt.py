@@ -2,7 +2,9 @@ from io import StringIO
 from networkx import DiGraph
 from predpatt import load_conllu, PredPatt, PredPattOpts
 from decomp.syntax.dependency import DependencyGraphBuilder
+from decomp.corpus import BuildCache
 from decomp.semantics.predpatt import PredPattCorpus, PredPattGraphBuilder
+from decomp.semantics.predpatt import DEFAULT_PREDPATT_OPTIONS
 
 rawtree = '''1	The	the	DET	DT	Definite=Def|PronType=Art	3	det	_	_
 2	police	police	NOUN	NN	Number=Sing	3	compound	_	_
@@ -163,3 +165,66 @@ def test_predpatt_corpus():
     assert all([isinstance(t, DiGraph) for gid, t in corpus.graphs.items()])
     assert all([isinstance(t, DiGraph) for gid, t in corpus.items()])
     assert all([isinstance(gid, str) for gid in corpus])
+
+def test_predpatt_corpus_parallel():
+    # repeat the tree so that it is sharded across multiple workers
+    rawtrees = '\n\n'.join([rawtree.strip()] * 10)
+
+    corpus = PredPattCorpus.from_conll(rawtrees)
+    corpus_parallel = PredPattCorpus.from_conll(rawtrees, workers=2)
+
+    assert corpus.graphids == corpus_parallel.graphids
+
+    for gid, graph in corpus.items():
+        graph_parallel = corpus_parallel[gid]
+
+        assert graph.name == graph_parallel.name
+        assert dict(graph.nodes.items()) == dict(graph_parallel.nodes.items())
+        assert dict(graph.edges.items()) == dict(graph_parallel.edges.items())
+
+def test_predpatt_corpus_cache(tmp_path):
+    cache = BuildCache(str(tmp_path))
+
+    corpus = PredPattCorpus.from_conll(rawtree)
+    corpus_cached = PredPattCorpus.from_conll(rawtree, cache=cache)
+    corpus_reused = PredPattCorpus.from_conll(rawtree, cache=cache)
+
+    assert corpus.graphids == corpus_cached.graphids == corpus_reused.graphids
+
+    for gid, graph in corpus.items():
+        assert dict(graph.nodes.items()) ==\
+            dict(corpus_reused[gid].nodes.items())
+        assert dict(graph.edges.items()) ==\
+            dict(corpus_reused[gid].edges.items())
+
+def test_predpatt_corpus_cache_graph_kinds(tmp_path):
+    from decomp.semantics.uds import UDSSentenceGraph
+
+    cache = BuildCache(str(tmp_path))
+
+    corpus = PredPattCorpus.from_conll(rawtree)
+    options = DEFAULT_PREDPATT_OPTIONS
+
+    graphs = PredPattCorpus._build_conll_graphs(rawtree, 'ewt', options,
+                                                graph_class=UDSSentenceGraph)
+
+    # plain and UDS graphs built against the same cache are each
+    # read back as they were built
+    for _ in range(2):
+        corpus_cached = PredPattCorpus.from_conll(rawtree, cache=cache)
+        graphs_cached = PredPattCorpus._build_conll_graphs(rawtree, 'ewt',
+                                                           options,
+                                                           graph_class=UDSSentenceGraph,
+                                                           cache=cache)
+
+        for gid, graph in corpus.items():
+            assert dict(graph.nodes.items()) ==\
+                dict(corpus_cached[gid].nodes.items())
+            assert dict(graph.edges.items()) ==\
+                dict(corpus_cached[gid].edges.items())
+
+        for gid, graph in graphs.items():
+            assert dict(graph.graph.nodes.items()) ==\
+                dict(graphs_cached[gid].graph.nodes.items())
+            assert dict(graph.graph.edges.items()) ==\
+                dict(graphs_cached[gid].graph.edges.items())
@@ -0,0 +1,131 @@
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+from networkx import DiGraph
+from rdflib import URIRef, Literal
+
+from decomp.graph import RDFConverter
+from decomp.graph.rdf import TermCache
+from decomp.semantics.uds.metadata import UDSCorpusMetadata
+
+
+def _graph(name):
+    graph = DiGraph()
+
+    graph.add_node(name+'-pred-1', domain='semantics', type='predicate',
+                   factuality={'factual': {'value': 1.0,
+                                           'confidence': 1.0}})
+    graph.add_node(name+'-arg-1', domain='semantics', type='argument',
+                   genericity={'arg-particular': {'value': 1,
+                                                  'confidence': True}})
+    graph.add_edge(name+'-pred-1', name+'-arg-1', domain='semantics',
+                   type='dependency',
+                   protoroles={'volition': {'value': 1.0,
+                                            'confidence': 0.5}})
+
+    return graph
+
+
+class TestRDFConverter:
+
+    def test_triples(self):
+        rdf = RDFConverter.networkx_to_rdf(_graph('g'))
+
+        edge = URIRef('g-pred-1%%g-arg-1')
+
+        assert (URIRef('g-pred-1'), edge, URIRef('g-arg-1')) in rdf
+        assert (edge, URIRef('volition'), Literal(1.0)) in rdf
+        assert (URIRef('volition'), URIRef('confidence'),
+                URIRef('volition-confidence')) in rdf
+        assert (URIRef('factual-confidence'), URIRef('subspace'),
+                URIRef('factuality')) in rdf
+
+        # 2 nodes with 2 + 2 triples, 1 edge with 1 + 2 + 2 triples,
+        # and 3 subspace triples for each of 3 properties
+        assert len(rdf) == 8 + 5 + 9
+
+    def test_typed_literals(self):
+        rdf = RDFConverter.networkx_to_rdf(_graph('g'))
+
+        objects = set(rdf.objects(URIRef('g-arg-1'), None))
+
+        assert Literal(1) in objects
+        assert Literal(True) in objects
+        assert Literal(1.0) not in objects
+
+    def test_interned_terms(self):
+        rdf1 = RDFConverter.networkx_to_rdf(_graph('g1'))
+        rdf2 = RDFConverter.networkx_to_rdf(_graph('g2'))
+
+        value1, = rdf1.objects(URIRef('g1-pred-1'), URIRef('factual'))
+        value2, = rdf2.objects(URIRef('g2-pred-1'), URIRef('factual'))
+
+        assert value1 is value2
+
+    def test_list_valued_attribute(self):
+        graph = _graph('g')
+        graph.nodes['g-pred-1']['span'] = [1, 2]
+
+        with pytest.raises(ValueError):
+            RDFConverter.networkx_to_rdf(graph)
+
+
+class TestTermCache:
+
+    def test_interned(self):
+        cache = TermCache(URIRef, maxsize=2)
+
+        assert cache['a'] is cache['a']
+        assert cache['a'] == URIRef('a')
+
+    def test_evict(self):
+        cache = TermCache(URIRef, maxsize=2)
+
+        cache.warm(['a', 'b', 'a', 'c'])
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert len(cache) == 2
+
+        cache.maxsize = 1
+
+        assert 'c' in cache
+        assert len(cache) == 1
+
+    def test_unbounded_and_empty(self):
+        cache = TermCache(URIRef)
+        cache.warm(str(i) for i in range(100))
+
+        assert len(cache) == 100
+
+        cache = TermCache(URIRef, maxsize=0)
+
+        assert cache['a'] == URIRef('a')
+        assert len(cache) == 0
+
+    def test_threads(self):
+        cache = TermCache(URIRef, maxsize=50)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            terms = list(executor.map(lambda i: cache[str(i % 100)],
+                                      range(10000)))
+
+        assert terms == [URIRef(str(i % 100)) for i in range(10000)]
+        assert len(cache) == 50
+
+    def test_prewarm(self):
+        metadata = {'sentence_metadata': {'protoroles': {'volition': {'value': {'datatype': 'int',
+                                                                                'categories': [1, 2, 3, 4, 5],
+                                                                                'ordered': True},
+                                                                      'confidence': {'datatype': 'int',
+                                                                                     'categories': [0, 1],
+                                                                                     'ordered': False}}}},
+                    'document_metadata': {}}
+
+        RDFConverter.prewarm(UDSCorpusMetadata.from_dict(metadata))
+
+        assert 'protoroles' in RDFConverter.SUBSPACES
+        assert 'volition' in RDFConverter.PROPERTIES
+        assert 'volition-confidence' in RDFConverter.PROPERTIES
+        assert 'semantics' in RDFConverter.VALUES
+        assert (int, 3) in RDFConverter.LITERALS
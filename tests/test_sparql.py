@@ -0,0 +1,113 @@
+import pytest
+
+from networkx import DiGraph
+from rdflib import URIRef, Literal, Variable
+from rdflib.plugins.sparql import prepareQuery
+
+from decomp.graph import RDFConverter
+from decomp.graph.sparql import NXQueryEngine, UnsupportedQueryError
+
+
+@pytest.fixture
+def nxgraph():
+    graph = DiGraph()
+
+    graph.add_node('pred-1', domain='semantics', type='predicate',
+                   factuality={'factual': {'value': 1.2,
+                                           'confidence': 0.9}})
+    graph.add_node('pred-2', domain='semantics', type='predicate',
+                   factuality={'factual': {'value': -0.5,
+                                           'confidence': 0.3}})
+    graph.add_node('arg-1', domain='semantics', type='argument',
+                   genericity={'arg-particular': {'value': 0.7,
+                                                  'confidence': 1.0}})
+    graph.add_node('syntax-1', domain='syntax', type='token',
+                   form='ran', position=1)
+
+    graph.add_edge('pred-1', 'arg-1', domain='semantics',
+                   type='dependency',
+                   protoroles={'volition': {'value': 2.0,
+                                            'confidence': 1.0}})
+    graph.add_edge('pred-2', 'arg-1', domain='semantics',
+                   type='dependency',
+                   protoroles={'volition': {'value': -1.0,
+                                            'confidence': 0.5}})
+    graph.add_edge('pred-1', 'syntax-1', domain='interface', type='head')
+
+    return graph
+
+
+QUERIES = ['SELECT ?n WHERE { ?n <domain> <semantics> }',
+           'SELECT ?n WHERE { ?n <domain> <semantics> ; '
+           '<type> <predicate> }',
+           'SELECT ?n ?v WHERE { ?n <factual> ?v FILTER ( ?v > 0 ) }',
+           'SELECT ?n WHERE { ?n <factual> ?v ; <factual-confidence> ?c '
+           'FILTER ( ?v > -1 && ?c >= 0.5 ) }',
+           'SELECT ?e WHERE { ?p ?e ?a . ?a <type> <argument> . '
+           '?e <volition> ?v FILTER ( ?v < 0 || ?v > 1 ) }',
+           'SELECT ?e WHERE { { ?e <volition> ?v FILTER ( ?v > 0 ) } '
+           'UNION { ?e <type> <head> } }',
+           'SELECT DISTINCT ?p ?s WHERE { ?p <subspace> ?s }',
+           'SELECT ?p ?c WHERE { ?p <confidence> ?c }',
+           'SELECT ?n WHERE { ?n <form> "ran" ; <position> ?i '
+           'FILTER ( ?i * 2 = 2 && ?i NOT IN (3, 4) ) }',
+           'SELECT ?n ?m WHERE { ?n <factual> ?v . '
+           '{ ?m <factual> ?w FILTER ( ?w < 0 ) } }',
+           'SELECT ?n ?m WHERE { ?n <factual> ?v . '
+           '{ ?m <factual> ?w FILTER ( ?w < ?v ) } }',
+           'SELECT ?n WHERE { ?n <form> ?f FILTER ( ?f = '
+           '"ran"^^<http://www.w3.org/2001/XMLSchema#string> ) }',
+           'SELECT ?n WHERE { ?n <form> ?f FILTER ( ?f >= '
+           '"ran"^^<http://www.w3.org/2001/XMLSchema#string> ) }']
+
+
+class TestNXQueryEngine:
+
+    @pytest.mark.parametrize('querystr', QUERIES)
+    def test_select_matches_rdflib(self, nxgraph, querystr):
+        query = prepareQuery(querystr)
+
+        expected = [tuple(row) for row
+                    in RDFConverter.networkx_to_rdf(nxgraph).query(query)]
+
+        assert sorted(NXQueryEngine(nxgraph).select(query)) ==\
+            sorted(expected)
+
+    @pytest.mark.parametrize('bindings', [{'p': URIRef('pred-1')},
+                                          {'p': URIRef('pred-2')},
+                                          {'t': Literal(0)},
+                                          {'p': URIRef('pred-1'),
+                                           't': Literal(2)}])
+    def test_bindings(self, nxgraph, bindings):
+        query = prepareQuery('SELECT ?p ?e WHERE { ?p ?e ?a . '
+                             '?e <volition> ?v FILTER ( ?v > ?t ) }')
+        bindings = {Variable(var): val for var, val in bindings.items()}
+        bindings.setdefault(Variable('t'), Literal(-5))
+
+        rdf = RDFConverter.networkx_to_rdf(nxgraph)
+        expected = [tuple(row) for row
+                    in rdf.query(query, initBindings=bindings)]
+
+        assert sorted(NXQueryEngine(nxgraph).select(query, bindings)) ==\
+            sorted(expected)
+
+    def test_slice(self, nxgraph):
+        query = prepareQuery('SELECT ?n WHERE { ?n <domain> <semantics> } '
+                             'LIMIT 2 OFFSET 1')
+
+        assert len(NXQueryEngine(nxgraph).select(query)) == 2
+
+    def test_unsupported_query(self, nxgraph):
+        query = prepareQuery('SELECT ?n WHERE { ?n <domain> <syntax> . '
+                             'OPTIONAL { ?n <form> ?f } }')
+
+        with pytest.raises(UnsupportedQueryError):
+            NXQueryEngine(nxgraph).select(query)
+
+    def test_raw_graph(self, nxgraph):
+        nxgraph.nodes['pred-1']['factuality']['factual'] =\
+            {'value': {'annotator-1': 1.0},
+             'confidence': {'annotator-1': 1.0}}
+
+        with pytest.raises(TypeError):
+            NXQueryEngine(nxgraph)
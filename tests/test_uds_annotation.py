@@ -2,12 +2,14 @@ import pytest
 
 import os, json
 
+from io import StringIO
 from pprint import pprint
 
 from decomp.semantics.uds.metadata import UDSAnnotationMetadata
 from decomp.semantics.uds.annotation import UDSAnnotation
 from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
 from decomp.semantics.uds.annotation import RawUDSAnnotation
+from decomp.semantics.uds.annotation import UDSAnnotationStream
 
 class TestUDSAnnotation:
 
@@ -112,3 +114,124 @@ class TestRawUDSAnnotation:
             for gid, node_attrs in raw_edge_ann.items(annotation_type="node",
                                                       annotator_id='protoroles-annotator-14'):
                 pass
+
+    def test_attributes_by_annotator(self, raw_node_sentence_annotation,
+                                     raw_sentence_annotations):
+        raw_node_ann, raw_edge_ann = raw_sentence_annotations
+        raw_node_ann_direct = json.loads(raw_node_sentence_annotation)
+
+        expected = {}
+
+        for nid, subspaces in raw_node_ann_direct['data']['tree1'].items():
+            for subspace, properties in subspaces.items():
+                for prop, annotation in properties.items():
+                    for annid, val in annotation['value'].items():
+                        conf = annotation['confidence'][annid]
+                        attrs = expected.setdefault(annid, {}).setdefault('tree1', {})
+                        attrs.setdefault(nid, {}).setdefault(subspace, {})[prop] =\
+                            {'confidence': conf, 'value': val}
+
+        assert raw_node_ann.node_attributes_by_annotator == expected
+        assert raw_node_ann.edge_attributes_by_annotator == {}
+
+    def test_attributes_are_not_shared(self, raw_sentence_annotations):
+        raw_node_ann, raw_edge_ann = raw_sentence_annotations
+
+        node_attrs, edge_attrs = raw_node_ann['tree1']
+        node_attrs.clear()
+
+        assert raw_node_ann['tree1'][0]
+        assert raw_node_ann.node_attributes['tree1'] == raw_node_ann['tree1'][0]
+
+    def test_attributes_are_kept(self, raw_sentence_annotations):
+        raw_node_ann, raw_edge_ann = raw_sentence_annotations
+
+        node_attributes = raw_node_ann.node_attributes
+        by_annotator = raw_node_ann.node_attributes_by_annotator
+
+        assert raw_node_ann.node_attributes is node_attributes
+        assert raw_node_ann.node_attributes_by_annotator is by_annotator
+        assert raw_edge_ann.edge_attributes is raw_edge_ann.edge_attributes
+
+        node_attributes['tree1'].clear()
+        by_annotator.clear()
+
+        assert raw_node_ann.node_attributes['tree1'] == {}
+        assert raw_node_ann.node_attributes_by_annotator == {}
+
+        # the stored annotations are unchanged
+        assert raw_node_ann['tree1'][0]
+        assert list(raw_node_ann.items(annotation_type='node',
+                                       annotator_id='genericity-pred-annotator-88'))
+
+    def test_excluded_attributes(self, raw_node_sentence_annotation):
+        raw_node_ann_direct = json.loads(raw_node_sentence_annotation)
+        metadata = UDSAnnotationMetadata.from_dict(raw_node_ann_direct['metadata'])
+        data = raw_node_ann_direct['data']
+
+        data['tree1']['tree1-semantics-pred-7']['headof'] = 'tree1-syntax-7'
+        data['tree1']['tree1-semantics-arg-0'] = {}
+
+        ann = RawUDSAnnotation(metadata, data)
+
+        assert ann['tree1'][0] == data['tree1']
+        assert 'headof' not in ann.node_subspaces
+        assert all('headof' not in attrs['tree1']['tree1-semantics-pred-7']
+                   for attrs in ann.node_attributes_by_annotator.values()
+                   if 'tree1-semantics-pred-7' in attrs['tree1'])
+
+
+class TestUDSAnnotationStream:
+
+    def test_stream_json(self, test_data_dir,
+                         normalized_sentence_annotations,
+                         raw_sentence_annotations):
+        annotations = {'normalized': normalized_sentence_annotations,
+                       'raw': raw_sentence_annotations}
+
+        for annotation_format, (node_ann, edge_ann) in annotations.items():
+            for ann, kind in [(node_ann, 'node'), (edge_ann, 'edge')]:
+                fname = annotation_format + '_' + kind +\
+                        '_sentence_annotation.json'
+                path = os.path.join(test_data_dir, fname)
+                stream = ann.__class__.stream_json(path)
+
+                assert isinstance(stream, UDSAnnotationStream)
+                assert stream.metadata == ann.metadata
+                assert dict(stream.items()) == dict(ann.items())
+
+                # the stream can be iterated over more than once
+                assert [(gid, (n, e)) for gid, n, e in stream] ==\
+                    list(stream.items())
+
+    def test_metadata_after_data(self, normalized_node_sentence_annotation,
+                                 normalized_sentence_annotations):
+        node_ann, _ = normalized_sentence_annotations
+        ann_direct = json.loads(normalized_node_sentence_annotation)
+        reordered = json.dumps({'data': ann_direct['data'],
+                                'metadata': ann_direct['metadata']})
+
+        stream = NormalizedUDSAnnotation.stream_json(StringIO(reordered))
+
+        assert dict(stream.items()) == dict(node_ann.items())
+        assert stream.metadata == node_ann.metadata
+
+    def test_validation(self, normalized_node_sentence_annotation,
+                        raw_node_sentence_annotation):
+        ann_direct = json.loads(normalized_node_sentence_annotation)
+        ann_direct['metadata'] = {}
+
+        stream = NormalizedUDSAnnotation.stream_json(json.dumps(ann_direct))
+
+        with pytest.raises(ValueError):
+            list(stream)
+
+        stream = NormalizedUDSAnnotation.stream_json(raw_node_sentence_annotation)
+
+        with pytest.raises(ValueError):
+            stream.metadata
+
+        stream = NormalizedUDSAnnotation.stream_json('{"data": {}}')
+
+        with pytest.raises(ValueError):
+            stream.metadata
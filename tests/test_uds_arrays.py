@@ -0,0 +1,183 @@
+import json
+import numpy as np
+import pytest
+
+from networkx import DiGraph, adjacency_data
+
+from decomp.semantics.uds import UDSCorpus
+from decomp.semantics.uds.arrays import property_arrays
+from decomp.semantics.uds.metadata import UDSDataType
+from decomp.semantics.uds.serialization import write_jsonl
+
+metadata = {'factuality': {'factual': {'value': {'datatype': 'float'},
+                                       'confidence': {'datatype': 'float'}}},
+            'protoroles': {'volition': {'value': {'datatype': 'int',
+                                                  'categories': [1, 2, 3],
+                                                  'ordered': True},
+                                        'confidence': {'datatype': 'float'}}}}
+
+
+@pytest.fixture
+def elements():
+    return [('ewt-dev-1', {'ewt-dev-1-semantics-pred-1': {'factuality': {'factual': {'value': 1.5,
+                                                                                     'confidence': 0.5}}},
+                           'ewt-dev-1-semantics-arg-2': {}}),
+            ('ewt-dev-2', {}),
+            ('ewt-dev-3', {'ewt-dev-3-semantics-pred-1': {'factuality': {'factual': {'value': -1.0,
+                                                                                     'confidence': 1.0}}}})]
+
+
+@pytest.fixture
+def annotated_corpus(tmp_path):
+    graphs = []
+
+    for i in range(1, 3):
+        name = 'ewt-dev-' + str(i)
+        pred, arg = name+'-semantics-pred-1', name+'-semantics-arg-2'
+
+        graph = DiGraph()
+        graph.name = name
+        graph.add_node(name+'-root-0', domain='root', type='root', position=0)
+        graph.add_node(name+'-syntax-1', domain='syntax', type='token',
+                       position=1, form='word')
+        graph.add_node(pred, domain='semantics', type='predicate',
+                       frompredpatt=True,
+                       factuality={'factual': {'value': float(i),
+                                               'confidence': 1.0}})
+        graph.add_node(arg, domain='semantics', type='argument',
+                       frompredpatt=True)
+        graph.add_edge(name+'-root-0', name+'-syntax-1',
+                       domain='syntax', type='dependency', deprel='root')
+        graph.add_edge(pred, arg, domain='semantics', type='dependency',
+                       frompredpatt=True,
+                       protoroles={'volition': {'value': i,
+                                                'confidence': 0.5}})
+
+        graphs.append((name, json.loads(json.dumps(adjacency_data(graph)))))
+
+    write_jsonl(str(tmp_path / 'sentences.jsonl'), graphs, metadata)
+    write_jsonl(str(tmp_path / 'documents.jsonl'), [], {})
+
+    return UDSCorpus.from_json(str(tmp_path / 'sentences.jsonl'),
+                               str(tmp_path / 'documents.jsonl'))
+
+
+class TestPropertyArrays:
+
+    def test_values(self, elements):
+        arrays = property_arrays(elements, 'factuality', 'factual')
+
+        assert arrays.graphids == ['ewt-dev-1', 'ewt-dev-2', 'ewt-dev-3']
+        assert arrays.elementids == ['ewt-dev-1-semantics-pred-1',
+                                     'ewt-dev-1-semantics-arg-2',
+                                     'ewt-dev-3-semantics-pred-1']
+        assert arrays.graph_index.tolist() == [0, 0, 2]
+        assert arrays.mask.tolist() == [False, True, False]
+        assert arrays.values[~arrays.mask].tolist() == [1.5, -1.0]
+        assert arrays.confidences[~arrays.mask].tolist() == [0.5, 1.0]
+        assert np.isnan(arrays.values[1])
+        assert arrays.categories is None
+
+    def test_read_only(self, elements):
+        arrays = property_arrays(elements, 'factuality', 'factual')
+
+        with pytest.raises(ValueError):
+            arrays.values[0] = 0.
+
+    def test_categorical(self, elements):
+        elements[0][1]['ewt-dev-1-semantics-pred-1']['factuality']['factual']['value'] = 'yes'
+        elements[2][1]['ewt-dev-3-semantics-pred-1']['factuality']['factual']['value'] = 'maybe'
+
+        datatype = UDSDataType.from_dict({'datatype': 'str',
+                                          'categories': ['yes', 'maybe', 'no'],
+                                          'ordered': False})
+
+        arrays = property_arrays(elements, 'factuality', 'factual', datatype)
+
+        assert arrays.categories == ['maybe', 'no', 'yes']
+        assert arrays.values.tolist() == [2, -1, 0]
+
+        elements[2][1]['ewt-dev-3-semantics-pred-1']['factuality']['factual']['value'] = 'perhaps'
+
+        with pytest.raises(ValueError):
+            property_arrays(elements, 'factuality', 'factual', datatype)
+
+    def test_mixed_categories(self, elements):
+        elements[0][1]['ewt-dev-1-semantics-pred-1']['factuality']['factual']['value'] = 'yes'
+        elements[2][1]['ewt-dev-3-semantics-pred-1']['factuality']['factual']['value'] = 0
+
+        datatype = UDSDataType(str, categories=['yes', 0, 'no'],
+                               ordered=False)
+
+        arrays = property_arrays(elements, 'factuality', 'factual', datatype)
+
+        assert arrays.categories == [0, 'no', 'yes']
+        assert arrays.values.tolist() == [2, -1, 0]
+
+    def test_raw(self, elements):
+        elements[0][1]['ewt-dev-1-semantics-arg-2'] =\
+            {'factuality': {'factual': {'value': {'annotator-1': 1},
+                                        'confidence': {'annotator-1': 1}}}}
+
+        with pytest.raises(ValueError):
+            property_arrays(elements, 'factuality', 'factual')
+
+
+class TestToArrays:
+
+    def test_nodes(self, annotated_corpus):
+        arrays = annotated_corpus.to_arrays('factuality', 'factual')
+
+        assert arrays.values[~arrays.mask].tolist() == [1.0, 2.0]
+        assert [arrays.graphids[i] for i
+                in arrays.graph_index[~arrays.mask]] == ['ewt-dev-1',
+                                                         'ewt-dev-2']
+
+        # results are cached
+        assert annotated_corpus.to_arrays('factuality', 'factual') is arrays
+
+    def test_edges(self, annotated_corpus):
+        arrays = annotated_corpus.to_arrays('protoroles', 'volition', 'edge')
+
+        assert arrays.categories == [1, 2, 3]
+        assert arrays.values[~arrays.mask].tolist() == [0, 1]
+        assert [elemid for elemid, missing
+                in zip(arrays.elementids, arrays.mask)
+                if not missing] == [('ewt-dev-1-semantics-pred-1',
+                                     'ewt-dev-1-semantics-arg-2'),
+                                    ('ewt-dev-2-semantics-pred-1',
+                                     'ewt-dev-2-semantics-arg-2')]
+
+    def test_annotated_graph(self, annotated_corpus):
+        annotated_corpus.to_arrays('factuality', 'factual')
+
+        # annotating a graph directly, rather than through the corpus,
+        # also discards the cached arrays
+        node_attrs = {'ewt-dev-1-semantics-pred-1': {'factuality': {'factual': {'value': 3.0,
+                                                                                'confidence': 1.0}}}}
+        annotated_corpus['ewt-dev-1'].add_annotation(node_attrs, {})
+
+        arrays = annotated_corpus.to_arrays('factuality', 'factual')
+
+        assert arrays.values[~arrays.mask].tolist() == [3.0, 2.0]
+
+    def test_replaced_graph(self, annotated_corpus):
+        from decomp.semantics.uds import UDSSentenceGraph
+
+        annotated_corpus.to_arrays('factuality', 'factual')
+
+        graph = UDSSentenceGraph.from_dict(annotated_corpus['ewt-dev-2'].to_dict(),
+                                           'ewt-dev-2')
+        graph.graph.nodes['ewt-dev-2-semantics-pred-1']['factuality'] =\
+            {'factual': {'value': 4.0, 'confidence': 1.0}}
+
+        # arrays cached before the graph was replaced are discarded
+        annotated_corpus.graphs['ewt-dev-2'] = graph
+
+        arrays = annotated_corpus.to_arrays('factuality', 'factual')
+
+        assert arrays.values[~arrays.mask].tolist() == [1.0, 4.0]
+
+    def test_invalid_domain(self, annotated_corpus):
+        with pytest.raises(ValueError):
+            annotated_corpus.to_arrays('factuality', 'factual', 'syntax')
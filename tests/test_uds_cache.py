@@ -0,0 +1,173 @@
+import gc
+import pytest
+
+from decomp.semantics.uds.cache import MethodCache, CachedMethodsMixin
+from decomp.semantics.uds.cache import AnnotationCache, cached_method
+from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
+
+
+class Counter(CachedMethodsMixin):
+
+    CACHE_SIZE = 2
+
+    def __init__(self):
+        self.calls = 0
+        self.version = 0
+
+    def _cache_stamp(self):
+        return self.version
+
+    @cached_method
+    def square(self, x, offset=0):
+        self.calls += 1
+        return x * x + offset
+
+
+class TestMethodCache:
+
+    def test_lookup(self):
+        cache = MethodCache(2)
+
+        assert cache.lookup('a', lambda: 1) == 1
+        assert cache.lookup('a', lambda: 2) == 1
+        assert cache.info() == (1, 1, 2, 1)
+
+    def test_evict(self):
+        cache = MethodCache(2)
+
+        cache.lookup('a', lambda: 1)
+        cache.lookup('b', lambda: 2)
+        cache.lookup('a', lambda: 1)
+        cache.lookup('c', lambda: 3)
+
+        # b was the least recently used
+        assert cache.lookup('b', lambda: 4) == 4
+        assert cache.lookup('c', lambda: 5) == 3
+
+    def test_disabled(self):
+        cache = MethodCache(0)
+
+        assert cache.lookup('a', lambda: 1) == 1
+        assert cache.lookup('a', lambda: 2) == 2
+        assert cache.info().currsize == 0
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            MethodCache(-1)
+
+
+class Annotation:
+    pass
+
+
+class TestAnnotationCache:
+
+    def test_lookup(self):
+        cache = AnnotationCache(2)
+        annotation = Annotation()
+
+        assert cache.lookup('a', lambda: annotation, 10) is annotation
+        assert cache.lookup('a', Annotation, 10) is annotation
+        assert 'a' in cache
+        assert cache.info() == (1, 1, 0, 2, 1, None, 10, 1)
+
+    def test_evict(self):
+        cache = AnnotationCache(maxsize=None, maxbytes=25)
+
+        cache.lookup('a', Annotation, 10)
+        cache.lookup('b', Annotation, 10)
+        cache.lookup('a', Annotation, 10)
+        cache.lookup('c', Annotation, 10)
+
+        gc.collect()
+
+        assert len(cache) == 2
+        assert 'b' not in cache
+        assert cache.info().evictions == 1
+        assert cache.info().currbytes == 20
+
+        cache.maxsize = 1
+
+        assert len(cache) == 1
+        assert 'c' in cache
+
+    def test_weak(self):
+        cache = AnnotationCache(0)
+
+        annotation = cache.lookup('a', Annotation, 10)
+
+        assert len(cache) == 0
+        assert cache.lookup('a', Annotation) is annotation
+
+        del annotation
+        gc.collect()
+
+        assert 'a' not in cache
+
+    def test_clear(self):
+        cache = AnnotationCache()
+        annotation = cache.lookup('a', Annotation, 10)
+
+        cache.clear()
+
+        assert 'a' not in cache
+        assert cache.lookup('a', Annotation) is not annotation
+        assert cache.info().misses == 2
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            AnnotationCache(-1)
+
+        with pytest.raises(ValueError):
+            AnnotationCache(maxbytes=-1)
+
+    def test_from_json(self, tmp_path, normalized_node_sentence_annotation):
+        path = str(tmp_path / 'annotation.json')
+
+        with open(path, 'w') as out:
+            out.write(normalized_node_sentence_annotation)
+
+        NormalizedUDSAnnotation.CACHE.clear()
+
+        annotation = NormalizedUDSAnnotation.from_json(path)
+
+        # the cache is keyed on the contents of the JSON
+        assert NormalizedUDSAnnotation.from_json(normalized_node_sentence_annotation) is annotation
+        assert normalized_node_sentence_annotation not in NormalizedUDSAnnotation.CACHE
+        assert NormalizedUDSAnnotation.CACHE.info().currbytes ==\
+            len(normalized_node_sentence_annotation)
+
+
+class TestCachedMethod:
+
+    def test_per_instance(self):
+        c1, c2 = Counter(), Counter()
+
+        assert c1.square(3) == c1.square(3) == 9
+        assert c2.square(3) == 9
+
+        assert c1.calls == 1
+        assert c2.calls == 1
+        assert c1.cache_info().hits == 1
+
+    def test_kwargs(self):
+        counter = Counter()
+
+        assert counter.square(3, offset=1) == 10
+        assert counter.square(3) == 9
+        assert counter.calls == 2
+
+    def test_invalidation(self):
+        counter = Counter()
+
+        counter.square(3)
+        counter.clear_cache()
+        counter.square(3)
+
+        assert counter.calls == 2
+
+        counter.version += 1
+        counter.square(3)
+
+        assert counter.calls == 3
+        assert counter.cache_info().misses == 3
@@ -1,5 +1,6 @@
 import os
 import json
+import zlib
 import logging
 import pytest
 
@@ -262,3 +263,495 @@ class TestUDSCorpus:
 #     os.system('rm ' + doc_path + '/*.json')
 #     for path in paths:
 #         os.system('rm ' + path)
+
+
+@pytest.fixture
+def small_corpus(tmp_path, sentence_graphs):
+    from decomp.semantics.uds.serialization import write_jsonl
+
+    write_jsonl(str(tmp_path / 'sentences.jsonl'),
+                sentence_graphs.items(), {})
+    write_jsonl(str(tmp_path / 'documents.jsonl'), [], {})
+
+    return UDSCorpus.from_json(str(tmp_path / 'sentences.jsonl'),
+                               str(tmp_path / 'documents.jsonl'))
+
+
+class TestUDSCorpusQuery:
+
+    @pytest.mark.parametrize('query_type', ['node', 'edge'])
+    def test_shared_rdf(self, small_corpus, query_type):
+        if query_type == 'node':
+            querystr = 'SELECT ?n WHERE { ?n <domain> <syntax> ; <form> "word1" }'
+        else:
+            querystr = 'SELECT ?e WHERE { ?n ?e ?m . ?e <deprel> "root" }'
+
+        assert small_corpus.query(querystr, query_type, shared_rdf=True) ==\
+            small_corpus.query(querystr, query_type)
+
+    def test_shared_rdf_results(self, small_corpus):
+        querystr = 'SELECT ?n ?f WHERE { ?n <form> ?f }'
+
+        shared = small_corpus.query(querystr, shared_rdf=True)
+
+        for gid, results in small_corpus.query(querystr).items():
+            assert sorted(shared[gid]) == sorted(results)
+
+    def test_shared_rdf_unassignable(self, small_corpus):
+        querystr = 'SELECT ?f WHERE { ?n <form> ?f }'
+
+        with pytest.raises(ValueError):
+            small_corpus.query(querystr, shared_rdf=True)
+
+    @pytest.mark.parametrize('query_type', [None, 'node'])
+    def test_workers(self, small_corpus, query_type):
+        querystr = 'SELECT ?n WHERE { ?n <domain> <syntax> ; <type> <token> }'
+
+        results = small_corpus.query(querystr, query_type, workers=2)
+        expected = small_corpus.query(querystr, query_type)
+
+        small_corpus.shutdown_workers()
+
+        assert list(results) == list(expected)
+
+        for gid in expected:
+            if query_type is None:
+                assert list(results[gid]) == list(expected[gid])
+            else:
+                assert results[gid] == expected[gid]
+
+    def test_replaced_graph(self, small_corpus, sentence_graphs):
+        from decomp.semantics.uds import UDSSentenceGraph
+
+        querystr = 'SELECT ?n WHERE { ?n <form> "word1" }'
+
+        assert small_corpus.query(querystr, 'node')['ewt-dev-2'] == {}
+
+        graph = UDSSentenceGraph.from_dict(sentence_graphs['ewt-dev-2'],
+                                           'ewt-dev-2')
+        graph.graph.nodes['ewt-dev-2-syntax-1']['form'] = 'word1'
+
+        # results cached before the graph was replaced are discarded
+        small_corpus.graphs['ewt-dev-2'] = graph
+
+        assert list(small_corpus.query(querystr, 'node')['ewt-dev-2']) ==\
+            ['ewt-dev-2-syntax-1']
+
+    def test_annotated_graph(self, small_corpus):
+        querystr = 'SELECT ?n WHERE { ?n <lemma> "word" }'
+
+        assert small_corpus.query(querystr, 'node')['ewt-dev-1'] == {}
+
+        # results cached before a graph was annotated directly, rather
+        # than through the corpus, are discarded
+        small_corpus['ewt-dev-1'].add_annotation({'ewt-dev-1-syntax-1': {'lemma': 'word'}}, {})
+
+        assert list(small_corpus.query(querystr, 'node')['ewt-dev-1']) ==\
+            ['ewt-dev-1-syntax-1']
+
+    def test_workers_reused(self, tmp_path, make_sentence_graphs):
+        from decomp.semantics.uds.serialization import write_jsonl
+
+        write_jsonl(str(tmp_path / 'sentences.jsonl'),
+                    make_sentence_graphs(9).items(), {})
+        write_jsonl(str(tmp_path / 'documents.jsonl'), [], {})
+
+        corpus = UDSCorpus.from_json(str(tmp_path / 'sentences.jsonl'),
+                                     str(tmp_path / 'documents.jsonl'))
+
+        querystr = 'SELECT ?n WHERE { ?n <form> "word1" }'
+
+        try:
+            results = corpus.query(querystr, 'node', workers=4)
+            _, _, pools = corpus._query_workers
+
+            # nine graphs only fill three shards of three graphs, but
+            # the workers are still kept for the next query
+            assert len(pools) == 3
+            assert corpus.query(querystr, 'node', workers=4) == results
+            assert corpus._query_workers[2] == pools
+
+        finally:
+            corpus.shutdown_workers()
+
+        assert results == corpus.query(querystr, 'node')
+
+    def test_workers_modified(self, small_corpus, sentence_graphs):
+        from decomp.semantics.uds import UDSSentenceGraph
+
+        querystr = 'SELECT ?n WHERE { ?n <lemma> "word" }'
+
+        try:
+            assert small_corpus.query(querystr, 'node', workers=2) ==\
+                {'ewt-dev-1': {}, 'ewt-dev-2': {}, 'ewt-dev-3': {}}
+
+            # the workers are reloaded when a graph is annotated
+            # directly or replaced, rather than querying the graphs
+            # they were first sent
+            small_corpus['ewt-dev-1'].add_annotation({'ewt-dev-1-syntax-1': {'lemma': 'word'}}, {})
+
+            graph = UDSSentenceGraph.from_dict(sentence_graphs['ewt-dev-3'],
+                                               'ewt-dev-3')
+            graph.graph.nodes['ewt-dev-3-syntax-1']['lemma'] = 'word'
+            small_corpus.graphs['ewt-dev-3'] = graph
+
+            results = small_corpus.query(querystr, 'node', workers=2)
+
+        finally:
+            small_corpus.shutdown_workers()
+
+        assert {gid: list(nodes) for gid, nodes in results.items()} ==\
+            {'ewt-dev-1': ['ewt-dev-1-syntax-1'],
+             'ewt-dev-2': [],
+             'ewt-dev-3': ['ewt-dev-3-syntax-1']}
+
+    def test_workers_empty(self, tmp_path):
+        from decomp.semantics.uds.serialization import write_jsonl
+
+        write_jsonl(str(tmp_path / 'sentences.jsonl'), [], {})
+        write_jsonl(str(tmp_path / 'documents.jsonl'), [], {})
+
+        corpus = UDSCorpus.from_json(str(tmp_path / 'sentences.jsonl'),
+                                     str(tmp_path / 'documents.jsonl'))
+
+        assert corpus.query('SELECT ?n WHERE { ?n <form> ?f }',
+                            workers=2) == {}
+
+    def test_rdf_cache(self, tmp_path, small_corpus, monkeypatch):
+        from decomp.corpus import BuildCache
+        from decomp.graph import RDFConverter
+        from decomp.semantics.uds import UDSSentenceGraph
+
+        with pytest.raises(ValueError):
+            small_corpus.populate_rdf_cache()
+
+        cache = BuildCache(str(tmp_path / 'rdf'))
+        monkeypatch.setattr(UDSSentenceGraph, 'RDF_CACHE', cache)
+
+        assert small_corpus.populate_rdf_cache() == 3
+        assert small_corpus.populate_rdf_cache() == 0
+
+        graph = small_corpus['ewt-dev-1']
+
+        assert graph.rdf_key() in cache
+        assert set(graph.rdf) ==\
+            set(RDFConverter.networkx_to_rdf(graph.graph))
+
+        key = graph.rdf_key()
+        graph.add_annotation({'ewt-dev-1-syntax-1': {'lemma': 'word'}}, {})
+
+        assert graph.rdf_key() != key
+
+        # the RDF for the annotated graph is converted and cached anew
+        querystr = 'SELECT ?n WHERE { ?n <lemma> "word" }'
+
+        assert [str(row[0]) for row in graph.query(querystr)] ==\
+            ['ewt-dev-1-syntax-1']
+        assert set(graph.rdf) ==\
+            set(RDFConverter.networkx_to_rdf(graph.graph))
+        assert graph.rdf_key() in cache
+
+        # the key is not recomputed while the graph is unchanged
+        rdf = graph.rdf
+        monkeypatch.setattr(graph, 'to_dict', None)
+
+        assert graph.rdf is rdf
+
+    def test_query_after_annotation(self, small_corpus):
+        graph = small_corpus['ewt-dev-1']
+        querystr = 'SELECT ?n WHERE { ?n <lemma> "word" }'
+
+        assert list(graph.query(querystr)) == []
+
+        graph.add_annotation({'ewt-dev-1-syntax-1': {'lemma': 'word'}}, {})
+
+        # the RDF built for the first query reflects the annotation
+        assert [str(row[0]) for row in graph.query(querystr)] ==\
+            ['ewt-dev-1-syntax-1']
+        assert list(graph.query(querystr, 'node')) == ['ewt-dev-1-syntax-1']
+
+    def test_prepared_query(self, small_corpus):
+        from rdflib import URIRef, Literal
+
+        small_corpus.prepare_query('form', 'SELECT ?n WHERE { ?n <form> ?f }')
+
+        results = small_corpus.execute_query('form', 'node', f=Literal('word1'))
+
+        assert {gid: list(nodes) for gid, nodes in results.items()} ==\
+            {'ewt-dev-1': ['ewt-dev-1-syntax-1'],
+             'ewt-dev-2': [],
+             'ewt-dev-3': ['ewt-dev-3-syntax-1']}
+
+        graph = small_corpus['ewt-dev-2']
+        rows = graph.execute_query('form', n='ewt-dev-2-syntax-1')
+
+        assert [tuple(row) for row in rows] == [(URIRef('ewt-dev-2-syntax-1'),)]
+
+        with pytest.raises(ValueError):
+            small_corpus.execute_query('missing')
+
+
+class TestUDSCorpusAnnotation:
+
+    @staticmethod
+    def _annotation(values):
+        metadata = {'genericity': {'arg-particular': {'value': {'datatype': 'float'},
+                                                      'confidence': {'datatype': 'float'}}}}
+        data = {gid: {gid+'-syntax-1': {'genericity': {'arg-particular': {'value': value,
+                                                                            'confidence': 1.0}}}}
+                for gid, value in values.items()}
+
+        return {'metadata': metadata, 'data': data}
+
+    def test_from_conll_splits(self, tmp_path, monkeypatch,
+                               make_sentence_graphs):
+        from networkx import adjacency_graph
+        from decomp.semantics.predpatt import PredPattCorpus
+        from decomp.semantics.uds import annotation
+
+        # predpatt is not run, so that only the annotations are tested
+        def from_conll(cls, data, name):
+            return cls.from_graphs({gid: adjacency_graph(graph)
+                                    for gid, graph
+                                    in make_sentence_graphs(2, name).items()})
+
+        monkeypatch.setattr(PredPattCorpus, 'from_conll',
+                            classmethod(from_conll))
+
+        decoded = []
+
+        def iter_json_object(infile, *args, **kwargs):
+            decoded.append(infile)
+            return iter_json_object.original(infile, *args, **kwargs)
+
+        iter_json_object.original = annotation.iter_json_object
+        monkeypatch.setattr(annotation, 'iter_json_object', iter_json_object)
+
+        path = str(tmp_path / 'genericity.json')
+
+        with open(path, 'w') as out:
+            json.dump(self._annotation({'ewt-dev-1': 1.0,
+                                        'ewt-test-2': 2.0}), out)
+
+        splits = UDSCorpus._from_conll_splits({'ewt-dev': '', 'ewt-test': ''},
+                                              [path], [])
+
+        # the annotations are decoded once for both splits
+        assert decoded == [path]
+
+        values = {gid: graph.syntax_nodes[gid+'-syntax-1'].get('genericity')
+                  for spl in splits.values()
+                  for gid, graph in spl.items()}
+
+        assert values == {'ewt-dev-1': {'arg-particular': {'value': 1.0,
+                                                           'confidence': 1.0}},
+                          'ewt-dev-2': None,
+                          'ewt-test-1': None,
+                          'ewt-test-2': {'arg-particular': {'value': 2.0,
+                                                            'confidence': 1.0}}}
+
+        for spl in splits.values():
+            assert spl.metadata.sentence_metadata.subspaces == {'genericity'}
+            assert not spl.modified_sentenceids
+
+    def test_add_annotation(self, small_corpus):
+        from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
+
+        first = NormalizedUDSAnnotation.from_json(json.dumps(self._annotation({'ewt-dev-1': 1.0,
+                                                                               'ewt-dev-2': 1.0})))
+        second = NormalizedUDSAnnotation.from_json(json.dumps(self._annotation({'ewt-dev-2': 2.0,
+                                                                                'ewt-dev-9': 2.0})))
+        stream = NormalizedUDSAnnotation.stream_json(json.dumps(self._annotation({'ewt-dev-3': 3.0,
+                                                                                  'ewt-dev-2': 3.0})))
+
+        small_corpus.add_annotation([first, second, stream], [])
+
+        values = {gid: graph.syntax_nodes[gid+'-syntax-1']['genericity']['arg-particular']['value']
+                  for gid, graph in small_corpus.items()}
+
+        # later annotations take precedence
+        assert values == {'ewt-dev-1': 1.0, 'ewt-dev-2': 3.0, 'ewt-dev-3': 3.0}
+        assert 'ewt-dev-9' not in small_corpus
+        assert small_corpus.metadata.sentence_metadata.subspaces == {'genericity'}
+
+    def test_orphan_logging(self, small_corpus, caplog):
+        from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
+
+        annotation = self._annotation({'ewt-dev-1': 1.0})
+        annotation['data']['ewt-dev-1']['ewt-dev-1-semantics-pred-5'] = {}
+        annotation = NormalizedUDSAnnotation.from_json(json.dumps(annotation))
+
+        with caplog.at_level(logging.WARNING):
+            small_corpus.add_sentence_annotation(annotation)
+
+        assert not caplog.records
+
+        with caplog.at_level(logging.INFO):
+            small_corpus.add_sentence_annotation(annotation)
+
+        # nodes that are not added are logged once for each graph
+        assert [record.getMessage() for record in caplog.records] ==\
+            ['annotations of nodes not in ewt-dev-1: 1 orphan nodes not added']
+
+    def test_add_annotation_in_parallel(self, small_corpus):
+        from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
+
+        annotations = [NormalizedUDSAnnotation.from_json(json.dumps(self._annotation(values)))
+                       for values in [{'ewt-dev-1': 1.0, 'ewt-dev-2': 1.0},
+                                      {'ewt-dev-2': 2.0, 'ewt-dev-3': 2.0}]]
+
+        graphs = dict(small_corpus.items())
+
+        small_corpus.add_annotation(annotations, [], workers=2)
+
+        values = {gid: graph.syntax_nodes[gid+'-syntax-1']['genericity']['arg-particular']['value']
+                  for gid, graph in small_corpus.items()}
+
+        assert values == {'ewt-dev-1': 1.0, 'ewt-dev-2': 2.0, 'ewt-dev-3': 2.0}
+
+        # the graphs are annotated in place, so that documents still
+        # hold the same graphs as the corpus
+        for gid, graph in small_corpus.items():
+            assert graph is graphs[gid]
+
+    @pytest.mark.parametrize('enabled', [True, False])
+    def test_gc_state_restored(self, small_corpus, enabled):
+        import gc
+        from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
+        from decomp.semantics.uds.corpus import _gc_paused
+
+        annotation = NormalizedUDSAnnotation.from_json(json.dumps(self._annotation({'ewt-dev-1': 1.0})))
+
+        previous = gc.isenabled()
+
+        try:
+            if enabled:
+                gc.enable()
+            else:
+                gc.disable()
+
+            small_corpus.add_annotation([annotation], [])
+
+            assert gc.isenabled() == enabled
+
+            # nested pauses restore the state from before the outermost
+            with _gc_paused():
+                with _gc_paused():
+                    assert not gc.isenabled()
+
+                assert not gc.isenabled()
+
+            assert gc.isenabled() == enabled
+
+        finally:
+            if previous:
+                gc.enable()
+            else:
+                gc.disable()
+
+    def test_write_modified_only(self, small_corpus, tmp_path):
+        from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
+
+        sentences_path = str(tmp_path / 'sentences.udsg')
+        documents_path = str(tmp_path / 'documents.udsg')
+
+        small_corpus.to_store(sentences_path, documents_path)
+
+        with pytest.raises(ValueError):
+            small_corpus.to_store(sentences_path, documents_path,
+                                  modified_only=True)
+
+        annotation = NormalizedUDSAnnotation.from_json(json.dumps(self._annotation({'ewt-dev-2': 2.0})))
+        small_corpus.add_sentence_annotation(annotation)
+
+        assert small_corpus.modified_sentenceids == {'ewt-dev-2'}
+
+        size = os.path.getsize(sentences_path)
+        small_corpus.to_store(sentences_path, documents_path,
+                              append=True, modified_only=True)
+
+        assert not small_corpus.modified_sentenceids
+
+        # only the modified graph is appended
+        record = len(zlib.compress(json.dumps(small_corpus['ewt-dev-2'].to_dict()).encode('utf-8')))
+        assert os.path.getsize(sentences_path) - size < 2 * record + 1024
+
+        loaded = UDSCorpus.from_store(sentences_path, documents_path)
+
+        assert list(loaded) == list(small_corpus)
+        assert loaded.metadata.sentence_metadata.subspaces == {'genericity'}
+
+        for gid, graph in small_corpus.items():
+            assert json.dumps(loaded[gid].to_dict()) == json.dumps(graph.to_dict())
+
+
+class TestLazyUDSCorpus:
+
+    def test_document_sentences_are_not_stale(self, small_corpus, tmp_path):
+        from networkx import DiGraph, adjacency_data
+        from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
+
+        docid = 'weblog-blogspot.com_nominations_20041117172713_ENG_20041117_172713'
+
+        document = DiGraph()
+        document.name = docid
+
+        for gid in small_corpus:
+            document.add_node(gid+'-document-syntax-1', domain='document',
+                              type='argument', frompredpatt=False,
+                              semantics={'graph': gid,
+                                         'node': gid+'-syntax-1'})
+
+        sentences_path = str(tmp_path / 'sentences.json')
+        documents_path = str(tmp_path / 'documents.json')
+
+        small_corpus.to_json(sentences_path, documents_path)
+
+        with open(documents_path, 'w') as out:
+            json.dump({'metadata': {},
+                       'data': {docid: adjacency_data(document)}}, out)
+
+        corpus = UDSCorpus.from_json(sentences_path, documents_path,
+                                     lazy=True, cache_size=1)
+
+        doc = corpus.documents[docid]
+        graph = doc.sentence_graphs['ewt-dev-1']
+
+        # the graph the document was built with is discarded
+        corpus['ewt-dev-2']
+        corpus['ewt-dev-3']
+
+        values = TestUDSCorpusAnnotation._annotation({'ewt-dev-1': 1.0})
+        annotation = NormalizedUDSAnnotation.from_json(json.dumps(values))
+        corpus.add_sentence_annotation(annotation)
+
+        assert corpus['ewt-dev-1'] is not graph
+        assert doc.sentence_graphs['ewt-dev-1'] is corpus['ewt-dev-1']
+        assert 'genericity' in doc.sentence_graphs['ewt-dev-1'].syntax_nodes['ewt-dev-1-syntax-1']
+        assert sorted(doc.sentence_graphs) == ['ewt-dev-1', 'ewt-dev-2', 'ewt-dev-3']
+
+    def test_ud_ids_loaded_on_first_build(self, small_corpus, tmp_path,
+                                          monkeypatch):
+        sentences_path = str(tmp_path / 'sentences.udsg')
+        documents_path = str(tmp_path / 'documents.udsg')
+
+        small_corpus.to_store(sentences_path, documents_path)
+
+        loaded = []
+        load_ud_ids = UDSCorpus._load_ud_ids
+
+        def count_loads(sentence_ids_only=False):
+            loaded.append(sentence_ids_only)
+            return load_ud_ids(sentence_ids_only)
+
+        monkeypatch.setattr(UDSCorpus, '_load_ud_ids', count_loads)
+
+        corpus = UDSCorpus.from_store(sentences_path, documents_path)
+
+        assert not loaded
+        assert sorted(corpus) == ['ewt-dev-1', 'ewt-dev-2', 'ewt-dev-3']
+
+        corpus['ewt-dev-1']
+        corpus['ewt-dev-2']
+
+        assert loaded == [False]
@@ -1056,6 +1056,78 @@ class TestUDSSentenceGraph:
                                         'tree1-semantics-arg-author',
                                         'tree1-semantics-arg-addressee']
 
+    def test_maxima_minima_loops(self, normalized_sentence_graph):
+        graph = normalized_sentence_graph
+
+        nodeids = ['tree1-syntax-3', 'tree1-syntax-5']
+
+        # a loop does not make a node dominated, but it does make it
+        # dominate itself
+        graph.graph.add_edge('tree1-syntax-3', 'tree1-syntax-3')
+
+        assert graph.maxima(nodeids) == nodeids
+        assert graph.minima(nodeids) == ['tree1-syntax-5']
+
+        # nodes not in the graph are neither dominated nor dominating
+        assert graph.maxima(['tree1-syntax-100']) == ['tree1-syntax-100']
+        assert graph.minima(['tree1-syntax-100']) == ['tree1-syntax-100']
+
+    def test_indexes(self, normalized_sentence_graph):
+        graph = normalized_sentence_graph
+
+        assert graph.predicate_nodes ==\
+            {nid: attrs for nid, attrs in graph.nodes.items()
+             if attrs['domain'] == 'semantics'
+             if attrs['type'] == 'predicate'}
+
+        for nodeid in graph.nodes:
+            assert graph.semantics_edges(nodeid) ==\
+                {eid: attrs for eid, attrs in graph.edges.items()
+                 if attrs['domain'] == 'semantics'
+                 if nodeid in eid}
+            assert graph.instance_edges(nodeid) ==\
+                {eid: attrs for eid, attrs in graph.edges.items()
+                 if attrs['domain'] == 'interface'
+                 if nodeid in eid}
+
+        assert graph.head('tree1-semantics-pred-7') == (7, ['announced'])
+
+    def test_indexes_invalidated(self, normalized_sentence_graph):
+        graph = normalized_sentence_graph
+
+        assert 'tree1-semantics-pred-11' in graph.predicate_nodes
+
+        # changing the type of an existing node
+        graph.add_annotation({'tree1-semantics-pred-11': {'type': 'argument'}},
+                             {})
+
+        assert 'tree1-semantics-pred-11' not in graph.predicate_nodes
+        assert 'tree1-semantics-pred-11' in graph.argument_nodes
+
+        # adding nodes and edges directly to the underlying graph
+        graph.graph.add_node('tree1-semantics-pred-100',
+                             domain='semantics', type='predicate')
+        graph.graph.add_edge('tree1-semantics-pred-100', 'tree1-syntax-1',
+                             domain='interface', type='head')
+
+        assert 'tree1-semantics-pred-100' in graph.predicate_nodes
+        assert graph.span('tree1-semantics-pred-100') == {1: ['The']}
+
+    def test_cache_invalidated(self, normalized_sentence_graph):
+        graph = normalized_sentence_graph
+
+        edges = graph.semantics_edges('tree1-semantics-pred-7')
+
+        assert graph.semantics_edges('tree1-semantics-pred-7') is edges
+        assert graph.cache_info().hits == 1
+
+        graph.add_annotation({}, {('tree1-semantics-pred-7',
+                                   'tree1-semantics-arg-3'): {'domain': 'semantics',
+                                                              'type': 'dependency'}})
+
+        assert ('tree1-semantics-pred-7', 'tree1-semantics-arg-3') in\
+            graph.semantics_edges('tree1-semantics-pred-7')
+
     def test_query(self, normalized_sentence_graph, graph_query_results):
         querystr = """
                   SELECT ?edge
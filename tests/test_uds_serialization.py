@@ -0,0 +1,269 @@
+import json
+import math
+import pytest
+
+from io import StringIO
+from zipfile import ZipFile
+
+from decomp.semantics.uds import UDSCorpus
+from decomp.semantics.uds.serialization import iter_json_object
+from decomp.semantics.uds.serialization import write_jsonl, iter_jsonl
+from decomp.semantics.uds.serialization import jsonl_chunks
+from decomp.semantics.uds.serialization import archive_member, archive_members
+from decomp.semantics.uds.serialization import open_file
+from decomp.semantics.uds.serialization import JSON_BACKENDS
+from decomp.semantics.uds.serialization import json_backend, set_json_backend
+from decomp.semantics.uds.serialization import json_loads, json_dumps
+from decomp.semantics.uds.annotation import NormalizedUDSAnnotation
+
+
+@pytest.fixture
+def serialized_corpus(sentence_graphs):
+    return {'metadata': {'genericity': {'arg-abstract': {'value': {'datatype': 'float'},
+                                                         'confidence': {'datatype': 'float'}}}},
+            'data': sentence_graphs}
+
+
+class TestIterJSONObject:
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1 << 16])
+    def test_stream(self, serialized_corpus, chunk_size):
+        infile = StringIO(json.dumps(serialized_corpus, indent=2))
+        members = list(iter_json_object(infile, chunk_size=chunk_size))
+
+        assert members[0] == (('metadata',), serialized_corpus['metadata'])
+        assert members[1:] == [(('data', name), graph)
+                               for name, graph
+                               in serialized_corpus['data'].items()]
+
+    def test_no_stream(self, serialized_corpus):
+        infile = StringIO(json.dumps(serialized_corpus))
+        members = list(iter_json_object(infile, stream=()))
+
+        assert members == [((k,), v) for k, v in serialized_corpus.items()]
+
+    def test_path(self, tmp_path, serialized_corpus):
+        path = str(tmp_path / 'sentences.json')
+
+        with open(path, 'w') as out:
+            json.dump(serialized_corpus, out)
+
+        members = dict(iter_json_object(path))
+
+        assert len(members) == 4
+        assert members[('data', 'ewt-dev-2')] == serialized_corpus['data']['ewt-dev-2']
+
+    def test_empty(self):
+        assert list(iter_json_object(StringIO('{}'))) == []
+        assert list(iter_json_object(StringIO('{"data": {}}'))) == []
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            list(iter_json_object(StringIO('[]')))
+
+        with pytest.raises(ValueError):
+            list(iter_json_object(StringIO('{"data": {"a": 1')))
+
+
+class TestArchives:
+
+    @pytest.fixture
+    def archive(self, tmp_path, normalized_node_sentence_annotation):
+        path = str(tmp_path / 'genericity.zip')
+
+        with ZipFile(path, 'w') as zf:
+            zf.writestr('genericity.json', normalized_node_sentence_annotation)
+            zf.writestr('README.txt', 'genericity annotations')
+
+        return path
+
+    def test_members(self, archive, tmp_path):
+        member = archive + '/genericity.json'
+
+        assert archive_members([archive]) == [member]
+        assert archive_members([archive], ext='.txt') == [archive + '/README.txt']
+
+        assert archive_member(member) == (archive, 'genericity.json')
+        assert archive_member(archive) is None
+        assert archive_member(str(tmp_path / 'other.zip' / 'a.json')) is None
+
+    def test_open_file(self, archive, normalized_node_sentence_annotation):
+        with open_file(archive + '/genericity.json') as infile:
+            assert infile.read() == normalized_node_sentence_annotation
+
+        with open_file(archive + '/genericity.json', 'rb') as infile:
+            assert infile.read() == normalized_node_sentence_annotation.encode('utf-8')
+
+        with pytest.raises(FileNotFoundError):
+            open_file(archive + '/protoroles.json')
+
+    def test_annotation(self, archive, normalized_node_sentence_annotation):
+        expected = NormalizedUDSAnnotation.from_json(normalized_node_sentence_annotation)
+        member = archive + '/genericity.json'
+
+        ann = NormalizedUDSAnnotation.from_json(member)
+        stream = NormalizedUDSAnnotation.stream_json(member)
+
+        assert ann.metadata == expected.metadata
+        assert dict(ann.items()) == dict(expected.items())
+        assert dict(stream.items()) == dict(expected.items())
+
+        with open_file(member) as infile:
+            ann = NormalizedUDSAnnotation.from_json(infile)
+
+        assert dict(ann.items()) == dict(expected.items())
+
+
+class TestJSONL:
+
+    def test_write_iter(self, tmp_path, serialized_corpus):
+        path = str(tmp_path / 'sentences.jsonl')
+
+        write_jsonl(path, serialized_corpus['data'].items(),
+                    serialized_corpus['metadata'])
+
+        records = list(iter_jsonl(path))
+
+        assert records[0] == {'metadata': serialized_corpus['metadata']}
+        assert records[1:] == [{'name': name, 'data': graph}
+                               for name, graph
+                               in serialized_corpus['data'].items()]
+
+        with open(path) as infile:
+            assert list(iter_jsonl(infile)) == records
+
+    def test_append(self, tmp_path, serialized_corpus):
+        path = str(tmp_path / 'sentences.jsonl')
+        graphs = list(serialized_corpus['data'].items())
+
+        write_jsonl(path, graphs[:1], serialized_corpus['metadata'])
+        write_jsonl(path, graphs[1:], append=True)
+
+        assert [r['name'] for r in iter_jsonl(path) if 'name' in r] ==\
+            list(serialized_corpus['data'])
+
+    @pytest.mark.parametrize('nchunks', [1, 2, 3, 10, 1000])
+    def test_chunks(self, tmp_path, serialized_corpus, nchunks):
+        path = str(tmp_path / 'sentences.jsonl')
+
+        write_jsonl(path, serialized_corpus['data'].items(),
+                    serialized_corpus['metadata'])
+
+        records = [record
+                   for start, end in jsonl_chunks(path, nchunks)
+                   for record in iter_jsonl(path, start, end)]
+
+        assert records == list(iter_jsonl(path))
+
+    @pytest.mark.parametrize('workers', [None, 2])
+    def test_corpus_round_trip(self, tmp_path, serialized_corpus, workers):
+        sentences_path = str(tmp_path / 'sentences.jsonl')
+        documents_path = str(tmp_path / 'documents.jsonl')
+
+        graphs = list(serialized_corpus['data'].items())
+
+        write_jsonl(sentences_path, graphs[:2], serialized_corpus['metadata'])
+        write_jsonl(documents_path, [], {})
+
+        # appended metadata is merged and appended graphs are loaded
+        write_jsonl(sentences_path, graphs[2:], serialized_corpus['metadata'],
+                    append=True)
+
+        corpus = UDSCorpus.from_json(sentences_path, documents_path,
+                                     workers=workers)
+
+        assert corpus.graphids == list(serialized_corpus['data'])
+        assert corpus.metadata.to_dict()['sentence_metadata'] ==\
+            serialized_corpus['metadata']
+
+        corpus.to_json(str(tmp_path / 'sentences2.jsonl'),
+                       str(tmp_path / 'documents2.jsonl'))
+
+        reloaded = UDSCorpus.from_json(str(tmp_path / 'sentences2.jsonl'),
+                                       str(tmp_path / 'documents2.jsonl'),
+                                       workers=workers)
+
+        assert {name: graph.to_dict() for name, graph in reloaded.items()} ==\
+            {name: graph.to_dict() for name, graph in corpus.items()}
+
+
+@pytest.fixture(params=JSON_BACKENDS)
+def backend(request):
+    previous = json_backend().name
+
+    try:
+        yield set_json_backend(request.param)
+
+    except ValueError:
+        pytest.skip(request.param + ' is not installed')
+
+    finally:
+        set_json_backend(previous)
+
+
+class TestJSONBackends:
+
+    def test_round_trip(self, backend, serialized_corpus):
+        value = {'corpus': serialized_corpus,
+                 'text': 'caf\u00e9 / \u201cquoted\u201d', 'numbers': [0, -1.5, 1e-7]}
+
+        assert json.loads(json_dumps(value)) == value
+        assert json_loads(json.dumps(value)) == value
+        assert json_loads(json.dumps(value).encode('utf-8')) == value
+
+    def test_fallback(self, backend):
+        # values some backends cannot handle are handled by json
+        assert json_loads(json_dumps({'big': 2**70})) == {'big': 2**70}
+        assert json_loads('{"value": NaN}')['value'] != 0.0
+
+        with pytest.raises(ValueError):
+            json_loads('{"value": ')
+
+    def test_nonfinite(self, backend):
+        value = {'nan': float('nan'), 'inf': [float('inf'), -float('inf')],
+                 'none': None}
+
+        assert json_dumps(value) == json.dumps(value)
+        assert json_loads(json.dumps(value))['inf'] == value['inf']
+
+    def test_escaping(self, backend):
+        # every backend writes non-ASCII characters unescaped
+        value = ['caf\u00e9 / \u201cquoted\u201d \u2028 \U0001f600 "\\\t\x00']
+
+        assert json_dumps(value) == json.dumps(value, ensure_ascii=False)
+
+    @pytest.mark.parametrize('reader', JSON_BACKENDS)
+    def test_cross_backend_round_trip(self, backend, reader,
+                                      serialized_corpus):
+        value = {'corpus': serialized_corpus, 'nan': float('nan'),
+                 'inf': float('inf'), 'none': None}
+        dumped = json_dumps(value)
+
+        try:
+            set_json_backend(reader)
+
+        except ValueError:
+            pytest.skip(reader + ' is not installed')
+
+        loaded = json_loads(dumped)
+
+        assert math.isnan(loaded.pop('nan'))
+        assert loaded == {k: v for k, v in value.items() if k != 'nan'}
+
+    def test_corpus_round_trip(self, backend, serialized_corpus):
+        sentences, documents = StringIO(), StringIO()
+
+        corpus = UDSCorpus.from_json(json.dumps(serialized_corpus),
+                                     json.dumps({'metadata': {}, 'data': {}}))
+        corpus.to_json(sentences, documents)
+
+        loaded = UDSCorpus.from_json(sentences.getvalue(), documents.getvalue())
+
+        assert list(loaded) == list(corpus)
+
+        for gid, graph in loaded.items():
+            assert json.dumps(graph.to_dict()) == json.dumps(corpus[gid].to_dict())
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            set_json_backend('pickle')
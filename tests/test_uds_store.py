@@ -0,0 +1,92 @@
+import os
+import pytest
+
+from decomp.semantics.uds.store import UDSGraphStore
+
+
+@pytest.fixture
+def store_metadata():
+    return {'genericity': {'arg-abstract': {'value': {'datatype': 'float'},
+                                            'confidence': {'datatype': 'float'}}}}
+
+
+class TestUDSGraphStore:
+
+    def test_write_read(self, tmp_path, sentence_graphs, store_metadata):
+        path = str(tmp_path / 'sentences.udsg')
+
+        UDSGraphStore.write(path, sentence_graphs, store_metadata)
+
+        with UDSGraphStore(path) as store:
+            assert len(store) == len(sentence_graphs)
+            assert list(store) == list(sentence_graphs)
+            assert 'ewt-dev-2' in store
+            assert 'ewt-dev-4' not in store
+            assert store.metadata == store_metadata
+            assert store['ewt-dev-2'] == sentence_graphs['ewt-dev-2']
+            assert dict(store.items()) == sentence_graphs
+
+    def test_write_iterable(self, tmp_path, sentence_graphs, store_metadata):
+        path = str(tmp_path / 'sentences.udsg')
+
+        UDSGraphStore.write(path, iter(sentence_graphs.items()), store_metadata)
+
+        with UDSGraphStore(path) as store:
+            assert dict(store.items()) == sentence_graphs
+
+    def test_append(self, tmp_path, sentence_graphs, store_metadata):
+        path = str(tmp_path / 'sentences.udsg')
+
+        UDSGraphStore.write(path, sentence_graphs, {})
+
+        replaced = dict(sentence_graphs['ewt-dev-2'], graph={'name': 'replaced'})
+        added = dict(sentence_graphs['ewt-dev-1'], graph={'name': 'added'})
+
+        UDSGraphStore.write(path, {'ewt-dev-2': replaced,
+                                   'ewt-dev-4': added},
+                            store_metadata, append=True)
+
+        with UDSGraphStore(path) as store:
+            # replaced graphs keep their positions
+            assert list(store) == ['ewt-dev-1', 'ewt-dev-2',
+                                   'ewt-dev-3', 'ewt-dev-4']
+            assert store['ewt-dev-1'] == sentence_graphs['ewt-dev-1']
+            assert store['ewt-dev-2'] == replaced
+            assert store['ewt-dev-4'] == added
+            assert store.metadata == store_metadata
+
+    def test_overwrite_open_store(self, tmp_path, sentence_graphs,
+                                  store_metadata):
+        path = str(tmp_path / 'sentences.udsg')
+
+        UDSGraphStore.write(path, sentence_graphs, store_metadata)
+
+        with UDSGraphStore(path) as store:
+            UDSGraphStore.write(path, {'ewt-dev-4': sentence_graphs['ewt-dev-1']},
+                                {})
+
+            # the open store still reads the file it mapped
+            assert list(store) == list(sentence_graphs)
+            assert dict(store.items()) == sentence_graphs
+
+        with UDSGraphStore(path) as store:
+            assert list(store) == ['ewt-dev-4']
+            assert store.metadata == {}
+
+        assert os.listdir(str(tmp_path)) == ['sentences.udsg']
+
+    def test_missing_graph(self, tmp_path, sentence_graphs, store_metadata):
+        path = str(tmp_path / 'sentences.udsg')
+
+        UDSGraphStore.write(path, sentence_graphs, store_metadata)
+
+        with UDSGraphStore(path) as store:
+            with pytest.raises(KeyError):
+                store['ewt-dev-4']
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / 'sentences.json'
+        path.write_text('{"metadata": {}, "data": {}}' + ' '*64)
+
+        with pytest.raises(ValueError):
+            UDSGraphStore(str(path))